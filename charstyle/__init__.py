@@ -7,39 +7,151 @@ This library provides functions to add color, background color, and text styles
 Requires Python 3.11+ for StrEnum support.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 # Import the core styling function and style enum
 from charstyle.align import Align
-from charstyle.charstyle import styled, supports_color
-
-# Import the Icon enum
-from charstyle.icons import Icon
-
-# Import pattern styling functions
-from charstyle.pattern_style import (
-    styled_format,
-    styled_pattern,
-    styled_pattern_match,
-    styled_split,
+from charstyle.charstyle import (
+    ResolvedStyle,
+    color,
+    invalidate_capabilities,
+    resolve_style,
+    styled,
+    styled_bytes,
+    supports_color,
 )
+from charstyle.colors import Color
 from charstyle.styles import Style
-from charstyle.tables import tabled
+
+if TYPE_CHECKING:
+    from charstyle.ansi import strip_ansi, truncate, wrap
+    from charstyle.capabilities import ColorDepth, get_capabilities
+    from charstyle.highlight import Highlighter
+    from charstyle.icons import Icon, get_icon, print_all_icons
+    from charstyle.keywords import KeywordHighlighter
+    from charstyle.markup import Markup, parse_markup, styled_markup
+    from charstyle.pattern_style import (
+        StyledTemplate,
+        clear_pattern_cache,
+        pattern_cache_info,
+        pattern_match_spans,
+        pattern_spans,
+        set_pattern_cache_size,
+        split_spans,
+        styled_format,
+        styled_pattern,
+        styled_pattern_match,
+        styled_split,
+    )
+    from charstyle.sgr import optimize_sgr
+    from charstyle.styler import Styler, styled_many
+    from charstyle.tables import tabled, tabled_bytes
+    from charstyle.text import RichText, StyledText
+    from charstyle.writer import StyledWriter
 
 __version__ = "0.4.0"
 
+# Names imported from their modules on first access. Only styled() and the types
+# it takes are imported up front; the other modules, the Icon enum above all, are
+# a large part of the import time, and most programs use few of them
+_LAZY_NAMES = {
+    "strip_ansi": "charstyle.ansi",
+    "truncate": "charstyle.ansi",
+    "wrap": "charstyle.ansi",
+    "ColorDepth": "charstyle.capabilities",
+    "get_capabilities": "charstyle.capabilities",
+    "Highlighter": "charstyle.highlight",
+    "Icon": "charstyle.icons",
+    "get_icon": "charstyle.icons",
+    "print_all_icons": "charstyle.icons",
+    "KeywordHighlighter": "charstyle.keywords",
+    "Markup": "charstyle.markup",
+    "parse_markup": "charstyle.markup",
+    "styled_markup": "charstyle.markup",
+    "StyledTemplate": "charstyle.pattern_style",
+    "clear_pattern_cache": "charstyle.pattern_style",
+    "pattern_cache_info": "charstyle.pattern_style",
+    "pattern_match_spans": "charstyle.pattern_style",
+    "pattern_spans": "charstyle.pattern_style",
+    "set_pattern_cache_size": "charstyle.pattern_style",
+    "split_spans": "charstyle.pattern_style",
+    "styled_format": "charstyle.pattern_style",
+    "styled_pattern": "charstyle.pattern_style",
+    "styled_pattern_match": "charstyle.pattern_style",
+    "styled_split": "charstyle.pattern_style",
+    "optimize_sgr": "charstyle.sgr",
+    "Styler": "charstyle.styler",
+    "styled_many": "charstyle.styler",
+    "tabled": "charstyle.tables",
+    "tabled_bytes": "charstyle.tables",
+    "RichText": "charstyle.text",
+    "StyledText": "charstyle.text",
+    "StyledWriter": "charstyle.writer",
+}
+
 __all__ = [
     # Core API
     "styled",
+    "styled_bytes",
+    "StyledText",
+    "RichText",
     "Style",
+    "Color",
+    "resolve_style",
+    "ResolvedStyle",
     "Align",
+    "Styler",
+    "styled_many",
     "supports_color",
+    "color",
+    "ColorDepth",
+    "get_capabilities",
+    "invalidate_capabilities",
     "tabled",
+    "tabled_bytes",
+    "StyledWriter",
+    "optimize_sgr",
+    "strip_ansi",
+    "truncate",
+    "wrap",
     "__version__",
     # Icon enum
     "Icon",
+    "get_icon",
+    "print_all_icons",
     # Pattern styling functions
     "styled_pattern",
     "styled_format",
+    "StyledTemplate",
     "styled_pattern_match",
     "styled_split",
+    "pattern_spans",
+    "pattern_match_spans",
+    "split_spans",
+    "set_pattern_cache_size",
+    "pattern_cache_info",
+    "clear_pattern_cache",
+    "Highlighter",
+    "KeywordHighlighter",
+    # Inline markup
+    "styled_markup",
+    "parse_markup",
+    "Markup",
     # Table functionality
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module that defines a lazily loaded name when it is first accessed."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
@@ -6,9 +6,11 @@ When run as `python -m charstyle styles`, this will display a sample of all avai
 When run as `python -m charstyle icons`, this will display available terminal icons.
 When run as `python -m charstyle tables`, this will display table formatting examples.
 When run as `python -m charstyle tables [style]`, this will display a specific table style.
+When run as `python -m charstyle highlight [file ...]`, this will highlight log files or stdin.
 """
 
 import argparse
+import re
 
 from charstyle import Style, __version__, styled
 
@@ -24,13 +26,15 @@ def show_summary() -> None:
     print(f"  {styled('icons [category]', Style.CYAN)} - Display icons from a specific category")
     print(f"  {styled('tables', Style.CYAN)} - Display all table formatting examples")
     print(
-        f"  {styled('tables [style]', Style.CYAN)} - Display a specific table style (default, compact, thin)\n"
+        f"  {styled('tables [style]', Style.CYAN)} - Display a specific table style (default, compact, thin)"
     )
+    print(f"  {styled('highlight [file ...]', Style.CYAN)} - Highlight log files or stdin\n")
 
     print(styled("Examples:", Style.BOLD))
     print(f"  python -m charstyle {styled('styles', Style.CYAN)}")
     print(f"  python -m charstyle {styled('icons Hearts', Style.CYAN)}")
-    print(f"  python -m charstyle {styled('tables thin', Style.CYAN)}\n")
+    print(f"  python -m charstyle {styled('tables thin', Style.CYAN)}")
+    print(f"  python -m charstyle {styled('highlight app.log', Style.CYAN)}\n")
 
     print(
         f"For more information, visit: {styled('https://github.com/joaompinto/charstyle', (Style.BLUE, Style.UNDERLINE))}"
@@ -63,6 +67,27 @@ def main() -> None:
         help="Show a specific table style",
     )
 
+    # Highlight command
+    highlight_parser = subparsers.add_parser("highlight", help="Highlight log files or stdin")
+    highlight_parser.add_argument(
+        "files", nargs="*", help="Files to highlight; '-' or none for standard input"
+    )
+    highlight_parser.add_argument(
+        "-r",
+        "--rule",
+        action="append",
+        default=[],
+        metavar="PATTERN=STYLE",
+        help="Style the matches of a regex, e.g. 'ERROR|FATAL=bold red'; may be repeated, "
+        "earlier rules win (default: timestamps, levels, UUIDs, URLs, IPs and paths)",
+    )
+    highlight_parser.add_argument(
+        "--color",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="Whether to emit escape sequences (default: only on a terminal)",
+    )
+
     args = parser.parse_args()
 
     if hasattr(args, "version") and args.version:
@@ -85,6 +110,15 @@ def main() -> None:
             show_specific_style(args.style)
         else:
             show_tables()
+    elif args.command == "highlight":
+        from charstyle.cli.highlight_files import highlight_files
+
+        try:
+            highlight_files(args.files, args.rule, args.color)
+        except re.error as err:
+            highlight_parser.error(f"invalid pattern {err.pattern!r}: {err}")
+        except (ValueError, OSError) as err:
+            highlight_parser.error(str(err))
     else:
         show_summary()
 
@@ -0,0 +1,377 @@
+"""
+ANSI escape sequence utilities for the charstyle library.
+
+This module provides functions for working with text that already contains ANSI
+escape sequences, such as removing them before writing output to a log file or
+cutting styled text to the width of the terminal.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import Any, Literal, overload
+
+from charstyle.charstyle import ANSI_ESCAPE_RE, RESET
+from charstyle.sgr import DEFAULT_STATE, SGR_RE, SGRState, apply_sgr
+from charstyle.width import display_width, slice_columns
+
+# Byte string version of the escape code pattern, usable on any bytes-like object
+ANSI_ESCAPE_BYTES_RE = re.compile(ANSI_ESCAPE_RE.pattern.encode("ascii"))
+
+# Find the last escape character in a region, used to avoid splitting a sequence
+_LAST_ESC_RE = re.compile(r"\x1b[^\x1b]*\Z")
+_LAST_ESC_BYTES_RE = re.compile(rb"\x1b[^\x1b]*\Z")
+_ESC_BYTES_RE = re.compile(rb"\x1b")
+
+# Longest escape sequence that is kept intact across chunk boundaries
+MAX_ESCAPE_LENGTH = 4096
+
+BytesLike = bytes | bytearray | memoryview
+
+# How text that does not fit is shortened: with a trailing ellipsis or cut off
+Overflow = Literal["ellipsis", "clip"]
+
+ELLIPSIS = "…"
+
+# Escape sequence that ends an OSC 8 hyperlink
+HYPERLINK_END = "\033]8;;\033\\"
+
+# Tokens of a line being wrapped: an escape sequence, a run of spaces, or other text
+_WRAP_TOKEN_RE = re.compile(f"({ANSI_ESCAPE_RE.pattern})|( +)|([^ \\x1b]+|\\x1b)")
+
+
+@overload
+def strip_ansi(data: str) -> str: ...
+
+
+@overload
+def strip_ansi(data: BytesLike) -> bytes: ...
+
+
+def strip_ansi(data: str | BytesLike) -> str | bytes:
+    """
+    Remove ANSI escape sequences, including OSC 8 hyperlinks, from text or bytes.
+
+    Input without an escape character is returned without running the regular
+    expression. Bytes-like objects are scanned in place, without first being
+    copied into a bytes object.
+
+    Args:
+        data (str | bytes | bytearray | memoryview): The data to strip
+
+    Returns:
+        str | bytes: The stripped data; a str for str input, bytes otherwise
+
+    Example:
+        >>> strip_ansi("\\033[1;31mError\\033[0m")
+        'Error'
+        >>> strip_ansi(b"\\033[32mOK\\033[0m")
+        b'OK'
+    """
+    if isinstance(data, str):
+        if "\x1b" not in data:
+            return data
+        return ANSI_ESCAPE_RE.sub("", data)
+
+    if _ESC_BYTES_RE.search(data) is None:
+        return data if isinstance(data, bytes) else bytes(data)
+    return ANSI_ESCAPE_BYTES_RE.sub(b"", data)
+
+
+@overload
+def iter_strip_ansi(data: str, chunk_size: int = ...) -> Iterator[str]: ...
+
+
+@overload
+def iter_strip_ansi(data: BytesLike, chunk_size: int = ...) -> Iterator[bytes]: ...
+
+
+def iter_strip_ansi(data: str | BytesLike, chunk_size: int = 1 << 20) -> Iterator[str | bytes]:
+    """
+    Remove ANSI escape sequences from a large buffer, one chunk at a time.
+
+    The buffer is processed in windows of roughly chunk_size characters or bytes,
+    so memory use is bounded by the chunk size rather than the size of the input.
+    Bytes-like input is sliced through a memoryview, so the input is never copied
+    as a whole. Windows are cut before the last escape character near their end,
+    so escape sequences are never split between two chunks.
+
+    Args:
+        data (str | bytes | bytearray | memoryview): The data to strip
+        chunk_size (int, optional): Approximate size of each processed window
+
+    Returns:
+        Iterator[str | bytes]: The stripped chunks, in order
+
+    Example:
+        >>> with open("colored.log", "rb") as f, open("plain.log", "wb") as out:
+        ...     out.writelines(iter_strip_ansi(f.read()))
+    """
+    if chunk_size <= MAX_ESCAPE_LENGTH:
+        raise ValueError(f"chunk_size must be larger than {MAX_ESCAPE_LENGTH}")
+
+    # The text itself, or a byte view of bytes-like input
+    buffer: Any
+    last_esc_re: re.Pattern[Any]
+    if isinstance(data, str):
+        buffer, last_esc_re = data, _LAST_ESC_RE
+    else:
+        buffer, last_esc_re = memoryview(data).cast("B"), _LAST_ESC_BYTES_RE
+
+    start = 0
+    length = len(buffer)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            # Defer a trailing escape sequence that may continue in the next window
+            tail = last_esc_re.search(buffer, max(start, end - MAX_ESCAPE_LENGTH), end)
+            if tail is not None and tail.start() > start:
+                end = tail.start()
+        yield strip_ansi(buffer[start:end])
+        start = end
+
+
+def truncate(text: str, width: int, placeholder: str = ELLIPSIS) -> str:
+    """
+    Cut text containing ANSI escape sequences to a display width.
+
+    The text is walked once. Escape sequences are kept intact and do not count
+    towards the width, wide characters are never split, and styles or hyperlinks
+    that are still open at the cut point are closed after the placeholder, so
+    the truncated text does not leak its style into whatever follows it. Text
+    that already fits is returned unchanged.
+
+    Args:
+        text (str): The text to truncate
+        width (int): The maximum display width of the result
+        placeholder (str, optional): Text that replaces the cut off part, rendered
+            in the style active at the cut point (default: "…"); use "" to clip
+
+    Returns:
+        str: The truncated text
+
+    Raises:
+        ValueError: If width is negative
+
+    Example:
+        >>> truncate("\\033[31mError: disk full\\033[0m", 8)
+        # This returns "Error: …" in red, followed by a reset
+    """
+    if width < 0:
+        raise ValueError(f"width must not be negative, got {width}")
+
+    placeholder_width = display_width(placeholder)
+    if placeholder_width > width:
+        placeholder = slice_columns(placeholder, 0, width)
+        placeholder_width = display_width(placeholder)
+    room = width - placeholder_width
+
+    if "\x1b" not in text:
+        if display_width(text) <= width:
+            return text
+        return slice_columns(text, 0, room) + placeholder
+
+    state = DEFAULT_STATE
+    link_open = False
+    cut: tuple[int, str, bool, bool] | None = None  # where the text ends if it overflows
+    column = 0
+    position = 0
+    end = len(text)
+
+    while True:
+        # Find the next escape sequence; a stray ESC character is treated as text
+        match = None
+        search = position
+        while (esc := text.find("\x1b", search)) != -1:
+            match = ANSI_ESCAPE_RE.match(text, esc)
+            if match is not None:
+                break
+            search = esc + 1
+        start = match.start() if match is not None else end
+
+        if start > position:
+            segment = text[position:start]
+            segment_width = display_width(segment)
+            if cut is None and column + segment_width > room:
+                partial = slice_columns(segment, 0, room - column)
+                cut = (position, partial, state != DEFAULT_STATE, link_open)
+            column += segment_width
+            if column > width:
+                break
+        if match is None:
+            # The whole text fits
+            return text
+
+        if cut is None:
+            # Track the styles and hyperlink that are open before the cut point
+            sequence = match.group()
+            if sequence[1] == "[" and sequence[-1] == "m":
+                state = apply_sgr(state, sequence[2:-1])
+            elif sequence.startswith("\x1b]8;"):
+                link_open = not sequence.rstrip("\x07\\\x1b").endswith(";")
+        position = match.end()
+
+    # Text only overflows after passing the cut point
+    assert cut is not None
+    index, partial, style_open, link_open = cut
+    parts = [text[:index], partial, placeholder]
+    if link_open:
+        parts.append(HYPERLINK_END)
+    if style_open:
+        parts.append(RESET)
+    return "".join(parts)
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Iterate over the lines of a string without splitting it all at once."""
+    start = 0
+    while (end := text.find("\n", start)) != -1:
+        yield text[start:end]
+        start = end + 1
+    yield text[start:]
+
+
+def _reopen(state: SGRState, link: str) -> str:
+    """Get the escape sequences that restore a style and hyperlink on a new line."""
+    prefix = "\033[" + ";".join(state.codes()) + "m" if state != DEFAULT_STATE else ""
+    return prefix + link
+
+
+def _close(state: SGRState, link: str) -> str:
+    """Get the escape sequences that close a style and hyperlink at the end of a line."""
+    return (HYPERLINK_END if link else "") + (RESET if state != DEFAULT_STATE else "")
+
+
+def wrap(text: str | Iterable[str], width: int) -> Iterator[str]:
+    """
+    Word wrap text containing ANSI escape sequences to a display width.
+
+    Lines are yielded one at a time, so large inputs can be wrapped and written
+    out without building the whole result. Every yielded line is self-contained:
+    styles and hyperlinks that are active at a line break are closed at the end
+    of the line and opened again at the start of the next one. Lines are broken
+    at spaces, which are dropped at the break; words wider than the line are
+    broken between characters. Existing line breaks are kept.
+
+    Args:
+        text (str | Iterable[str]): The text to wrap, or an iterable of lines such
+            as an open file
+        width (int): The maximum display width of each line
+
+    Returns:
+        Iterator[str]: The wrapped lines, without line terminators
+
+    Raises:
+        ValueError: If width is less than 1
+
+    Example:
+        >>> for line in wrap("\\033[1mcharstyle\\033[0m styles terminal text", 12):
+        ...     print(line)
+    """
+    # Checked here rather than in the generator, so bad input fails at the call
+    if width < 1:
+        raise ValueError(f"width must be at least 1, got {width}")
+    return _wrap_lines(text, width)
+
+
+def _wrap_lines(text: str | Iterable[str], width: int) -> Iterator[str]:
+    """
+    Yield the wrapped lines for wrap().
+
+    Args:
+        text (str | Iterable[str]): The text to wrap, or an iterable of lines
+        width (int): The maximum display width of each line, at least 1
+
+    Returns:
+        Iterator[str]: The wrapped lines, without line terminators
+    """
+    if isinstance(text, str):
+        lines: Iterable[str] = _iter_lines(text)
+    else:
+        lines = (line.rstrip("\r\n") for line in text)
+
+    state = DEFAULT_STATE
+    link = ""  # the escape sequence that opened the active hyperlink, if any
+
+    for line in lines:
+        opening = _reopen(state, link)
+        parts = [opening] if opening else []
+        column = 0
+        spaces = ""  # spaces waiting to be placed before the next word
+        word: list[tuple[str, int | None]] = []  # text pieces and escapes of the current word
+        word_width = 0
+
+        for match in chain(_WRAP_TOKEN_RE.finditer(line), (None,)):
+            if match is not None and match.group(3) is not None:
+                piece = match.group(3)
+                piece_width = display_width(piece)
+                word.append((piece, piece_width))
+                word_width += piece_width
+                continue
+            if match is not None and match.group(1) is not None:
+                word.append((match.group(1), None))
+                continue
+
+            # A run of spaces or the end of the line completes the current word
+            if word:
+                if not word_width:
+                    # Escape sequences alone never start a new line
+                    spaces_kept = spaces
+                    spaces = ""
+                elif column and column + len(spaces) + word_width > width:
+                    yield "".join(parts) + _close(state, link)
+                    opening = _reopen(state, link)
+                    parts = [opening] if opening else []
+                    column = 0
+                    spaces = ""
+                    spaces_kept = ""
+                else:
+                    spaces_kept = ""
+
+                if spaces:
+                    # Leading spaces are a break like any other: they are kept only
+                    # if the word fits after them, so the word is not split instead
+                    if column + len(spaces) + word_width <= width:
+                        parts.append(spaces)
+                        column += len(spaces)
+                    spaces = ""
+
+                for piece, token_width in word:
+                    if token_width is None:
+                        # Escape sequences are kept and tracked for the next line
+                        parts.append(piece)
+                        sgr = SGR_RE.fullmatch(piece)
+                        if sgr is not None:
+                            state = apply_sgr(state, sgr.group(1))
+                        elif piece.startswith("\x1b]8;"):
+                            closed = piece.rstrip("\x07\\\x1b").endswith(";")
+                            link = "" if closed else piece
+                        continue
+
+                    # Break words that do not fit on a line of their own
+                    piece_width = token_width
+                    while column + piece_width > width:
+                        head = slice_columns(piece, 0, max(width - column, 0))
+                        if not head and not column:
+                            # A character wider than the line goes on a line of its own
+                            head = piece[0]
+                        if head:
+                            parts.append(head)
+                            piece = piece[len(head) :]
+                            piece_width = display_width(piece)
+                        yield "".join(parts) + _close(state, link)
+                        opening = _reopen(state, link)
+                        parts = [opening] if opening else []
+                        column = 0
+                    if piece:
+                        parts.append(piece)
+                        column += piece_width
+
+                spaces = spaces_kept
+                word = []
+                word_width = 0
+
+            if match is not None:
+                spaces += match.group(2)
+
+        yield "".join(parts) + _close(state, link)
@@ -0,0 +1,188 @@
+"""
+Terminal capability detection for the charstyle library.
+
+This module detects whether a stream supports color and how many colors it can
+display, caching the result per stream so that a process can write colored
+output to a terminal and plain output to a log file at the same time.
+"""
+
+import os
+import weakref
+from enum import IntEnum
+from typing import IO, Any, NamedTuple
+
+
+class ColorDepth(IntEnum):
+    """
+    Enum for the number of colors a terminal can display.
+
+    Members compare by the number of colors, so ``depth >= ColorDepth.EIGHT_BIT``
+    checks for 256-color support.
+    """
+
+    NONE = 0
+    BASIC = 16
+    EIGHT_BIT = 256
+    TRUECOLOR = 16_777_216
+
+
+class Capabilities(NamedTuple):
+    """
+    The color capabilities of an output stream.
+
+    Attributes:
+        color: Whether escape sequences should be emitted at all
+        depth: The number of colors the stream can display
+    """
+
+    color: bool
+    depth: ColorDepth
+
+
+NO_CAPABILITIES = Capabilities(False, ColorDepth.NONE)
+
+# Color depths forced by FORCE_COLOR levels; any other non-empty value forces basic color
+_FORCE_COLOR_DEPTHS = {
+    "2": ColorDepth.EIGHT_BIT,
+    "3": ColorDepth.TRUECOLOR,
+}
+
+# Cached capabilities for streams backed by a file descriptor, keyed by descriptor
+_FD_CAPABILITIES: dict[int, Capabilities] = {}
+
+# Cached capabilities for other streams (e.g. StringIO), released with the stream
+_STREAM_CAPABILITIES: "weakref.WeakKeyDictionary[Any, Capabilities]" = weakref.WeakKeyDictionary()
+
+# The stream with a file descriptor that was looked up last, and its capabilities,
+# checked first since output usually goes to the same stream, and asking a stream for
+# its file descriptor costs more than the cache lookup itself
+_NO_STREAM = object()
+_last_stream: Any = _NO_STREAM
+_last_capabilities = NO_CAPABILITIES
+
+
+def detect_color_depth() -> ColorDepth:
+    """
+    Detect the color depth of the terminal from the COLORTERM and TERM variables.
+
+    Returns:
+        ColorDepth: The detected color depth, at least BASIC unless TERM is "dumb"
+    """
+    colorterm = os.environ.get("COLORTERM", "").lower()
+    if colorterm in ("truecolor", "24bit"):
+        return ColorDepth.TRUECOLOR
+
+    term = os.environ.get("TERM", "").lower()
+    if term == "dumb":
+        return ColorDepth.NONE
+    if term.endswith(("-truecolor", "-direct")):
+        return ColorDepth.TRUECOLOR
+    if term.endswith("256color"):
+        return ColorDepth.EIGHT_BIT
+    return ColorDepth.BASIC
+
+
+def detect_capabilities(stream: IO[Any]) -> Capabilities:
+    """
+    Detect the color capabilities of a stream, without caching.
+
+    NO_COLOR disables color and FORCE_COLOR enables it regardless of the stream.
+    FORCE_COLOR values 2 and 3 additionally force 256 colors and truecolor.
+    Otherwise color is enabled only when the stream is a TTY.
+
+    Args:
+        stream (IO): The stream that output will be written to
+
+    Returns:
+        Capabilities: The detected capabilities
+    """
+    # Check for NO_COLOR environment variable
+    if os.environ.get("NO_COLOR", "") != "":
+        return NO_CAPABILITIES
+
+    # Check for FORCE_COLOR environment variable
+    force_color = os.environ.get("FORCE_COLOR", "")
+    if force_color != "":
+        forced = _FORCE_COLOR_DEPTHS.get(force_color, ColorDepth.BASIC)
+        return Capabilities(True, max(forced, detect_color_depth()))
+
+    # Check if the stream is a TTY
+    if hasattr(stream, "isatty") and stream.isatty():
+        depth = detect_color_depth()
+        return Capabilities(depth > ColorDepth.NONE, depth)
+
+    return NO_CAPABILITIES
+
+
+def _fileno(stream: IO[Any]) -> int | None:
+    """Get the file descriptor of a stream, or None if it has none."""
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def get_capabilities(stream: IO[Any]) -> Capabilities:
+    """
+    Get the color capabilities of a stream, detecting them on first use.
+
+    Results are cached per file descriptor, or per stream object for streams
+    without one. Call invalidate_capabilities() after the environment changes.
+
+    Args:
+        stream (IO): The stream that output will be written to
+
+    Returns:
+        Capabilities: The capabilities of the stream
+
+    Example:
+        >>> import sys
+        >>> get_capabilities(sys.stdout).depth >= ColorDepth.EIGHT_BIT
+        # True on a 256-color terminal
+    """
+    global _last_stream, _last_capabilities
+
+    if stream is _last_stream:
+        return _last_capabilities
+
+    fd = _fileno(stream)
+    if fd is not None:
+        capabilities = _FD_CAPABILITIES.get(fd)
+        if capabilities is None:
+            capabilities = _FD_CAPABILITIES[fd] = detect_capabilities(stream)
+        _last_stream, _last_capabilities = stream, capabilities
+        return capabilities
+
+    try:
+        capabilities = _STREAM_CAPABILITIES.get(stream)
+        if capabilities is None:
+            capabilities = _STREAM_CAPABILITIES[stream] = detect_capabilities(stream)
+    except TypeError:
+        # Streams that cannot be weakly referenced are detected every time
+        capabilities = detect_capabilities(stream)
+    return capabilities
+
+
+def invalidate_stream_capabilities(stream: IO[Any] | None = None) -> None:
+    """
+    Forget cached stream capabilities.
+
+    Args:
+        stream (IO, optional): The stream to forget; all streams if omitted
+    """
+    global _last_stream
+
+    _last_stream = _NO_STREAM
+    if stream is None:
+        _FD_CAPABILITIES.clear()
+        _STREAM_CAPABILITIES.clear()
+        return
+
+    fd = _fileno(stream)
+    if fd is not None:
+        _FD_CAPABILITIES.pop(fd, None)
+    else:
+        try:
+            _STREAM_CAPABILITIES.pop(stream, None)
+        except TypeError:
+            pass
@@ -5,38 +5,225 @@ This module provides the main styled function for applying styles to text.
 """
 
 import functools
-import os
 import re
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, TYPE_CHECKING, Any, Literal
 
 from charstyle.align import Align
+from charstyle.capabilities import (
+    ColorDepth,
+    get_capabilities,
+    invalidate_stream_capabilities,
+)
+from charstyle.colors import Color
 
 # Import the style enum
 from charstyle.styles import Style
+from charstyle.width import display_width
+
+if TYPE_CHECKING:
+    from charstyle.ansi import Overflow
+    from charstyle.text import RichText, StyledText
+
+# SGR codes of the Style members, so building a prefix does not go through enum attributes
+_STYLE_CODES: dict[Style, str] = {member: member.value for member in Style}
+
+# Escape prefixes of the Style members, which are the same at every color depth
+_STYLE_PREFIXES: dict[Style, str] = {
+    member: f"\033[{code}m" for member, code in _STYLE_CODES.items()
+}
+
+# Color depths that escape sequences are rendered for, and module level aliases of
+# the ones used on hot paths, which are cheaper to look up than enum attributes
+_DEPTHS = (ColorDepth.BASIC, ColorDepth.EIGHT_BIT, ColorDepth.TRUECOLOR)
+_NO_DEPTH = ColorDepth.NONE
+_BASIC_DEPTH = ColorDepth.BASIC
+
+
+class ResolvedStyle:
+    """
+    A style whose escape sequence prefixes have been built for every color depth.
+
+    Resolved styles can be used anywhere a style is accepted. styled() takes the
+    prefix straight from the resolved style instead of looking the style up in
+    the prefix cache, which saves hashing the style and its members on every call.
+    Create them with resolve_style().
+    """
+
+    __slots__ = ("style", "prefixes")
+
+    def __init__(self, style: "StyleType") -> None:
+        """
+        Resolve a style.
+
+        Args:
+            style (Style, Color, ResolvedStyle, tuple): A style enum value, a color, a
+                resolved style, or a tuple of them
+
+        Raises:
+            ValueError: If the style is empty
+        """
+        if not style:
+            raise ValueError("Cannot resolve an empty style")
+        self.style = style
+        self.prefixes = {depth: get_style_prefix(style, depth) for depth in _DEPTHS}
+
+    def codes(self, depth: ColorDepth) -> str:
+        """
+        Get the SGR codes of the style for a color depth.
+
+        Args:
+            depth (ColorDepth): The color depth of the output
+
+        Returns:
+            str: The SGR codes, e.g. "1;31"
+        """
+        return self.prefixes[depth][2:-1]
+
+    def __repr__(self) -> str:
+        return f"resolve_style({self.style!r})"
+
 
 # Type alias for style parameters
-StyleType = Style | tuple[Style, ...]
+StyleType = Style | Color | ResolvedStyle | tuple[Style | Color | ResolvedStyle, ...]
 
-# Global cached color support flag
-# None means not yet determined
-_SUPPORTS_COLOR: bool | None = None
+# Color override of the current thread or task, set by color(): None to detect color
+# support, True to force color at the detected depth, or a fixed color depth
+_COLOR_OVERRIDE: ContextVar[ColorDepth | Literal[True] | None] = ContextVar(
+    "charstyle_color_override", default=None
+)
 
-# Regular expression to match ANSI escape codes
-ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+# Escape sequence that resets all styles
+RESET = "\033[0m"
+RESET_BYTES = RESET.encode("ascii")
 
+# Escape sequence that ends an OSC 8 hyperlink
+HYPERLINK_END_BYTES = b"\033]8;;\033\\"
 
-def get_visible_length(text: str) -> int:
+# Regular expression to match ANSI escape codes: OSC sequences such as hyperlinks
+# (terminated by BEL or ST), CSI sequences such as colors, and two-character escapes
+ANSI_ESCAPE_RE = re.compile(r"\x1B(?:\][^\x07\x1B]*(?:\x07|\x1B\\)|\[[0-?]*[ -/]*[@-~]|[@-Z\\-_])")
+
+
+def get_visible_length(text: "str | StyledText | RichText") -> int:
     """
     Calculate the visible length of a string by excluding ANSI escape codes.
 
+    The length is measured in terminal columns, so wide characters such as emoji
+    and CJK text count as two. Strings without an escape character are measured
+    directly, so the common case of plain text never touches the regular expression.
+    StyledText and RichText objects report their stored width.
+
+    Args:
+        text (str | StyledText | RichText): The text to measure
+
+    Returns:
+        int: The visible length of the text
+    """
+    if not isinstance(text, str):
+        return text.width
+
+    if "\x1b" not in text:
+        return display_width(text)
+
+    return _escaped_visible_length(text)
+
+
+@functools.lru_cache(maxsize=1024)
+def _escaped_visible_length(text: str) -> int:
+    """
+    Measure a string containing ANSI escape codes without building a stripped copy.
+
+    Results are memoized, since styled cell values tend to repeat within a table.
+
     Args:
         text (str): The text to measure
 
     Returns:
         int: The visible length of the text
     """
-    # Remove ANSI escape codes before calculating length
-    return len(ANSI_ESCAPE_RE.sub("", text))
+    length = 0
+    last_end = 0
+    for match in ANSI_ESCAPE_RE.finditer(text):
+        start = match.start()
+        if start > last_end:
+            length += display_width(text[last_end:start])
+        last_end = match.end()
+    if last_end < len(text):
+        length += display_width(text[last_end:])
+    return length
+
+
+@functools.lru_cache(maxsize=256)
+def get_style_prefix(style: StyleType, depth: ColorDepth = ColorDepth.TRUECOLOR) -> str:
+    """
+    Get the ANSI escape prefix for a style or tuple of styles.
+
+    Prefixes are interned in a bounded cache keyed by the style value, so repeated
+    calls with the same style only pay for a dictionary lookup. Use
+    ``get_style_prefix.cache_info()`` to inspect hit/miss statistics.
+
+    Args:
+        style (Style, Color, ResolvedStyle, tuple): A style enum value, a color, a
+            resolved style, or a tuple of them
+        depth (ColorDepth, optional): Color depth that extended colors are downsampled to
+
+    Returns:
+        str: The escape sequence that opens the style, e.g. ``ESC[1;31m``
+    """
+    if style.__class__ is ResolvedStyle:
+        return style.prefixes[depth]
+
+    # Convert single style to tuple
+    styles = style if isinstance(style, tuple) else (style,)
+
+    # Build the style string
+    style_str = ";".join(
+        s.codes(depth) if isinstance(s, (Color, ResolvedStyle)) else _STYLE_CODES[s] for s in styles
+    )
+
+    return f"\033[{style_str}m"
+
+
+@functools.lru_cache(maxsize=256)
+def get_style_prefix_bytes(style: StyleType, depth: ColorDepth = ColorDepth.TRUECOLOR) -> bytes:
+    """
+    Get the ANSI escape prefix for a style, pre-encoded as bytes.
+
+    Args:
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+        depth (ColorDepth, optional): Color depth that extended colors are downsampled to
+
+    Returns:
+        bytes: The escape sequence that opens the style
+    """
+    return get_style_prefix(style, depth).encode("ascii")
+
+
+def resolve_style(style: StyleType) -> ResolvedStyle:
+    """
+    Resolve a style once, for code that styles many strings with it.
+
+    Args:
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+
+    Returns:
+        ResolvedStyle: The resolved style, usable anywhere a style is accepted
+
+    Raises:
+        ValueError: If the style is empty
+
+    Example:
+        >>> from charstyle import Style, resolve_style, styled
+        >>> error = resolve_style((Style.BOLD, Style.RED))
+        >>> lines = [styled(message, error) for message in ("disk full", "no route")]
+    """
+    if isinstance(style, ResolvedStyle):
+        return style
+    return ResolvedStyle(style)
 
 
 @functools.lru_cache(maxsize=1)
@@ -44,93 +231,427 @@ def supports_color() -> bool:
     """
     Check if the terminal supports color.
 
+    The capabilities of standard output are detected again whenever this cache
+    is cleared, and stored in the per-stream capability cache.
+
     Returns:
         bool: True if the terminal supports color, False otherwise
     """
-    global _SUPPORTS_COLOR
+    invalidate_stream_capabilities(sys.stdout)
+    return get_capabilities(sys.stdout).color
+
+
+def color_depth(stream: IO[Any] | None = None) -> ColorDepth:
+    """
+    Get the color depth to render for a stream.
 
-    # Return cached value if already determined
-    if _SUPPORTS_COLOR is not None:
-        return _SUPPORTS_COLOR
+    An override set with color() in the current context takes precedence over
+    the detected capabilities.
 
-    # Check for NO_COLOR environment variable
-    if os.environ.get("NO_COLOR", "") != "":
-        _SUPPORTS_COLOR = False
-        return False
+    Args:
+        stream (IO, optional): The stream that output will be written to;
+            standard output as reported by supports_color() if omitted
+
+    Returns:
+        ColorDepth: The color depth, ColorDepth.NONE (which is falsy) if the
+            output should not be styled at all
+    """
+    override = _COLOR_OVERRIDE.get()
+    if override is not None:
+        if override is not True:
+            return override
+        depth = get_capabilities(stream if stream is not None else sys.stdout).depth
+        return depth if depth else _BASIC_DEPTH
+    if stream is None:
+        if not supports_color():
+            return _NO_DEPTH
+        depth = get_capabilities(sys.stdout).depth
+        return depth if depth else _BASIC_DEPTH
+    return get_capabilities(stream).depth
+
+
+@contextmanager
+def color(enabled: bool | ColorDepth = True) -> Iterator[None]:
+    """
+    Enable or disable color for the current thread or asyncio task.
+
+    The override is stored in a context variable, so threads and tasks can
+    render colored and plain output at the same time, and detected capabilities
+    stay cached. It applies to everything that checks color support when it
+    renders, such as styled(), tabled() and the pattern functions; a Styler,
+    StyledTemplate or StyledWriter checks once, when it is created.
+
+    Args:
+        enabled (bool | ColorDepth, optional): False to disable color, True to
+            enable it at the detected color depth (at least basic colors), or a
+            color depth to render at (default: True)
 
-    # Check for FORCE_COLOR environment variable
-    if os.environ.get("FORCE_COLOR", "") != "":
-        _SUPPORTS_COLOR = True
-        return True
+    Example:
+        >>> from charstyle import Style, color, styled
+        >>> with color(False):
+        ...     styled("plain", Style.RED)
+        'plain'
+    """
+    if enabled is False:
+        override: ColorDepth | Literal[True] = _NO_DEPTH
+    elif enabled is True:
+        override = True
+    else:
+        override = ColorDepth(enabled)
+    token = _COLOR_OVERRIDE.set(override)
+    try:
+        yield
+    finally:
+        _COLOR_OVERRIDE.reset(token)
 
-    # Check if stdout is a TTY
-    if hasattr(sys.stdout, "isatty") and sys.stdout.isatty():
-        _SUPPORTS_COLOR = True
-        return True
 
-    _SUPPORTS_COLOR = False
-    return False
+def invalidate_capabilities(stream: IO[Any] | None = None) -> None:
+    """
+    Forget cached color capabilities so they are detected again on next use.
+
+    Call this after changing NO_COLOR, FORCE_COLOR, TERM or COLORTERM, or after
+    redirecting a stream.
+
+    Args:
+        stream (IO, optional): The stream to forget; all streams, including the
+            standard output used by supports_color(), if omitted
+    """
+    invalidate_stream_capabilities(stream)
+    if stream is None or stream is sys.stdout:
+        supports_color.cache_clear()
 
 
 def styled(
-    text: str,
+    text: "str | StyledText | RichText",
     style: StyleType | None = None,
     width: int | None = None,
     align: Align = Align.LEFT,
     fill_char: str = " ",
     hyperlink: str | None = None,
+    stream: IO[Any] | None = None,
+    max_width: int | None = None,
+    overflow: "Overflow" = "ellipsis",
+    wrap: bool = False,
 ) -> str:
     """
     Apply styles to text using ANSI escape sequences.
 
+    StyledText and RichText input is aligned using its stored width, without
+    measuring the escape sequences it renders to.
+
     Args:
-        text (str): The text to style
-        style (Style, tuple): A style enum value or tuple of style enum values
+        text (str | StyledText | RichText): The text to style
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
         width (int, optional): Fixed width for the output text
         align (Align, optional): Alignment of the text within the fixed width
         fill_char (str, optional): Character used for filling the fixed width
         hyperlink (str, optional): URL to link the text to using ANSI hyperlink escape sequence
+        stream (IO, optional): The stream the text will be written to, used to decide
+            whether to emit escape sequences (default: standard output)
+        max_width (int, optional): Maximum display width of the text; longer text is
+            truncated, keeping any escape sequences it contains intact
+        overflow (str, optional): How longer text is truncated: "ellipsis" to end it
+            with "…" (default), or "clip" to cut it off
+        wrap (bool, optional): Word wrap text wider than width onto several lines,
+            each padded and styled separately (only used when width is given)
 
     Returns:
         str: The styled text
+
+    Raises:
+        ValueError: If max_width is negative, or overflow is not "ellipsis" or "clip"
     """
     if not text:
-        return text
+        return ""
+
+    # Render StyledText and RichText, reusing their stored width for alignment
+    if not isinstance(text, str):
+        visible_length = text.width
+        text = text.render(stream)
+    else:
+        visible_length = None
+
+    # Wrap long text onto several lines, styling each line separately
+    if wrap and width is not None:
+        return _styled_wrapped(
+            text, style, width, align, fill_char, hyperlink, stream, max_width, overflow
+        )
+
+    # Truncate text that is too wide
+    if max_width is not None and (visible_length is None or visible_length > max_width):
+        text = _truncate(text, max_width, overflow)
+        visible_length = None
 
     # Apply alignment and width if specified
     if width is not None:
-        # Calculate the visible length (excluding ANSI escape codes)
-        visible_length = get_visible_length(text)
-        padding_needed = max(0, width - visible_length)
-
-        if align == Align.LEFT:
-            # For left alignment, add padding to the right
-            text = text + (fill_char * padding_needed)
-        elif align == Align.RIGHT:
-            # For right alignment, add padding to the left
-            text = (fill_char * padding_needed) + text
-        elif align == Align.CENTER:
-            # For center alignment, add padding to both sides
-            left_padding = padding_needed // 2
-            right_padding = padding_needed - left_padding
-            text = (fill_char * left_padding) + text + (fill_char * right_padding)
+        text = _pad_text(text, visible_length, width, align, fill_char)
+
+    if not style and hyperlink is None:
+        return text
+
+    # A Style member renders the same at every color depth, so for standard output
+    # only whether it is colored at all has to be checked
+    if (
+        style.__class__ is Style
+        and hyperlink is None
+        and stream is None
+        and _COLOR_OVERRIDE.get() is None
+    ):
+        return _STYLE_PREFIXES[style] + text + RESET if supports_color() else text
+
+    # Check color support once for the whole render
+    depth = color_depth(stream)
+    if not depth:
+        return text
 
     # Apply hyperlink if specified
-    if hyperlink is not None and supports_color():
+    if hyperlink is not None:
         text = f"\033]8;;{hyperlink}\033\\{text}\033]8;;\033\\"
 
     if not style:
         return text
 
-    # Use the cached color support value
-    if not supports_color():
-        return text
+    # Apply the style using the prefix of a resolved style, or the cached prefix
+    if style.__class__ is ResolvedStyle:
+        return style.prefixes[depth] + text + RESET
+    return get_style_prefix(style, depth) + text + RESET
 
-    # Convert single style to tuple
-    styles = style if isinstance(style, tuple) else (style,)
 
-    # Build the style string
-    style_str = ";".join(s.value for s in styles)
+def styled_bytes(
+    text: "str | StyledText | RichText",
+    style: StyleType | None = None,
+    width: int | None = None,
+    align: Align = Align.LEFT,
+    fill_char: str = " ",
+    hyperlink: str | None = None,
+    encoding: str = "utf-8",
+    stream: IO[Any] | None = None,
+    max_width: int | None = None,
+    overflow: "Overflow" = "ellipsis",
+    wrap: bool = False,
+) -> bytes:
+    """
+    Apply styles to text and return the result encoded as bytes.
+
+    This is the bytes equivalent of styled(), for writing directly to binary
+    streams such as sys.stdout.buffer. Only the text itself is encoded; the
+    escape sequences come from a cache of pre-encoded prefixes.
+
+    Args:
+        text (str | StyledText | RichText): The text to style
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+        width (int, optional): Fixed width for the output text
+        align (Align, optional): Alignment of the text within the fixed width
+        fill_char (str, optional): Character used for filling the fixed width
+        hyperlink (str, optional): URL to link the text to using ANSI hyperlink escape sequence
+        encoding (str, optional): Encoding used for the text (default: utf-8)
+        stream (IO, optional): The stream the text will be written to, used to decide
+            whether to emit escape sequences (default: standard output)
+        max_width (int, optional): Maximum display width of the text; longer text is
+            truncated, keeping any escape sequences it contains intact
+        overflow (str, optional): How longer text is truncated: "ellipsis" to end it
+            with "…" (default), or "clip" to cut it off
+        wrap (bool, optional): Word wrap text wider than width onto several lines,
+            each padded and styled separately (only used when width is given)
+
+    Returns:
+        bytes: The styled text
+
+    Raises:
+        ValueError: If max_width is negative, or overflow is not "ellipsis" or "clip"
+
+    Example:
+        >>> from charstyle import Style
+        >>> sys.stdout.buffer.write(styled_bytes("Done\\n", Style.GREEN))
+    """
+    if not text:
+        return b""
+
+    # Render StyledText and RichText, reusing their stored width for alignment
+    if not isinstance(text, str):
+        visible_length = text.width
+        text = text.render(stream)
+    else:
+        visible_length = None
+
+    # Wrap long text onto several lines, styling each line separately
+    if wrap and width is not None:
+        return _styled_bytes_wrapped(
+            text, style, width, align, fill_char, hyperlink, encoding, stream, max_width, overflow
+        )
+
+    # Truncate text that is too wide
+    if max_width is not None and (visible_length is None or visible_length > max_width):
+        text = _truncate(text, max_width, overflow)
+        visible_length = None
+
+    # Apply alignment and width if specified
+    if width is not None:
+        text = _pad_text(text, visible_length, width, align, fill_char)
+
+    body = text.encode(encoding)
+
+    if not style and hyperlink is None:
+        return body
+
+    # Check color support once for the whole render
+    depth = color_depth(stream)
+    if not depth:
+        return body
+
+    # Apply hyperlink if specified
+    if hyperlink is not None:
+        body = b"\033]8;;" + hyperlink.encode(encoding) + b"\033\\" + body + HYPERLINK_END_BYTES
+
+    if not style:
+        return body
+
+    # Apply the style using the cached prefix
+    return get_style_prefix_bytes(style, depth) + body + RESET_BYTES
+
+
+def _truncate(text: str, max_width: int, overflow: "Overflow") -> str:
+    """
+    Truncate text to a maximum width for styled() and styled_bytes().
+
+    Args:
+        text (str): The text to truncate
+        max_width (int): Maximum display width of the text
+        overflow (str): "ellipsis" or "clip"
+
+    Returns:
+        str: The truncated text
+
+    Raises:
+        ValueError: If max_width is negative, or overflow is not "ellipsis" or "clip"
+    """
+    # Imported here, since the ansi module builds on this one
+    from charstyle.ansi import ELLIPSIS, truncate
+
+    if overflow == "ellipsis":
+        return truncate(text, max_width, ELLIPSIS)
+    if overflow == "clip":
+        return truncate(text, max_width, "")
+    raise ValueError(f"overflow must be 'ellipsis' or 'clip', got {overflow!r}")
+
+
+def _styled_wrapped(
+    text: str,
+    style: StyleType | None,
+    width: int,
+    align: Align,
+    fill_char: str,
+    hyperlink: str | None,
+    stream: IO[Any] | None,
+    max_width: int | None,
+    overflow: "Overflow",
+) -> str:
+    """
+    Word wrap text for styled(), styling each line separately.
+
+    This is kept out of styled() so that its generator does not turn the
+    arguments of every styled() call into closure cells.
+
+    Returns:
+        str: The styled lines, joined with newlines
+    """
+    # Imported here, since the ansi module builds on this one
+    from charstyle.ansi import wrap
+
+    lines = []
+    for line in wrap(text, width):
+        lines.append(
+            styled(line, style, width, align, fill_char, hyperlink, stream, max_width, overflow)
+        )
+    return "\n".join(lines)
+
+
+def _styled_bytes_wrapped(
+    text: str,
+    style: StyleType | None,
+    width: int,
+    align: Align,
+    fill_char: str,
+    hyperlink: str | None,
+    encoding: str,
+    stream: IO[Any] | None,
+    max_width: int | None,
+    overflow: "Overflow",
+) -> bytes:
+    """
+    Word wrap text for styled_bytes(), styling each line separately.
+
+    Returns:
+        bytes: The styled lines, joined with newlines
+    """
+    from charstyle.ansi import wrap
+
+    lines = []
+    for line in wrap(text, width):
+        lines.append(
+            styled_bytes(
+                line,
+                style,
+                width,
+                align,
+                fill_char,
+                hyperlink,
+                encoding,
+                stream,
+                max_width,
+                overflow,
+            )
+        )
+    return b"\n".join(lines)
+
+
+def align_text(text: str, width: int, align: Align = Align.LEFT, fill_char: str = " ") -> str:
+    """
+    Pad text to a fixed width, ignoring ANSI escape codes when measuring it.
+
+    Args:
+        text (str): The text to pad
+        width (int): The width to pad the text to
+        align (Align, optional): Alignment of the text within the fixed width
+        fill_char (str, optional): Character used for filling the fixed width
+
+    Returns:
+        str: The padded text
+    """
+    return _pad_text(text, None, width, align, fill_char)
+
+
+def _pad_text(
+    text: str, visible_length: int | None, width: int, align: Align, fill_char: str
+) -> str:
+    """
+    Pad text to a fixed width, measuring it only if its visible length is unknown.
+
+    Args:
+        text (str): The text to pad
+        visible_length (int, optional): The visible length of the text, if known
+        width (int): The width to pad the text to
+        align (Align): Alignment of the text within the fixed width
+        fill_char (str): Character used for filling the fixed width
+
+    Returns:
+        str: The padded text
+    """
+    # Calculate the visible length (excluding ANSI escape codes)
+    if visible_length is None:
+        visible_length = get_visible_length(text)
+    padding_needed = max(0, width - visible_length)
+
+    if align == Align.LEFT:
+        # For left alignment, add padding to the right
+        text = text + (fill_char * padding_needed)
+    elif align == Align.RIGHT:
+        # For right alignment, add padding to the left
+        text = (fill_char * padding_needed) + text
+    elif align == Align.CENTER:
+        # For center alignment, add padding to both sides
+        left_padding = padding_needed // 2
+        right_padding = padding_needed - left_padding
+        text = (fill_char * left_padding) + text + (fill_char * right_padding)
 
-    # Apply the style
-    return f"\033[{style_str}m{text}\033[0m"
+    return text
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Highlighting of log files and standard input for the command line.
+"""
+
+import sys
+from collections.abc import Sequence
+
+from charstyle import Highlighter, color
+from charstyle.highlight import LOG_RULES, Rule, highlight_stream
+from charstyle.markup import parse_style
+
+
+def parse_rule(spec: str) -> Rule:
+    """
+    Parse a rule given on the command line as PATTERN=STYLE.
+
+    Args:
+        spec (str): The rule, e.g. "ERROR|FATAL=bold red"; the pattern may contain
+            "=" itself, as only the last one separates it from the style
+
+    Returns:
+        Rule: The pattern and its style
+
+    Raises:
+        ValueError: If the rule has no style or names an unknown style
+    """
+    pattern, separator, style = spec.rpartition("=")
+    if not separator or not pattern or not style.strip():
+        raise ValueError(f"Rules must be given as PATTERN=STYLE, got {spec!r}")
+    return pattern, parse_style(style)
+
+
+def highlight_files(paths: Sequence[str], rules: Sequence[str], color_mode: str = "auto") -> None:
+    """
+    Highlight files, or standard input if no files are given, to standard output.
+
+    Args:
+        paths (Sequence[str]): The files to highlight; "-" reads standard input
+        rules (Sequence[str]): Rules as PATTERN=STYLE (default: common log elements)
+        color_mode (str, optional): "auto" to color only terminals, "always" or "never"
+
+    Raises:
+        ValueError: If a rule is invalid
+        re.error: If a rule pattern is invalid
+        OSError: If a file cannot be read
+    """
+    highlighter = Highlighter([parse_rule(rule) for rule in rules] if rules else LOG_RULES)
+    enabled = {"always": True, "never": False}.get(color_mode)
+
+    def run() -> None:
+        for path in paths or ["-"]:
+            if path == "-":
+                highlight_stream(sys.stdin, sys.stdout, highlighter)
+            else:
+                with open(path, encoding="utf-8", errors="replace") as source:
+                    highlight_stream(source, sys.stdout, highlighter)
+
+    try:
+        if enabled is None:
+            run()
+        else:
+            with color(enabled):
+                run()
+    except BrokenPipeError:
+        # The reader went away, e.g. output piped into head
+        sys.stderr.close()
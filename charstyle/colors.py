@@ -0,0 +1,235 @@
+"""
+Extended colors for the charstyle library.
+
+This module provides the Color class for 256-color and truecolor (RGB) styles.
+Colors are downsampled to what the output terminal supports using precomputed
+lookup tables, so rendering a distinct color per cell stays cheap.
+"""
+
+from charstyle.capabilities import ColorDepth
+
+# Intensity levels of the 6x6x6 color cube in the xterm 256-color palette
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# Nearest cube level index for each 8-bit channel value
+_CHANNEL_TO_CUBE = bytes(
+    min(range(6), key=lambda i: abs(CUBE_LEVELS[i] - value)) for value in range(256)
+)
+
+# Nearest grayscale ramp index (colors 232-255, levels 8, 18, ..., 238) for each value
+_VALUE_TO_GRAY = bytes(min(23, max(0, (value - 3) // 10)) for value in range(256))
+
+# Nearest of the 16 basic colors for each of the 256 palette colors, using the
+# default xterm palette. Generated offline; indices 0-15 map to themselves.
+_XTERM_TO_BASIC = bytes.fromhex(
+    "000102030405060708090a0b0c0d0e0f00000404040400000604040c02020606"
+    "060602020606060602020606060e0a0a06060e0e00000504040c000808080c0c"
+    "020808080c0c020808080c0c02080806060e0a0a06060e0e0101050505050108"
+    "08080c0c030808080c0c03080808080c03080808070703030807070701010505"
+    "0505010808080c0c03080808080c030808080707030308070707030307070707"
+    "01010505050d01080805050d0308080807070303080707070303070707070b0b"
+    "07070707090905050d0d090905050d0d0303080707070303070707070b0b0707"
+    "07070b0b0707070f000000000000080808080808080808080807070707070707"
+)
+
+
+def rgb_to_xterm(red: int, green: int, blue: int) -> int:
+    """
+    Get the nearest xterm 256-color palette index for an RGB color.
+
+    The nearest color cube entry and the nearest grayscale ramp entry are looked
+    up in per-channel tables, and the closer of the two is returned.
+
+    Args:
+        red (int): Red channel, 0-255
+        green (int): Green channel, 0-255
+        blue (int): Blue channel, 0-255
+
+    Returns:
+        int: A palette index between 16 and 255
+    """
+    r = _CHANNEL_TO_CUBE[red]
+    g = _CHANNEL_TO_CUBE[green]
+    b = _CHANNEL_TO_CUBE[blue]
+    cube_index = 16 + 36 * r + 6 * g + b
+
+    # The closest gray is the one nearest to the mean of the channels
+    gray = _VALUE_TO_GRAY[(red + green + blue) // 3]
+    gray_level = 8 + 10 * gray
+    cube_distance = (
+        (CUBE_LEVELS[r] - red) ** 2 + (CUBE_LEVELS[g] - green) ** 2 + (CUBE_LEVELS[b] - blue) ** 2
+    )
+    gray_distance = (gray_level - red) ** 2 + (gray_level - green) ** 2 + (gray_level - blue) ** 2
+    return 232 + gray if gray_distance < cube_distance else cube_index
+
+
+def xterm_to_basic(index: int) -> int:
+    """
+    Get the nearest of the 16 basic colors for an xterm 256-color palette index.
+
+    Args:
+        index (int): A palette index between 0 and 255
+
+    Returns:
+        int: A basic color index between 0 and 15
+    """
+    return _XTERM_TO_BASIC[index]
+
+
+class Color:
+    """
+    A 256-color or truecolor foreground or background color.
+
+    Colors can be used anywhere a Style is accepted, alone or in a tuple with
+    other styles. When rendered, they are downsampled to the color depth of the
+    output: RGB colors become the nearest 256-color palette entry on 256-color
+    terminals, and the nearest basic color on 16-color terminals.
+
+    Example:
+        >>> from charstyle import Color, Style, styled
+        >>> styled("warm", (Style.BOLD, Color.rgb(255, 135, 0)))
+        >>> styled("cool", Color.xterm(39, background=True))
+    """
+
+    __slots__ = ("red", "green", "blue", "index", "background")
+
+    def __init__(
+        self,
+        red: int | None = None,
+        green: int | None = None,
+        blue: int | None = None,
+        index: int | None = None,
+        background: bool = False,
+    ) -> None:
+        """
+        Create a color. Prefer the rgb(), hex() and xterm() constructors.
+
+        Args:
+            red (int, optional): Red channel of an RGB color, 0-255
+            green (int, optional): Green channel of an RGB color, 0-255
+            blue (int, optional): Blue channel of an RGB color, 0-255
+            index (int, optional): Palette index of a 256-color color, 0-255
+            background (bool, optional): Whether this is a background color
+
+        Raises:
+            ValueError: If the channels or index are missing or out of range
+        """
+        if index is not None:
+            if not 0 <= index <= 255:
+                raise ValueError(f"Color index must be between 0 and 255, got {index}")
+        elif red is None or green is None or blue is None:
+            raise ValueError("Either red, green and blue or index must be given")
+        elif not all(0 <= channel <= 255 for channel in (red, green, blue)):
+            raise ValueError(f"RGB channels must be between 0 and 255, got {(red, green, blue)}")
+
+        self.red = red
+        self.green = green
+        self.blue = blue
+        self.index = index
+        self.background = background
+
+    @classmethod
+    def rgb(cls, red: int, green: int, blue: int, background: bool = False) -> "Color":
+        """
+        Create a truecolor color from RGB channels.
+
+        Args:
+            red (int): Red channel, 0-255
+            green (int): Green channel, 0-255
+            blue (int): Blue channel, 0-255
+            background (bool, optional): Whether this is a background color
+
+        Returns:
+            Color: The color
+        """
+        return cls(red, green, blue, background=background)
+
+    @classmethod
+    def hex(cls, value: str, background: bool = False) -> "Color":
+        """
+        Create a truecolor color from a hex string such as "#ff8800".
+
+        Args:
+            value (str): The color as six hex digits, optionally prefixed with "#"
+            background (bool, optional): Whether this is a background color
+
+        Returns:
+            Color: The color
+
+        Raises:
+            ValueError: If the string is not a valid hex color
+        """
+        digits = value.removeprefix("#")
+        if len(digits) != 6:
+            raise ValueError(f"Invalid hex color: {value!r}")
+        channel = int(digits, 16)
+        return cls(
+            (channel >> 16) & 0xFF, (channel >> 8) & 0xFF, channel & 0xFF, background=background
+        )
+
+    @classmethod
+    def xterm(cls, index: int, background: bool = False) -> "Color":
+        """
+        Create a color from the xterm 256-color palette.
+
+        Args:
+            index (int): The palette index, 0-255
+            background (bool, optional): Whether this is a background color
+
+        Returns:
+            Color: The color
+        """
+        return cls(index=index, background=background)
+
+    @property
+    def value(self) -> str:
+        """The SGR codes for this color at full color depth."""
+        return self.codes(ColorDepth.TRUECOLOR)
+
+    def codes(self, depth: ColorDepth) -> str:
+        """
+        Get the SGR codes for this color, downsampled to a color depth.
+
+        Args:
+            depth (ColorDepth): The color depth of the output
+
+        Returns:
+            str: The SGR codes, e.g. "38;2;255;135;0", "38;5;208" or "91"
+        """
+        index = self.index
+        red, green, blue = self.red, self.green, self.blue
+        if index is None and red is not None and green is not None and blue is not None:
+            if depth >= ColorDepth.TRUECOLOR:
+                return f"{'48' if self.background else '38'};2;{red};{green};{blue}"
+            index = rgb_to_xterm(red, green, blue)
+
+        if index is None:
+            raise ValueError("Color has neither an RGB value nor an index")
+
+        if depth >= ColorDepth.EIGHT_BIT:
+            return f"{'48' if self.background else '38'};5;{index}"
+
+        basic = _XTERM_TO_BASIC[index]
+        base = 40 if self.background else 30
+        if basic >= 8:
+            # Bright colors use the 90-97 and 100-107 ranges
+            base += 60
+            basic -= 8
+        return str(base + basic)
+
+    def _key(self) -> tuple[int | None, int | None, int | None, int | None, bool]:
+        return (self.red, self.green, self.blue, self.index, self.background)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        suffix = ", background=True" if self.background else ""
+        if self.index is not None:
+            return f"Color.xterm({self.index}{suffix})"
+        return f"Color.rgb({self.red}, {self.green}, {self.blue}{suffix})"
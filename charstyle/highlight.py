@@ -0,0 +1,360 @@
+"""
+Single-pass multi-rule highlighting for the charstyle library.
+
+This module provides the Highlighter class, which compiles a list of pattern
+rules into one regular expression and styles each line in a single scan, instead
+of running styled_pattern() once per rule over text that earlier passes have
+already filled with escape sequences.
+
+It also provides functions that highlight files and pipes of any size line by
+line, reading and writing in bounded chunks, which back the
+``python -m charstyle highlight`` command.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from re import Pattern
+from typing import IO, Any
+
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import RESET, StyleType, color_depth, get_style_prefix
+from charstyle.styles import Style
+from charstyle.text import RichText
+
+# Flags of a rule pattern that can be applied to its part of the combined pattern
+_SCOPED_FLAGS = (
+    (re.ASCII, "a"),
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+# Inline flags at the start of a pattern, which apply to the whole pattern, e.g. "(?i)"
+_GLOBAL_FLAGS_RE = re.compile(r"\A(?:\(\?[aiLmsux]+\))+")
+
+# Names of the groups that wrap each rule in the combined pattern
+_RULE_GROUP_RE = re.compile(r"_rule\d+")
+
+# A highlighting rule: a pattern and the style of the text it matches
+Rule = tuple[str | Pattern, StyleType | None]
+
+# A run of text and the style it is rendered in
+Fragment = tuple[str, StyleType | None]
+
+
+def _rule_source(pattern: Pattern) -> str:
+    """Get the source of a compiled rule pattern, with its flags applied to it alone."""
+    source = _GLOBAL_FLAGS_RE.sub("", pattern.pattern)
+    letters = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    if not letters:
+        return source
+    if pattern.flags & re.VERBOSE:
+        # End a trailing comment before the group is closed
+        source += "\n"
+    return f"(?{letters}:{source})"
+
+
+class Highlighter:
+    """
+    Styles the matches of many patterns in a single scan of the text.
+
+    All rules are combined into one alternation, with each rule in a named group
+    of its own. When several rules match at the same position, the rule listed
+    first wins; text matched by one rule is not matched again by any other, so
+    the output never contains nested or overlapping escape sequences. The rule
+    that matched is found from the index of its group, through a table built
+    when the highlighter is created.
+
+    Rules may contain groups of their own, but should not refer to them by
+    number, as in a backreference like ``\\1``, since the numbers change when
+    the rules are combined. Named groups must be unique across all rules.
+
+    Example:
+        >>> from charstyle import Highlighter, Style
+        >>> highlighter = Highlighter([
+        ...     (r"\\d{2}:\\d{2}:\\d{2}", Style.DIM),
+        ...     (r"\\b(?:ERROR|FATAL)\\b", (Style.BOLD, Style.RED)),
+        ...     (r"\\b\\d{1,3}(?:\\.\\d{1,3}){3}\\b", Style.CYAN),
+        ... ])
+        >>> print(highlighter("12:00:01 ERROR connection from 10.0.0.7 refused"))
+    """
+
+    __slots__ = ("rules", "pattern", "_group_rules", "_styles", "_prefixes")
+
+    def __init__(self, rules: Iterable[Rule] | Mapping[str | Pattern, StyleType | None]) -> None:
+        """
+        Compile a highlighter.
+
+        Args:
+            rules (list or dict): (pattern, style) pairs, or a mapping of patterns
+                to styles, in order of priority; a style of None leaves matches
+                of the pattern unstyled and keeps other rules from matching them
+
+        Raises:
+            ValueError: If no rules are given, or a group name is used by more
+                than one rule or is reserved, like "_rule0"
+            re.error: If a pattern is invalid
+        """
+        rules = list(rules.items() if isinstance(rules, Mapping) else rules)
+        if not rules:
+            raise ValueError("A highlighter needs at least one rule")
+
+        # Compile each rule on its own, so its flags and group names can be checked
+        patterns = [re.compile(pattern) for pattern, _ in rules]
+        names: set[str] = set()
+        for pattern in patterns:
+            for name in pattern.groupindex:
+                if name in names:
+                    raise ValueError(f"Group name {name!r} is used by more than one rule")
+                if _RULE_GROUP_RE.fullmatch(name):
+                    raise ValueError(f"Group name {name!r} is reserved for the rules")
+                names.add(name)
+
+        self.rules: tuple[Rule, ...] = tuple(rules)
+        self.pattern = re.compile(
+            "|".join(f"(?P<_rule{i}>{_rule_source(pattern)})" for i, pattern in enumerate(patterns))
+        )
+
+        # Group index of each rule's own group -> index of the rule
+        group_rules: list[int | None] = [None] * (self.pattern.groups + 1)
+        for i in range(len(rules)):
+            group_rules[self.pattern.groupindex[f"_rule{i}"]] = i
+        self._group_rules = group_rules
+        self._styles = tuple(style for _, style in rules)
+        self._prefixes: dict[ColorDepth, tuple[str | None, ...]] = {}
+
+    def _rule_prefixes(self, depth: ColorDepth) -> tuple[str | None, ...]:
+        """Get the escape prefix of each rule's style for a color depth."""
+        prefixes = self._prefixes.get(depth)
+        if prefixes is None:
+            prefixes = self._prefixes[depth] = tuple(
+                get_style_prefix(style, depth) if style else None for style in self._styles
+            )
+        return prefixes
+
+    def highlight(self, text: str, stream: IO[Any] | None = None) -> str:
+        """
+        Style the matches of the rules in text.
+
+        Args:
+            text (str): The text to highlight, without escape sequences
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+
+        Returns:
+            str: The highlighted text
+        """
+        depth = color_depth(stream)
+        if not depth:
+            return text
+        return self._render(text, self._rule_prefixes(depth))
+
+    def _renderer(self, depth: ColorDepth) -> Callable[[str], str]:
+        """Get a function that highlights text at a color depth decided beforehand."""
+        prefixes = self._rule_prefixes(depth)
+        return lambda text: self._render(text, prefixes)
+
+    def _render(self, text: str, prefixes: tuple[str | None, ...]) -> str:
+        """Highlight text with the escape prefixes of the rules' styles."""
+        group_rules = self._group_rules
+        parts = []
+        last_end = 0
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            prefix = prefixes[group_rules[match.lastindex]]  # type: ignore[index]
+            if prefix is None or start == end:
+                continue
+            if start > last_end:
+                parts.append(text[last_end:start])
+            parts.append(prefix + text[start:end] + RESET)
+            last_end = end
+
+        if not parts:
+            return text
+        parts.append(text[last_end:])
+        return "".join(parts)
+
+    def fragments(self, text: str) -> Iterator[Fragment]:
+        """
+        Split text into the (text, style) fragments matched by the rules.
+
+        Args:
+            text (str): The text to highlight
+
+        Returns:
+            Iterator[tuple]: The fragments in order, with None as the style of
+                text that no rule styles
+        """
+        styles = self._styles
+        group_rules = self._group_rules
+        last_end = 0
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            style = styles[group_rules[match.lastindex]]  # type: ignore[index]
+            if not style or start == end:
+                continue
+            if start > last_end:
+                yield text[last_end:start], None
+            yield text[start:end], style
+            last_end = end
+
+        if last_end < len(text):
+            yield text[last_end:], None
+
+    def spans(self, text: str) -> RichText:
+        """
+        Style the matches of the rules in text, returning the text as spans.
+
+        Args:
+            text (str): The text to highlight
+
+        Returns:
+            RichText: The text with the matches of the rules styled
+        """
+        spans = RichText()
+        for fragment, style in self.fragments(text):
+            spans.append(fragment, style)
+        return spans
+
+    __call__ = highlight
+
+    def __repr__(self) -> str:
+        return f"Highlighter({list(self.rules)!r})"
+
+
+# Rules for common log line elements, used when no rules are given
+LOG_RULES: tuple[Rule, ...] = (
+    (r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?", Style.DIM),
+    (r"\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b", Style.DIM),
+    (r"\b(?:ERROR|FATAL|CRITICAL)\b", (Style.BOLD, Style.RED)),
+    (r"\bWARN(?:ING)?\b", (Style.BOLD, Style.YELLOW)),
+    (r"\bINFO\b", Style.GREEN),
+    (r"\b(?:DEBUG|TRACE)\b", Style.BLUE),
+    (r"\b[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}\b", Style.MAGENTA),
+    (r"\bhttps?://[^\s\"'<>]+", (Style.BLUE, Style.UNDERLINE)),
+    (r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b", Style.CYAN),
+    (r"(?<![\w/])(?:/[\w.@-]+)+", Style.UNDERLINE),
+)
+
+
+def read_lines(stream: IO[str], chunk_size: int | None = None) -> Iterator[str]:
+    """
+    Read the lines of a text stream lazily, keeping their line endings.
+
+    Args:
+        stream (IO): The stream to read
+        chunk_size (int, optional): Read the stream in chunks of this many
+            characters and split them into lines, instead of reading it line by
+            line; a line longer than a chunk is kept whole
+
+    Returns:
+        Iterator[str]: The lines of the stream
+    """
+    if chunk_size is None:
+        yield from stream
+        return
+
+    pending = ""
+    while chunk := stream.read(chunk_size):
+        if pending:
+            chunk = pending + chunk
+        start = 0
+        while (end := chunk.find("\n", start)) != -1:
+            yield chunk[start : end + 1]
+            start = end + 1
+        pending = chunk[start:]
+    if pending:
+        yield pending
+
+
+def highlight_lines(
+    lines: Iterable[str],
+    highlighter: "Highlighter | Callable[[str], str]",
+    stream: IO[Any] | None = None,
+) -> Iterator[str]:
+    """
+    Highlight lines lazily, one at a time.
+
+    Line endings are kept, and are not passed to the highlighter.
+
+    Args:
+        lines (Iterable[str]): The lines to highlight, e.g. an open file
+        highlighter (Highlighter | callable): A Highlighter, or a function that
+            styles a line, such as one calling styled_pattern()
+        stream (IO, optional): The stream the lines will be written to, used by a
+            Highlighter to decide whether to emit escape sequences
+
+    Returns:
+        Iterator[str]: The highlighted lines
+
+    Example:
+        >>> from charstyle import Style, styled_pattern
+        >>> errors = lambda line: styled_pattern(line, r"(ERROR)", Style.RED)
+        >>> with open("app.log") as log:
+        ...     for line in highlight_lines(log, errors):
+        ...         print(line, end="")
+    """
+    if isinstance(highlighter, Highlighter):
+        # Check color support once instead of once per line
+        depth = color_depth(stream)
+        if not depth:
+            yield from lines
+            return
+        render: Callable[[str], str] = highlighter._renderer(depth)
+    else:
+        render = highlighter
+
+    for line in lines:
+        if line.endswith("\n"):
+            body = line[:-2] if line.endswith("\r\n") else line[:-1]
+            yield render(body) + line[len(body) :]
+        else:
+            yield render(line)
+
+
+def highlight_stream(
+    source: IO[str],
+    output: IO[str],
+    highlighter: "Highlighter | Callable[[str], str] | None" = None,
+    chunk_size: int | None = 1 << 16,
+    buffer_size: int = 1 << 16,
+) -> None:
+    """
+    Highlight a text stream into another one, in constant memory.
+
+    The source is read in chunks and the highlighted lines are collected into
+    writes of about buffer_size characters, so files of any size can be
+    highlighted without loading them.
+
+    Args:
+        source (IO): The stream to read
+        output (IO): The stream to write the highlighted lines to, which also
+            decides whether escape sequences are emitted
+        highlighter (Highlighter | callable, optional): A Highlighter, or a function
+            that styles a line (default: a Highlighter with LOG_RULES)
+        chunk_size (int, optional): Number of characters to read at a time, or
+            None to read the source line by line
+        buffer_size (int, optional): Number of characters to buffer before writing
+
+    Example:
+        >>> import sys
+        >>> with open("app.log") as log:
+        ...     highlight_stream(log, sys.stdout)
+    """
+    if highlighter is None:
+        highlighter = Highlighter(LOG_RULES)
+
+    buffer: list[str] = []
+    size = 0
+    for line in highlight_lines(read_lines(source, chunk_size), highlighter, output):
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            output.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    if buffer:
+        output.write("".join(buffer))
+    if hasattr(output, "flush"):
+        output.flush()
@@ -0,0 +1,279 @@
+"""
+Keyword highlighting for the charstyle library.
+
+This module provides the KeywordHighlighter class, which styles occurrences of
+a large set of literal keywords, such as host names, error codes or customer
+IDs. The keywords are compiled into an Aho-Corasick automaton, so text is
+scanned once, in time proportional to its length, however many keywords there
+are. A regex alternation of the same keywords would try each of them at every
+position, and takes a long time to compile.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import IO, Any
+
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import RESET, StyleType, color_depth, get_style_prefix
+from charstyle.text import RichText
+
+# A run of text and the style it is rendered in
+Fragment = tuple[str, StyleType | None]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordHighlighter:
+    """
+    Styles the occurrences of many literal keywords in a single scan of the text.
+
+    The automaton is built once, when the highlighter is created. Where keywords
+    overlap, the one that starts first wins, and of those starting at the same
+    position the longest. Highlighters can be pickled, so worker processes can
+    receive a built automaton instead of building their own.
+
+    Example:
+        >>> from charstyle import KeywordHighlighter, Style
+        >>> keywords = {"db-01": Style.CYAN, "db-02": Style.CYAN, "E1042": Style.RED}
+        >>> highlighter = KeywordHighlighter(keywords)
+        >>> print(highlighter("E1042 replication lag on db-02"))
+    """
+
+    __slots__ = (
+        "keywords",
+        "ignore_case",
+        "whole_words",
+        "_goto",
+        "_fail",
+        "_output",
+        "_output_link",
+        "_lengths",
+        "_styles",
+        "_prefixes",
+    )
+
+    def __init__(
+        self,
+        keywords: Mapping[str, StyleType | None] | Iterable[tuple[str, StyleType | None]],
+        ignore_case: bool = False,
+        whole_words: bool = True,
+    ) -> None:
+        """
+        Build a keyword highlighter.
+
+        Args:
+            keywords (dict or list): A mapping of keywords to styles, or
+                (keyword, style) pairs; a keyword given twice keeps its last style
+            ignore_case (bool, optional): Match keywords regardless of case
+            whole_words (bool, optional): Only match keywords that are not part of
+                a longer word, so "db-1" does not match inside "db-10" (default: True)
+
+        Raises:
+            ValueError: If a keyword is empty
+        """
+        items = keywords.items() if isinstance(keywords, Mapping) else keywords
+        styles: dict[str, StyleType | None] = {}
+        for keyword, style in items:
+            if not keyword:
+                raise ValueError("Keywords must not be empty")
+            styles[keyword.lower() if ignore_case else keyword] = style
+
+        self.keywords = tuple(styles)
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        self._lengths = tuple(len(keyword) for keyword in self.keywords)
+        self._styles = tuple(styles.values())
+        self._prefixes: dict[ColorDepth, tuple[str | None, ...]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        """Build the trie of the keywords, then its failure and output links."""
+        # Transitions of each state, and the keyword ending at each state (-1: none)
+        goto: list[dict[str, int]] = [{}]
+        output = [-1]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    output.append(-1)
+                state = next_state
+            output[state] = index
+
+        # Breadth first, link each state to the state of its longest proper suffix
+        # in the trie, and to the nearest state on that chain that ends a keyword
+        fail = [0] * len(goto)
+        output_link = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while char not in goto[link] and link:
+                    link = fail[link]
+                link = goto[link].get(char, 0)
+                fail[next_state] = link
+                output_link[next_state] = link if output[link] >= 0 else output_link[link]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._output_link = output_link
+
+    def matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """
+        Find the keywords in text, without overlaps.
+
+        Args:
+            text (str): The text to search
+
+        Returns:
+            Iterator[tuple[int, int, str]]: The start, end and keyword of each
+                match, in order
+        """
+        for start, end, index in self._matches(text):
+            yield start, end, self.keywords[index]
+
+    def _matches(self, text: str) -> list[tuple[int, int, int]]:
+        """Find the non-overlapping matches in text as (start, end, keyword index)."""
+        if self.ignore_case:
+            folded = text.lower()
+            # Characters whose lower case form is longer would shift the offsets
+            text = (
+                folded
+                if len(folded) == len(text)
+                else "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+            )
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        output_link = self._output_link
+        lengths = self._lengths
+        whole_words = self.whole_words
+
+        # The longest match starting at each position: start -> (end, keyword index)
+        longest: dict[int, tuple[int, int]] = {}
+        state = 0
+        for position, char in enumerate(text):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+
+            found = state if output[state] >= 0 else output_link[state]
+            while found:
+                index = output[found]
+                end = position + 1
+                start = end - lengths[index]
+                if not whole_words or (
+                    (start == 0 or not _is_word_char(text[start - 1]))
+                    and (end == len(text) or not _is_word_char(text[end]))
+                ):
+                    # A match found later for the same start is longer
+                    longest[start] = (end, index)
+                found = output_link[found]
+
+        # Leftmost, then longest, non-overlapping matches
+        result = []
+        last_end = 0
+        for start in sorted(longest):
+            if start >= last_end:
+                end, index = longest[start]
+                result.append((start, end, index))
+                last_end = end
+        return result
+
+    def _rule_prefixes(self, depth: ColorDepth) -> tuple[str | None, ...]:
+        """Get the escape prefix of each keyword's style for a color depth."""
+        prefixes = self._prefixes.get(depth)
+        if prefixes is None:
+            prefixes = self._prefixes[depth] = tuple(
+                get_style_prefix(style, depth) if style else None for style in self._styles
+            )
+        return prefixes
+
+    def highlight(self, text: str, stream: IO[Any] | None = None) -> str:
+        """
+        Style the keywords in text.
+
+        Args:
+            text (str): The text to highlight, without escape sequences
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+
+        Returns:
+            str: The highlighted text
+        """
+        depth = color_depth(stream)
+        if not depth:
+            return text
+
+        prefixes = self._rule_prefixes(depth)
+        parts = []
+        last_end = 0
+        for start, end, index in self._matches(text):
+            prefix = prefixes[index]
+            if prefix is None:
+                continue
+            if start > last_end:
+                parts.append(text[last_end:start])
+            parts.append(prefix + text[start:end] + RESET)
+            last_end = end
+
+        if not parts:
+            return text
+        parts.append(text[last_end:])
+        return "".join(parts)
+
+    def fragments(self, text: str) -> Iterator[Fragment]:
+        """
+        Split text into (text, style) fragments at the keywords.
+
+        Args:
+            text (str): The text to highlight
+
+        Returns:
+            Iterator[tuple]: The fragments in order, with None as the style of
+                text that is not a keyword
+        """
+        styles = self._styles
+        last_end = 0
+        for start, end, index in self._matches(text):
+            style = styles[index]
+            if not style:
+                continue
+            if start > last_end:
+                yield text[last_end:start], None
+            yield text[start:end], style
+            last_end = end
+
+        if last_end < len(text):
+            yield text[last_end:], None
+
+    def spans(self, text: str) -> RichText:
+        """
+        Style the keywords in text, returning the text as spans.
+
+        Args:
+            text (str): The text to highlight
+
+        Returns:
+            RichText: The text with its keywords styled
+        """
+        spans = RichText()
+        for fragment, style in self.fragments(text):
+            spans.append(fragment, style)
+        return spans
+
+    __call__ = highlight
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __repr__(self) -> str:
+        return f"<KeywordHighlighter with {len(self.keywords)} keywords>"
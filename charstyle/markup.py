@@ -0,0 +1,252 @@
+"""
+Inline markup for the charstyle library.
+
+This module parses strings such as ``"[bold red]Error:[/] {}"`` into styled
+fragments built from the Style codes. Parsed markup is kept in a bounded cache
+keyed by the markup string, so a message that is printed repeatedly is only
+parsed once, and ``{}`` placeholders are filled in without parsing it again.
+
+Tags contain style names in lower case (``bold``, ``bright_red``, ``bg_blue``),
+``on <color>`` for a background color, and ``#rrggbb`` hex colors. ``[/]``
+closes the most recently opened tag and ``[/bold red]`` closes a specific one;
+tags that are still open at the end of the string are closed there. A bracket
+preceded by a backslash (``\\[``) is kept as literal text.
+"""
+
+import functools
+import re
+from typing import IO, Any
+
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import RESET, StyleType, color_depth, get_style_prefix
+from charstyle.colors import Color
+from charstyle.styles import Style
+
+# An escaped opening bracket, or a tag whose content starts like a style or a closing tag
+_TAG_RE = re.compile(r"\\\[|\[(/?[a-z#][^\[\]]*|/)\]")
+
+# Style members by their lower case name, e.g. "bright_red"
+_STYLE_NAMES = {name.lower(): member for name, member in Style.__members__.items()}
+
+# A run of text and the styles it is rendered in
+Fragment = tuple[str, StyleType | None]
+
+
+def _parse_color(word: str, background: bool) -> Style | Color:
+    """Get the style for a color name or hex color, as foreground or background."""
+    if word.startswith("#"):
+        return Color.hex(word, background=background)
+    style = _STYLE_NAMES.get(("bg_" if background else "") + word)
+    if style is None:
+        raise ValueError(f"Unknown {'background ' if background else ''}color in markup: {word!r}")
+    return style
+
+
+@functools.lru_cache(maxsize=256)
+def parse_style(tag: str) -> tuple[Style | Color, ...]:
+    """
+    Get the styles named by the content of a markup tag.
+
+    Args:
+        tag (str): Style names, e.g. "bold red on white" or "#ff8700"
+
+    Returns:
+        tuple: The styles, in order
+
+    Raises:
+        ValueError: If a word is not a style name or color
+    """
+    styles: list[Style | Color] = []
+    words = iter(tag.split())
+    for word in words:
+        if word == "on":
+            background = next(words, None)
+            if background is None:
+                raise ValueError(f"Missing background color in markup tag: [{tag}]")
+            styles.append(_parse_color(background, background=True))
+        elif word.startswith("#"):
+            styles.append(Color.hex(word))
+        elif word in _STYLE_NAMES:
+            styles.append(_STYLE_NAMES[word])
+        else:
+            raise ValueError(f"Unknown style in markup tag [{tag}]: {word!r}")
+    return tuple(styles)
+
+
+class Markup:
+    """
+    Parsed markup, ready to be rendered or formatted any number of times.
+
+    The escape sequences for each color depth are built on first use and kept,
+    so rendering the same markup again is a dictionary lookup, and formatting it
+    only substitutes the values.
+
+    Use parse_markup() to get cached instances instead of creating them directly.
+
+    Example:
+        >>> from charstyle.markup import parse_markup
+        >>> message = parse_markup("[bold red]Error:[/] {} not found")
+        >>> message.format("config.toml")
+        # This returns "Error:" in bold red followed by " config.toml not found"
+    """
+
+    __slots__ = ("markup", "fragments", "_rendered")
+
+    def __init__(self, markup: str) -> None:
+        """
+        Parse markup.
+
+        Args:
+            markup (str): The markup string
+
+        Raises:
+            ValueError: If a tag names an unknown style or closes a tag that is not open
+        """
+        self.markup = markup
+        self.fragments = _parse(markup)
+        self._rendered: dict[ColorDepth, str] = {}
+
+    @property
+    def plain(self) -> str:
+        """The text without tags or styles."""
+        return "".join(text for text, _ in self.fragments)
+
+    def render(self, stream: IO[Any] | None = None) -> str:
+        """
+        Render the markup with escape sequences, without substituting placeholders.
+
+        Args:
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+
+        Returns:
+            str: The rendered text
+        """
+        depth = color_depth(stream)
+        rendered = self._rendered.get(depth)
+        if rendered is None:
+            parts = []
+            for text, style in self.fragments:
+                if style and depth:
+                    parts.append(get_style_prefix(style, depth) + text + RESET)
+                else:
+                    parts.append(text)
+            rendered = self._rendered[depth] = "".join(parts)
+        return rendered
+
+    def format(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Render the markup and fill in its placeholders, as str.format() does.
+
+        Values take the style of the tags around their placeholder. Values are
+        inserted as they are; markup inside them is not parsed.
+
+        Args:
+            *args: Values of the positional placeholders
+            **kwargs: Values of the named placeholders
+
+        Returns:
+            str: The rendered text
+        """
+        return self.render().format(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f"Markup({self.markup!r})"
+
+
+def _parse(markup: str) -> tuple[Fragment, ...]:
+    """Split markup into (text, style) fragments, merging the styles of nested tags."""
+    fragments: list[Fragment] = []
+    stack: list[tuple[str, tuple[Style | Color, ...]]] = []
+    style: tuple[Style | Color, ...] = ()
+    text: list[str] = []
+
+    def flush() -> None:
+        joined = "".join(text)
+        if joined:
+            fragments.append((joined, style or None))
+        text.clear()
+
+    last_end = 0
+    for match in _TAG_RE.finditer(markup):
+        text.append(markup[last_end : match.start()])
+        last_end = match.end()
+
+        tag = match.group(1)
+        if tag is None:
+            text.append("[")
+            continue
+
+        flush()
+        if tag.startswith("/"):
+            name = " ".join(tag[1:].split())
+            if not stack:
+                raise ValueError(f"Closing tag [{tag}] has no matching opening tag")
+            if not name:
+                stack.pop()
+            else:
+                for index in range(len(stack) - 1, -1, -1):
+                    if stack[index][0] == name:
+                        del stack[index]
+                        break
+                else:
+                    raise ValueError(f"Closing tag [{tag}] has no matching opening tag")
+        else:
+            stack.append((" ".join(tag.split()), parse_style(tag)))
+        style = tuple(s for _, styles in stack for s in styles)
+
+    text.append(markup[last_end:])
+    flush()
+    return tuple(fragments)
+
+
+@functools.lru_cache(maxsize=512)
+def parse_markup(markup: str) -> Markup:
+    """
+    Parse markup, reusing the result for markup strings that were parsed before.
+
+    Results are kept in a bounded cache keyed by the markup string. Use
+    ``parse_markup.cache_info()`` to inspect hit/miss statistics.
+
+    Args:
+        markup (str): The markup string
+
+    Returns:
+        Markup: The parsed markup
+
+    Raises:
+        ValueError: If a tag names an unknown style or closes a tag that is not open
+    """
+    return Markup(markup)
+
+
+def styled_markup(text: str, *args: Any, **kwargs: Any) -> str:
+    """
+    Render markup such as "[bold red]Error:[/] {}" with escape sequences.
+
+    When values are given, placeholders are filled in as str.format() does;
+    without values the text is rendered as is, so literal braces need no escaping.
+
+    Args:
+        text (str): The markup string
+        *args: Values of the positional placeholders
+        **kwargs: Values of the named placeholders
+
+    Returns:
+        str: The rendered text
+
+    Raises:
+        ValueError: If a tag names an unknown style or closes a tag that is not open
+
+    Example:
+        >>> from charstyle import styled_markup
+        >>> styled_markup("[bold]{}[/] files copied to [green]{dest}[/]", 3, dest="/tmp")
+        # This returns "3" in bold and "/tmp" in green
+    """
+    parsed = parse_markup(text)
+    if args or kwargs:
+        return parsed.format(*args, **kwargs)
+    return parsed.render()
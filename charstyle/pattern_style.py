@@ -2,17 +2,95 @@
 Pattern-based styling functions for the charstyle library.
 
 This module provides functions for styling text based on patterns and delimiters.
+Each function has a *_spans variant that returns the styled parts as RichText,
+which can be measured, sliced and restyled without parsing escape sequences.
+Format strings that are rendered many times can be compiled into a StyledTemplate.
+
+Patterns given as strings are compiled through a bounded cache of their own, so
+that the patterns used for every line of a log are not evicted from the small
+cache of the re module by other code.
 """
 
+import functools
 import re
-from re import Pattern
-from typing import Any
-
-from charstyle.charstyle import styled
+import string
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from re import Match, Pattern
+from typing import IO, Any, NamedTuple
+
+from charstyle.align import Align
+from charstyle.charstyle import (
+    RESET,
+    ResolvedStyle,
+    align_text,
+    color_depth,
+    get_style_prefix,
+    styled,
+)
+from charstyle.colors import Color
 from charstyle.styles import Style
+from charstyle.text import RichText
 
 # Type alias for style parameters
-StyleType = Style | tuple[Style, ...]
+StyleType = Style | Color | ResolvedStyle | tuple[Style | Color | ResolvedStyle, ...]
+
+# Number of compiled patterns kept by the pattern cache unless changed
+DEFAULT_PATTERN_CACHE_SIZE = 256
+
+
+def _compile(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
+_compile_cached = functools.lru_cache(maxsize=DEFAULT_PATTERN_CACHE_SIZE)(_compile)
+
+
+def compile_pattern(pattern: str | Pattern) -> Pattern:
+    """
+    Get a compiled regex pattern, compiling strings through the pattern cache.
+
+    Args:
+        pattern (str | Pattern): The pattern, compiled or as a string
+
+    Returns:
+        Pattern: The compiled pattern
+    """
+    if isinstance(pattern, str):
+        return _compile_cached(pattern)
+    return pattern
+
+
+def set_pattern_cache_size(size: int | None) -> None:
+    """
+    Change the number of compiled patterns kept by the pattern cache.
+
+    The cache is emptied, and its statistics are reset.
+
+    Args:
+        size (int | None): The maximum number of patterns to keep, 0 to disable
+            caching, or None for an unbounded cache
+
+    Example:
+        >>> set_pattern_cache_size(1024)  # Many different patterns in use
+    """
+    global _compile_cached
+
+    _compile_cached = functools.lru_cache(maxsize=size)(_compile)
+
+
+def pattern_cache_info() -> "functools._CacheInfo":
+    """
+    Get the statistics of the pattern cache.
+
+    Returns:
+        CacheInfo: The hits, misses, maximum size and current size of the cache
+    """
+    return _compile_cached.cache_info()
+
+
+def clear_pattern_cache() -> None:
+    """Forget all compiled patterns and reset the cache statistics."""
+    _compile_cached.cache_clear()
 
 
 def styled_split(text: str, delimiter: str, *styles: StyleType) -> str:
@@ -39,6 +117,28 @@ def styled_split(text: str, delimiter: str, *styles: StyleType) -> str:
     if not text:
         return ""
 
+    return split_spans(text, delimiter, *styles).render()
+
+
+def split_spans(text: str, delimiter: str, *styles: StyleType) -> RichText:
+    """
+    Split text by a delimiter and style each part, returning the parts as spans.
+
+    Args:
+        text (str): The text to style
+        delimiter (str): The delimiter to split on
+        *styles: Variable number of style constants to apply to each part
+
+    Returns:
+        RichText: The styled parts, separated by unstyled delimiters
+
+    Raises:
+        ValueError: If the number of styles doesn't match the number of parts after splitting
+    """
+    spans = RichText()
+    if not text:
+        return spans
+
     parts = text.split(delimiter)
 
     # Check if the number of parts matches the number of styles
@@ -47,19 +147,20 @@ def styled_split(text: str, delimiter: str, *styles: StyleType) -> str:
             f"Number of parts ({len(parts)}) doesn't match number of styles ({len(styles)})"
         )
 
-    styled_parts = []
-
     for i, part in enumerate(parts):
-        style = styles[i]
-        styled_parts.append(styled(part, style))
+        if i:
+            spans.append(delimiter)
+        spans.append(part, styles[i])
 
-    return delimiter.join(styled_parts)
+    return spans
 
 
 def styled_pattern(text: str, pattern: str | Pattern, *styles: StyleType) -> str:
     """
     Style text by splitting it with a regex pattern and applying different styles to each captured group.
 
+    Patterns given as strings are compiled once and kept in the pattern cache.
+
     Args:
         text (str): The text to style
         pattern (str | Pattern): The regex pattern to match
@@ -73,41 +174,55 @@ def styled_pattern(text: str, pattern: str | Pattern, *styles: StyleType) -> str
         >>> styled_pattern("Hello World", r"(World)", Style.RED)
         # This returns "Hello " and "World" in red
     """
-    # Compile the pattern if it's a string
-    if isinstance(pattern, str):
-        pattern = re.compile(pattern)
+    return pattern_spans(text, pattern, *styles).render()
+
+
+def pattern_spans(text: str, pattern: str | Pattern, *styles: StyleType) -> RichText:
+    """
+    Style the captured groups of a regex pattern, returning the text as spans.
 
-    matches = list(pattern.finditer(text))
-    if not matches:
-        return text
+    Text between matches is kept unstyled. Within a match, only the text of its
+    captured groups is kept, as in styled_pattern().
 
-    # Create a list to hold the result
-    result_list = []
+    Args:
+        text (str): The text to style
+        pattern (str | Pattern): The regex pattern to match
+        *styles: Variable number of style constants to apply to each captured group
+
+    Returns:
+        RichText: The text with its captured groups styled
+    """
+    # Compile string patterns through the pattern cache
+    pattern = compile_pattern(pattern)
+
+    spans = RichText()
     last_end = 0
 
-    for match in matches:
+    for match in pattern.finditer(text):
         # Add the text before the match
         if match.start() > last_end:
-            result_list.append(text[last_end : match.start()])
+            spans.append(text[last_end : match.start()])
 
-        # Add the styled captured groups
+        # Add the captured groups
         for i, group in enumerate(match.groups(), start=1):
             if group is not None:
-                if i - 1 < len(styles):
-                    result_list.append(styled(group, styles[i - 1]))
-                else:
-                    result_list.append(group)
+                spans.append(group, styles[i - 1] if i - 1 < len(styles) else None)
 
         last_end = match.end()
 
     # Add any remaining text
     if last_end < len(text):
-        result_list.append(text[last_end:])
+        spans.append(text[last_end:])
 
-    return "".join(result_list)
+    return spans
 
 
-def styled_pattern_match(text: str, pattern: str | Pattern, style_map: dict[str, StyleType]) -> str:
+def styled_pattern_match(
+    text: str,
+    pattern: str | Pattern,
+    style_map: dict[str, StyleType],
+    all_matches: bool = False,
+) -> str:
     """
     Style text by matching a regex pattern with named groups and applying styles from a style map.
 
@@ -115,54 +230,109 @@ def styled_pattern_match(text: str, pattern: str | Pattern, style_map: dict[str,
         text (str): The text to style
         pattern (str | Pattern): The regex pattern with named groups to match
         style_map (Dict[str, StyleType]): A mapping of group names to styles
+        all_matches (bool, optional): Style the groups of every match instead of
+            only the first one (default: False)
 
     Returns:
         str: The styled text
 
     Example:
         >>> from charstyle import Style
-        >>> pattern = r"(?P<n>[a-z]+): (?P<value>\d+)"
+        >>> pattern = r"(?P<n>[a-z]+): (?P<value>\\d+)"
         >>> style_map = {"n": Style.RED, "value": Style.GREEN}
         >>> styled_pattern_match("Count: 42", pattern, style_map)
         # This returns "Count" in red and "42" in green
+        >>> pattern = r"(?P<key>\\w+)=(?P<value>\\S+)"
+        >>> style_map = {"key": Style.BLUE, "value": Style.GREEN}
+        >>> styled_pattern_match("user=ann id=7", pattern, style_map, all_matches=True)
+        # This returns both keys in blue and both values in green
     """
-    # Compile the pattern if it's a string
-    if isinstance(pattern, str):
-        pattern = re.compile(pattern)
+    return pattern_match_spans(text, pattern, style_map, all_matches).render()
+
+
+@functools.lru_cache(maxsize=256)
+def _group_styles(
+    pattern: Pattern, styles: tuple[tuple[str, StyleType], ...]
+) -> tuple[tuple[int, StyleType], ...]:
+    """Get the group index and style of each styled named group of a pattern."""
+    groupindex = pattern.groupindex
+    return tuple(
+        sorted(
+            ((groupindex[name], style) for name, style in styles if name in groupindex),
+            key=lambda group: group[0],
+        )
+    )
 
-    match = pattern.search(text)
-    if not match:
-        return text
 
-    # Create a list to hold the result
-    result_list = []
-    last_end = 0
+def _outer_first(group: tuple[tuple[int, int], StyleType]) -> tuple[int, int]:
+    """Order group spans by position, with a group before the groups nested in it."""
+    (start, end), _ = group
+    return start, -end
+
+
+def pattern_match_spans(
+    text: str,
+    pattern: str | Pattern,
+    style_map: dict[str, StyleType],
+    all_matches: bool = False,
+) -> RichText:
+    """
+    Style the named groups of the first regex match, or of every match, returning spans.
 
-    # Process all named groups
-    for group_name, style in style_map.items():
-        try:
-            group_start = match.start(group_name)
-            group_end = match.end(group_name)
-            group_text = match.group(group_name)
+    Groups are styled in the order they appear in the text. Unmatched groups,
+    and groups overlapping a group that starts earlier, are skipped. The group
+    index of each styled name is looked up once per pattern and style map.
+
+    Args:
+        text (str): The text to style
+        pattern (str | Pattern): The regex pattern with named groups to match
+        style_map (Dict[str, StyleType]): A mapping of group names to styles
+        all_matches (bool, optional): Style the groups of every match instead of
+            only the first one (default: False)
+
+    Returns:
+        RichText: The text with the named groups of the matches styled
+    """
+    # Compile string patterns through the pattern cache
+    pattern = compile_pattern(pattern)
+    table = _group_styles(pattern, tuple(style_map.items()))
+
+    spans = RichText()
+    if all_matches:
+        matches: Iterable[Match[str]] = pattern.finditer(text)
+    else:
+        match = pattern.search(text)
+        matches = (match,) if match else ()
+
+    last_end = 0
+    for match in matches:
+        regs = match.regs
+        groups = [(regs[index], style) for index, style in table]
+        # Groups usually appear in the text in the order of the pattern
+        previous_start = -1
+        for (start, _), _ in groups:
+            if start < previous_start:
+                groups.sort(key=_outer_first)
+                break
+            previous_start = start
+        for (start, end), style in groups:
+            if start < last_end:
+                # Unmatched group, or overlapping a group already added
+                continue
 
             # Add any text before this group
-            if group_start > last_end:
-                result_list.append(text[last_end:group_start])
+            if start > last_end:
+                spans.append(text[last_end:start])
 
             # Add the styled group
-            result_list.append(styled(group_text, style))
-
-            # Update last_end if this group ends later
-            last_end = max(last_end, group_end)
-        except IndexError:
-            # Group not found, skip it
-            continue
+            spans.append(text[start:end], style)
+            last_end = end
 
     # Add any remaining text
     if last_end < len(text):
-        result_list.append(text[last_end:])
+        spans.append(text[last_end:])
 
-    return "".join(result_list)
+    return spans
 
 
 def styled_format(
@@ -198,3 +368,187 @@ def styled_format(
 
     # Format the string
     return format_str.format(*styled_args, **styled_kwargs)
+
+
+# Field settings given per field, keyed by field name or position, or as a sequence by position
+FieldSettings = Mapping[int | str, Any] | Sequence[Any]
+
+_FORMATTER = string.Formatter()
+
+_CONVERSIONS: dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
+
+
+class _TemplateField(NamedTuple):
+    """A replacement field of a StyledTemplate, with the literal text before it."""
+
+    literal: str
+    key: int | str  # position or name of the argument
+    lookup: str | None  # attribute and index lookups, as a field name of "0"
+    convert: Callable[[Any], str] | None
+    spec: str
+    prefix: str
+    suffix: str
+    width: int | None
+    align: Align
+
+
+def _field_settings(settings: FieldSettings | None) -> Mapping[int | str, Any]:
+    """Normalize per-field settings to a mapping keyed by field name or position."""
+    if settings is None:
+        return {}
+    if isinstance(settings, Mapping):
+        return settings
+    return dict(enumerate(settings))
+
+
+class StyledTemplate:
+    """
+    A format string compiled once, with a style and width for each field.
+
+    The format string is parsed when the template is created: its literal parts
+    are split out and the escape sequence prefix of each field's style is built
+    for the color depth of the stream. Formatting the template then only has to
+    convert the values, pad them and join the parts, instead of styling every
+    argument and parsing the format string again as styled_format() does.
+
+    Fields are looked up like in str.format(): "{}" and "{0}" refer to positional
+    arguments and "{name}" to keyword arguments. Format specs and conversions are
+    applied to the value before it is padded and styled.
+
+    Example:
+        >>> from charstyle import Align, Style, StyledTemplate
+        >>> line = StyledTemplate(
+        ...     "{level} {message}",
+        ...     styles={"level": (Style.BOLD, Style.RED)},
+        ...     widths={"level": 7},
+        ... )
+        >>> line.format(level="ERROR", message="disk full")
+        # This returns "ERROR  " in bold red followed by " disk full"
+    """
+
+    __slots__ = ("format_str", "_fields", "_tail")
+
+    def __init__(
+        self,
+        format_str: str,
+        styles: FieldSettings | None = None,
+        widths: FieldSettings | None = None,
+        aligns: FieldSettings | None = None,
+        stream: IO[Any] | None = None,
+    ) -> None:
+        """
+        Compile a template.
+
+        Args:
+            format_str (str): The format string with placeholders
+            styles (dict or sequence, optional): The style of each field, keyed by
+                field name or position, or as a sequence for positional fields
+            widths (dict or sequence, optional): The display width each field is
+                padded to
+            aligns (dict or sequence, optional): The alignment of each field within
+                its width (default: Align.LEFT)
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+
+        Raises:
+            ValueError: If the format string is invalid, mixes automatic and manual
+                field numbering, or uses nested replacement fields
+        """
+        styles = _field_settings(styles)
+        widths = _field_settings(widths)
+        aligns = _field_settings(aligns)
+        depth = color_depth(stream)
+
+        self.format_str = format_str
+        fields: list[_TemplateField] = []
+        literal_parts = []
+        auto_index = 0
+        numbering = None
+        for literal, field_name, format_spec, conversion in _FORMATTER.parse(format_str):
+            literal_parts.append(literal)
+            if field_name is None:
+                continue
+
+            if format_spec and "{" in format_spec:
+                raise ValueError("Nested replacement fields are not supported in templates")
+            if conversion is not None and conversion not in _CONVERSIONS:
+                raise ValueError(f"Unknown conversion specifier {conversion!r}")
+
+            # Split "name.attr[0]" into the argument key and the rest of the field
+            match = re.match(r"[^.[]*", field_name)
+            first = match.group() if match else ""
+            rest = field_name[len(first) :]
+            if first == "":
+                if numbering == "manual":
+                    raise ValueError("Cannot switch from manual to automatic field numbering")
+                numbering = "auto"
+                key: int | str = auto_index
+                auto_index += 1
+            elif first.isdigit():
+                if numbering == "auto":
+                    raise ValueError("Cannot switch from automatic to manual field numbering")
+                numbering = "manual"
+                key = int(first)
+            else:
+                key = first
+
+            # Settings may be given for the field name or for the argument
+            style = styles.get(field_name, styles.get(key))
+            prefix = get_style_prefix(style, depth) if style and depth else ""
+            fields.append(
+                _TemplateField(
+                    "".join(literal_parts),
+                    key,
+                    "0" + rest if rest else None,
+                    _CONVERSIONS[conversion] if conversion else None,
+                    format_spec or "",
+                    prefix,
+                    RESET if prefix else "",
+                    widths.get(field_name, widths.get(key)),
+                    aligns.get(field_name, aligns.get(key, Align.LEFT)),
+                )
+            )
+            literal_parts = []
+
+        self._fields = tuple(fields)
+        self._tail = "".join(literal_parts)
+
+    def format(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Format the template with values.
+
+        Args:
+            *args: Values of the positional fields
+            **kwargs: Values of the named fields
+
+        Returns:
+            str: The formatted string with styled values
+
+        Raises:
+            IndexError: If a positional field has no value
+            KeyError: If a named field has no value
+        """
+        parts = []
+        for literal, key, lookup, convert, spec, prefix, suffix, width, align in self._fields:
+            if literal:
+                parts.append(literal)
+
+            value = args[key] if isinstance(key, int) else kwargs[key]
+            if lookup is not None:
+                value = _FORMATTER.get_field(lookup, (value,), {})[0]
+            if convert is not None:
+                value = convert(value)
+            text = value if value.__class__ is str and not spec else format(value, spec)
+
+            if width is not None:
+                text = align_text(text, width, align)
+            if text:
+                parts.append(prefix + text + suffix)
+
+        parts.append(self._tail)
+        return "".join(parts)
+
+    __call__ = format
+
+    def __repr__(self) -> str:
+        return f"StyledTemplate({self.format_str!r})"
@@ -0,0 +1,285 @@
+"""
+SGR (Select Graphic Rendition) state tracking for the charstyle library.
+
+This module models the terminal attribute state that SGR escape sequences
+manipulate, and computes the shortest escape sequence needed to move from one
+state to another. It is used to avoid emitting redundant resets when many styled
+fragments are written next to each other, and to rewrite already rendered
+output into a more compact equivalent.
+"""
+
+import functools
+import re
+from itertools import chain
+from typing import NamedTuple
+
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import RESET, StyleType, get_style_prefix
+
+# Regular expression to match SGR escape sequences, capturing their parameters
+SGR_RE = re.compile(r"\x1b\[([0-9;:]*)m")
+
+# Codes that turn an attribute off, keyed by the attribute code they cancel
+_ATTR_OFF = {
+    "1": "22",
+    "2": "22",
+    "3": "23",
+    "4": "24",
+    "21": "24",
+    "5": "25",
+    "6": "25",
+    "7": "27",
+    "8": "28",
+    "9": "29",
+}
+
+# Attributes cleared by each "off" code
+_OFF_CLEARS = {
+    "22": ("1", "2"),
+    "23": ("3",),
+    "24": ("4", "21"),
+    "25": ("5", "6"),
+    "27": ("7",),
+    "28": ("8",),
+    "29": ("9",),
+}
+
+
+class SGRState(NamedTuple):
+    """
+    The graphic rendition state of a terminal.
+
+    Attributes:
+        attrs: Codes of the active text attributes (bold, underline, ...)
+        fg: Code of the active foreground color, or None for the default
+        bg: Code of the active background color, or None for the default
+    """
+
+    attrs: frozenset[str] = frozenset()
+    fg: str | None = None
+    bg: str | None = None
+
+    def codes(self) -> list[str]:
+        """
+        Get the SGR codes that establish this state from a reset terminal.
+
+        Returns:
+            list[str]: The codes, attributes first, then foreground and background
+        """
+        codes = sorted(self.attrs, key=_code_sort_key)
+        if self.fg is not None:
+            codes.append(self.fg)
+        if self.bg is not None:
+            codes.append(self.bg)
+        return codes
+
+
+DEFAULT_STATE = SGRState()
+
+# Attributes that do not change how a space character looks
+_SPACE_NEUTRAL_ATTRS = frozenset({"1", "2", "3", "5", "6", "8"})
+
+
+def _code_sort_key(code: str) -> tuple[int, str]:
+    """Sort numeric codes numerically, keeping any other codes stable after them."""
+    return (int(code), code) if code.isdigit() else (1 << 16, code)
+
+
+def _is_fg(code: int) -> bool:
+    return 30 <= code <= 37 or 90 <= code <= 97
+
+
+def _is_bg(code: int) -> bool:
+    return 40 <= code <= 47 or 100 <= code <= 107
+
+
+@functools.lru_cache(maxsize=1024)
+def apply_sgr(state: SGRState, params: str) -> SGRState:
+    """
+    Apply the parameters of an SGR escape sequence to a state.
+
+    Args:
+        state (SGRState): The state before the sequence
+        params (str): The sequence parameters, e.g. "1;31" for ESC[1;31m
+
+    Returns:
+        SGRState: The state after the sequence
+    """
+    attrs = set(state.attrs)
+    fg = state.fg
+    bg = state.bg
+
+    tokens = params.split(";")
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+
+        if token in ("", "0"):
+            attrs.clear()
+            fg = bg = None
+            continue
+
+        if not token.isdigit():
+            # Colon separated sub-parameters, e.g. 38:5:196 or 4:3
+            head = token.split(":", 1)[0]
+            if head == "38":
+                fg = token
+            elif head == "48":
+                bg = token
+            else:
+                attrs.add(token)
+            continue
+
+        code = int(token)
+        if code in (38, 48):
+            # Extended colors: 38;5;n or 38;2;r;g;b
+            length = 2 if tokens[i : i + 1] == ["5"] else 4 if tokens[i : i + 1] == ["2"] else 0
+            value = ";".join(tokens[i - 1 : i + length])
+            i += length
+            if code == 38:
+                fg = value
+            else:
+                bg = value
+        elif _is_fg(code):
+            fg = token
+        elif _is_bg(code):
+            bg = token
+        elif code == 39:
+            fg = None
+        elif code == 49:
+            bg = None
+        elif token in _OFF_CLEARS:
+            attrs.difference_update(_OFF_CLEARS[token])
+        else:
+            attrs.add(token)
+
+    return SGRState(frozenset(attrs), fg, bg)
+
+
+@functools.lru_cache(maxsize=1024)
+def sgr_transition(old: SGRState, new: SGRState) -> str:
+    """
+    Get the shortest escape sequence that moves the terminal from one state to another.
+
+    Attributes are switched off individually where an "off" code exists, unless
+    resetting and re-applying the new state is shorter.
+
+    Args:
+        old (SGRState): The current terminal state
+        new (SGRState): The desired terminal state
+
+    Returns:
+        str: The escape sequence, or an empty string if the states are equal
+    """
+    if old == new:
+        return ""
+    if new == DEFAULT_STATE:
+        return RESET
+
+    full = "\033[0;" + ";".join(new.codes()) + "m"
+
+    offs: set[str] = set()
+    for attr in old.attrs - new.attrs:
+        off = _ATTR_OFF.get(attr)
+        if off is None:
+            # No way to switch this attribute off without a reset
+            return full
+        offs.add(off)
+
+    remaining = set(old.attrs)
+    for off in offs:
+        remaining.difference_update(_OFF_CLEARS[off])
+
+    codes = sorted(offs, key=_code_sort_key)
+    codes.extend(sorted(new.attrs - remaining, key=_code_sort_key))
+    if new.fg != old.fg:
+        codes.append(new.fg if new.fg is not None else "39")
+    if new.bg != old.bg:
+        codes.append(new.bg if new.bg is not None else "49")
+
+    incremental = "\033[" + ";".join(codes) + "m"
+    return incremental if len(incremental) <= len(full) else full
+
+
+def affects_spaces(state: SGRState) -> bool:
+    """
+    Check whether a state changes the appearance of space characters.
+
+    Foreground colors, bold or italic text are invisible on spaces, whereas a
+    background color, underline, strike-through or reverse video are not.
+
+    Args:
+        state (SGRState): The state to check
+
+    Returns:
+        bool: True if spaces written in this state look different from default spaces
+    """
+    return state.bg is not None or not state.attrs <= _SPACE_NEUTRAL_ATTRS
+
+
+@functools.lru_cache(maxsize=256)
+def style_state(style: StyleType, depth: ColorDepth = ColorDepth.TRUECOLOR) -> SGRState:
+    """
+    Get the terminal state produced by applying a style to a reset terminal.
+
+    Args:
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+        depth (ColorDepth, optional): Color depth that extended colors are downsampled to
+
+    Returns:
+        SGRState: The resulting state
+    """
+    return apply_sgr(DEFAULT_STATE, get_style_prefix(style, depth)[2:-1])
+
+
+def optimize_sgr(text: str) -> str:
+    """
+    Rewrite rendered ANSI text into an equivalent string with fewer escape sequences.
+
+    The text is scanned once. Consecutive SGR sequences are merged into the single
+    transition they amount to, sequences that do not change the state are dropped,
+    and runs of spaces between fragments keep the surrounding style when it is
+    invisible on spaces. Escape sequences other than SGR are preserved as-is.
+
+    The text is assumed to start with the terminal in its default state, which is
+    the case for output produced by styled(), styled_pattern() or tabled().
+
+    Args:
+        text (str): Text containing ANSI escape sequences
+
+    Returns:
+        str: The optimized text
+
+    Example:
+        >>> optimize_sgr("\\033[31ma\\033[0m\\033[31mb\\033[0m")
+        # This returns "\\033[31mab\\033[0m"
+    """
+    if "\x1b" not in text:
+        return text
+
+    parts = []
+    emitted = pending = DEFAULT_STATE
+    last_end = 0
+    end = len(text)
+
+    for match in chain(SGR_RE.finditer(text), (None,)):
+        start = match.start() if match is not None else end
+        if start > last_end:
+            chunk = text[last_end:start]
+            if pending is not emitted and pending != emitted:
+                if chunk.strip(" ") or affects_spaces(emitted) or affects_spaces(pending):
+                    parts.append(sgr_transition(emitted, pending))
+                    emitted = pending
+                # Otherwise spaces look the same in both states, so defer the transition
+            parts.append(chunk)
+        if match is None:
+            break
+        pending = apply_sgr(pending, match.group(1))
+        last_end = match.end()
+
+    # Leave the terminal in the same state as the original text
+    if pending != emitted:
+        parts.append(sgr_transition(emitted, pending))
+
+    return "".join(parts)
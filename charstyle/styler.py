@@ -0,0 +1,212 @@
+"""
+Compiled stylers for the charstyle library.
+
+This module provides the Styler class, which freezes a style, width, alignment
+and hyperlink once and applies them repeatedly without re-evaluating them, and
+the styled_many function for styling whole batches of strings.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from charstyle.align import Align
+from charstyle.ansi import ELLIPSIS, Overflow, truncate
+from charstyle.charstyle import (
+    RESET,
+    StyleType,
+    color_depth,
+    get_style_prefix,
+    get_visible_length,
+)
+
+
+class Styler:
+    """
+    A reusable, pre-compiled version of the styled function.
+
+    All decisions that do not depend on the text (color support, the style prefix,
+    the hyperlink wrapper and the alignment) are taken once when the Styler is
+    created. Calling the Styler then only pads and wraps the text.
+
+    Example:
+        >>> from charstyle import Style, Styler
+        >>> error = Styler((Style.BOLD, Style.RED), width=10)
+        >>> error("failed")
+        # This returns "failed    " in bold red
+    """
+
+    __slots__ = (
+        "style",
+        "width",
+        "align",
+        "fill_char",
+        "hyperlink",
+        "max_width",
+        "overflow",
+        "_prefix",
+        "_suffix",
+        "_placeholder",
+    )
+
+    def __init__(
+        self,
+        style: StyleType | None = None,
+        width: int | None = None,
+        align: Align = Align.LEFT,
+        fill_char: str = " ",
+        hyperlink: str | None = None,
+        stream: IO[Any] | None = None,
+        max_width: int | None = None,
+        overflow: Overflow = "ellipsis",
+    ) -> None:
+        """
+        Compile a styler.
+
+        Args:
+            style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+            width (int, optional): Fixed width for the output text
+            align (Align, optional): Alignment of the text within the fixed width
+            fill_char (str, optional): Character used for filling the fixed width
+            hyperlink (str, optional): URL to link the text to using ANSI hyperlink escape sequence
+            stream (IO, optional): The stream the text will be written to, used to decide
+                whether to emit escape sequences (default: standard output)
+            max_width (int, optional): Maximum display width of the text; longer text
+                is truncated
+            overflow (str, optional): How longer text is truncated: "ellipsis" to end
+                it with "…" (default), or "clip" to cut it off
+
+        Raises:
+            ValueError: If overflow is not "ellipsis" or "clip"
+        """
+        if overflow not in ("ellipsis", "clip"):
+            raise ValueError(f"overflow must be 'ellipsis' or 'clip', got {overflow!r}")
+
+        self.style = style
+        self.width = width
+        self.align = align
+        self.fill_char = fill_char
+        self.hyperlink = hyperlink
+        self.max_width = max_width
+        self.overflow = overflow
+        self._placeholder = ELLIPSIS if overflow == "ellipsis" else ""
+
+        prefix = ""
+        suffix = ""
+        depth = color_depth(stream)
+        if depth:
+            if hyperlink is not None:
+                prefix = f"\033]8;;{hyperlink}\033\\"
+                suffix = "\033]8;;\033\\"
+            if style:
+                prefix = get_style_prefix(style, depth) + prefix
+                suffix = suffix + RESET
+
+        self._prefix = prefix
+        self._suffix = suffix
+
+    def __call__(self, text: str) -> str:
+        """
+        Apply the compiled style to text.
+
+        Args:
+            text (str): The text to style
+
+        Returns:
+            str: The styled text
+        """
+        if not text:
+            return text
+
+        if self.max_width is not None:
+            text = truncate(text, self.max_width, self._placeholder)
+
+        width = self.width
+        if width is not None:
+            padding_needed = width - get_visible_length(text)
+            if padding_needed > 0:
+                align = self.align
+                if align is Align.LEFT:
+                    text = text + self.fill_char * padding_needed
+                elif align is Align.RIGHT:
+                    text = self.fill_char * padding_needed + text
+                else:
+                    left_padding = padding_needed // 2
+                    text = (
+                        self.fill_char * left_padding
+                        + text
+                        + self.fill_char * (padding_needed - left_padding)
+                    )
+
+        return self._prefix + text + self._suffix
+
+    def map(self, texts: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily apply the compiled style to every string in an iterable.
+
+        Args:
+            texts (Iterable[str]): The strings to style
+
+        Returns:
+            Iterator[str]: A generator yielding the styled strings
+        """
+        for text in texts:
+            yield self(text)
+
+    def __repr__(self) -> str:
+        return (
+            f"Styler(style={self.style!r}, width={self.width!r}, align={self.align}, "
+            f"fill_char={self.fill_char!r}, hyperlink={self.hyperlink!r}, "
+            f"max_width={self.max_width!r}, overflow={self.overflow!r})"
+        )
+
+
+def styled_many(
+    texts: Iterable[str],
+    style: StyleType | None = None,
+    width: int | None = None,
+    align: Align = Align.LEFT,
+    fill_char: str = " ",
+    hyperlink: str | None = None,
+    stream: IO[Any] | None = None,
+    max_width: int | None = None,
+    overflow: Overflow = "ellipsis",
+) -> list[str]:
+    """
+    Apply the same styles to every string in an iterable.
+
+    Color support, the style prefix and the padding mode are resolved once per
+    batch instead of once per string. Use ``Styler(...).map(texts)`` to get a
+    generator instead of a list.
+
+    Args:
+        texts (Iterable[str]): The strings to style
+        style (Style, Color, tuple): A style enum value, a color, or a tuple of them
+        width (int, optional): Fixed width for the output text
+        align (Align, optional): Alignment of the text within the fixed width
+        fill_char (str, optional): Character used for filling the fixed width
+        hyperlink (str, optional): URL to link the text to using ANSI hyperlink escape sequence
+        stream (IO, optional): The stream the text will be written to, used to decide
+            whether to emit escape sequences (default: standard output)
+        max_width (int, optional): Maximum display width of each string
+        overflow (str, optional): How longer strings are truncated: "ellipsis" or "clip"
+
+    Returns:
+        list[str]: The styled strings, in input order
+
+    Example:
+        >>> from charstyle import Style
+        >>> styled_many(["OK", "FAIL"], Style.BOLD, width=6)
+        # This returns ["OK    ", "FAIL  "] in bold
+    """
+    styler = Styler(style, width, align, fill_char, hyperlink, stream, max_width, overflow)
+
+    # Padding and truncation depend on each string, so fall back to the compiled styler
+    if width is not None or max_width is not None:
+        return [styler(text) for text in texts]
+
+    prefix = styler._prefix
+    suffix = styler._suffix
+    if not prefix:
+        return list(texts)
+
+    return [prefix + text + suffix if text else text for text in texts]
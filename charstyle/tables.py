@@ -5,15 +5,30 @@ This module provides the tabled function for creating formatted tables.
 """
 
 from collections.abc import Callable
-from typing import Any
+from itertools import zip_longest
+from typing import IO, TYPE_CHECKING, Any
 
 from charstyle.align import Align
-from charstyle.charstyle import get_visible_length, styled
+from charstyle.ansi import wrap as wrap_text
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import (
+    RESET,
+    ResolvedStyle,
+    color_depth,
+    get_style_prefix,
+    get_visible_length,
+)
+from charstyle.colors import Color
 from charstyle.styles import Style
+from charstyle.text import RichText, StyledText
+
+if TYPE_CHECKING:
+    from charstyle.writer import StyledWriter
 
 # Type aliases
-StyleType = Style | tuple[Style, ...] | None
-CellFormatterType = Callable[[int, int, Any], str | None]
+StyleType = Style | Color | ResolvedStyle | tuple[Style | Color | ResolvedStyle, ...] | None
+CellFormatterType = Callable[[int, int, Any], str | StyledText | RichText | None]
+Fragment = tuple[str, StyleType]
 
 # Unicode box drawing characters
 BOX_HORIZONTAL = "─"
@@ -29,31 +44,46 @@ BOX_HORIZONTAL_UP = "┴"
 BOX_CROSS = "┼"
 
 
+def _measure_cells(headers: list[str], rows: list[list[Any]]) -> tuple[list[int], list[list[int]]]:
+    """
+    Measure the visible length of every header and cell once.
+
+    Args:
+        headers: List of header strings
+        rows: List of rows, where each row is a list of values
+
+    Returns:
+        The header lengths, and the lengths of the cells of each row that fall
+        within the headers' columns
+    """
+    num_cols = len(headers)
+    return (
+        [_cell_length(header) for header in headers],
+        [[_cell_length(cell) for cell in row[:num_cols]] for row in rows],
+    )
+
+
 def _calculate_column_widths(
-    headers: list[str], rows: list[list[str]], specified_widths: list[int] | None = None
+    header_lengths: list[int],
+    row_lengths: list[list[int]],
+    specified_widths: list[int] | None = None,
 ) -> list[int]:
     """
     Calculate column widths based on content and specified widths.
 
     Args:
-        headers: List of header strings
-        rows: List of rows, where each row is a list of strings
+        header_lengths: Visible length of each header
+        row_lengths: Visible lengths of the cells of each row
         specified_widths: Optional list of specified column widths
 
     Returns:
         List of column widths
     """
-    if specified_widths and len(specified_widths) == len(headers):
+    if specified_widths and len(specified_widths) == len(header_lengths):
         return specified_widths
 
-    # Initialize with header lengths
-    widths = [len(str(h)) for h in headers]
-
-    # Update with row content lengths
-    for row in rows:
-        for i, cell in enumerate(row):
-            if i < len(widths):
-                widths[i] = max(widths[i], len(str(cell)))
+    # The widest header or cell of each column; short rows count as empty
+    widths = [max(lengths) for lengths in zip_longest(header_lengths, *row_lengths, fillvalue=0)]
 
     # Apply specified widths where provided
     if specified_widths:
@@ -64,7 +94,23 @@ def _calculate_column_widths(
     return widths
 
 
-def _get_cell_content(
+def _cell_length(value: Any) -> int:
+    """
+    Get the visible length of a cell value.
+
+    Args:
+        value: Cell value
+
+    Returns:
+        The visible length, taken from the stored width for StyledText and
+        RichText values
+    """
+    if not isinstance(value, (str, StyledText, RichText)):
+        value = str(value)
+    return get_visible_length(value)
+
+
+def _get_cell_fragments(
     value: Any,
     col_index: int,
     row_index: int,
@@ -72,9 +118,10 @@ def _get_cell_content(
     alignment: Align = Align.LEFT,
     style: StyleType = None,
     cell_formatter: CellFormatterType | None = None,
-) -> str:
+    visible_length: int | None = None,
+) -> list[Fragment]:
     """
-    Format a cell's content with styling and alignment.
+    Pad a cell's content and determine the styles it should be rendered with.
 
     Args:
         value: Cell value
@@ -84,31 +131,204 @@ def _get_cell_content(
         alignment: Text alignment
         style: Style to apply
         cell_formatter: Optional formatter function
+        visible_length: The visible length of the value, if already known
 
     Returns:
-        Formatted cell content
+        The fragments of the padded cell. Content produced by the cell formatter
+        is returned with no style, since it is already styled, and StyledText
+        and RichText values keep their own styles.
     """
+    # Apply cell formatter if provided
+    if cell_formatter:
+        formatted = cell_formatter(row_index, col_index, value)
+        if formatted is not None:
+            if isinstance(formatted, (StyledText, RichText)):
+                return _pad_styled_text(formatted, width, alignment)
+            # For formatted content, calculate the visible length and apply padding
+            return [(_pad(formatted, width, alignment), None)]
+
+    if isinstance(value, (StyledText, RichText)):
+        return _pad_styled_text(value, width, alignment)
+
     str_value = str(value)
 
+    # Empty values are left unpadded, matching styled()
+    if not str_value:
+        return [(str_value, None)]
+
+    return [(_pad(str_value, width, alignment, visible_length), style)]
+
+
+def _pad(text: str, width: int, alignment: Align, visible_length: int | None = None) -> str:
+    """
+    Pad text to a column width.
+
+    Args:
+        text: Text to pad, which may contain ANSI escape codes
+        width: Column width
+        alignment: Text alignment
+        visible_length: The visible length of the text, if already known
+
+    Returns:
+        Padded text
+    """
+    if visible_length is None:
+        visible_length = get_visible_length(text)
+    padding_needed = width - visible_length
+    if padding_needed <= 0:
+        return text
+
+    if alignment == Align.RIGHT:
+        return (" " * padding_needed) + text
+    elif alignment == Align.CENTER:
+        left_padding = padding_needed // 2
+        right_padding = padding_needed - left_padding
+        return (" " * left_padding) + text + (" " * right_padding)
+    return text + (" " * padding_needed)
+
+
+def _pad_styled_text(text: StyledText | RichText, width: int, alignment: Align) -> list[Fragment]:
+    """
+    Pad StyledText or RichText to a column width using its stored width.
+
+    Args:
+        text: Text to pad
+        width: Column width
+        alignment: Text alignment
+
+    Returns:
+        The fragments of the text. Text with a single style is padded within that
+        style, like plain cell values; other text is surrounded by unstyled padding.
+    """
+    if len(text.fragments) == 1:
+        fragment, style = text.fragments[0]
+        return [(_pad(fragment, width, alignment, text.width), style)]
+
+    padding_needed = max(0, width - text.width)
+
+    if alignment == Align.RIGHT:
+        left_padding, right_padding = padding_needed, 0
+    elif alignment == Align.CENTER:
+        left_padding = padding_needed // 2
+        right_padding = padding_needed - left_padding
+    else:
+        left_padding, right_padding = 0, padding_needed
+
+    fragments: list[Fragment] = list(text.fragments)
+    if left_padding:
+        fragments.insert(0, (" " * left_padding, None))
+    if right_padding:
+        fragments.append((" " * right_padding, None))
+    return fragments
+
+
+def _get_cell_lines(
+    value: Any,
+    col_index: int,
+    row_index: int,
+    width: int,
+    alignment: Align = Align.LEFT,
+    style: StyleType = None,
+    cell_formatter: CellFormatterType | None = None,
+    stream: IO[Any] | None = None,
+    visible_length: int | None = None,
+) -> list[list[Fragment]]:
+    """
+    Pad a cell's content, word wrapping it onto several lines if it is too wide.
+
+    Args:
+        value: Cell value
+        col_index: Column index
+        row_index: Row index
+        width: Column width
+        alignment: Text alignment
+        style: Style to apply
+        cell_formatter: Optional formatter function
+        stream: The stream the table will be written to, used to render styled
+            text that has to be wrapped
+        visible_length: The visible length of the value, if already known
+
+    Returns:
+        The fragments of each line of the cell
+    """
     # Apply cell formatter if provided
     if cell_formatter:
         formatted = cell_formatter(row_index, col_index, value)
         if formatted is not None:
-            # For formatted content, calculate the visible length and apply padding
-            visible_length = get_visible_length(formatted)
-            padding_needed = max(0, width - visible_length)
+            value, style = formatted, None
+            visible_length = _cell_length(value)
+            if isinstance(value, str) and visible_length <= width:
+                return [[(_pad(value, width, alignment, visible_length), None)]]
+
+    if visible_length is None:
+        visible_length = _cell_length(value)
+    if visible_length <= width:
+        return [
+            _get_cell_fragments(
+                value, col_index, row_index, width, alignment, style, None, visible_length
+            )
+        ]
 
-            if alignment == Align.LEFT:
-                return formatted + (" " * padding_needed)
-            elif alignment == Align.RIGHT:
-                return (" " * padding_needed) + formatted
-            elif alignment == Align.CENTER:
-                left_padding = padding_needed // 2
-                right_padding = padding_needed - left_padding
-                return (" " * left_padding) + formatted + (" " * right_padding)
+    if isinstance(value, (StyledText, RichText)):
+        text, style = value.render(stream), None
+    else:
+        text = str(value)
+    return [[(_pad(line, width, alignment), style)] for line in wrap_text(text, width)]
 
-    # Apply styling and alignment using the styled function
-    return styled(str_value, style, width=width, align=alignment)
+
+def _join_cell_lines(
+    cells: list[list[list[Fragment]]],
+    col_widths: list[int],
+    borders: bool,
+    vertical_border: str,
+) -> list[list[Fragment]]:
+    """
+    Join the lines of a row's cells, filling cells with fewer lines with blanks.
+
+    Args:
+        cells: The fragments of each line of each cell
+        col_widths: Column widths
+        borders: Whether borders are displayed
+        vertical_border: The vertical border character
+
+    Returns:
+        The fragments making up each line of the row
+    """
+    height = max((len(cell) for cell in cells), default=1)
+    if height == 1:
+        return [_join_cells([cell[0] for cell in cells], borders, vertical_border)]
+
+    lines = []
+    for i in range(height):
+        line_cells: list[list[Fragment]] = []
+        for col, cell in enumerate(cells):
+            filler: list[Fragment] = [(" " * col_widths[col], None)]
+            line_cells.append(cell[i] if i < len(cell) else filler)
+        lines.append(_join_cells(line_cells, borders, vertical_border))
+    return lines
+
+
+def _join_cells(cells: list[list[Fragment]], borders: bool, vertical_border: str) -> list[Fragment]:
+    """
+    Join the fragments of a row's cells with the column separators.
+
+    Args:
+        cells: The fragments of each cell
+        borders: Whether borders are displayed
+        vertical_border: The vertical border character
+
+    Returns:
+        The fragments making up the row
+    """
+    separator: Fragment = (f" {vertical_border} " if borders else " ", None)
+    line: list[Fragment] = [(f"{vertical_border} ", None)] if borders else []
+    for i, cell in enumerate(cells):
+        if i:
+            line.append(separator)
+        line.extend(cell)
+    if borders:
+        line.append((f" {vertical_border}", None))
+    return line
 
 
 def tabled(
@@ -123,6 +343,9 @@ def tabled(
     highlight_style: StyleType = Style.REVERSE,
     cell_formatter: CellFormatterType | None = None,
     style: str = "default",
+    writer: "StyledWriter | None" = None,
+    stream: IO[Any] | None = None,
+    wrap: bool = False,
 ) -> str:
     """
     Create a formatted table with headers and rows.
@@ -139,15 +362,154 @@ def tabled(
         highlight_style: Style to apply to highlighted rows
         cell_formatter: Optional function to format cell values
         style: Table style ("default", "compact", or "thin")
+        writer: Optional StyledWriter to render the table through. The writer only
+            emits the escape sequences needed between adjacent cells, and each
+            line, including the last, is terminated with a newline.
+        stream: The stream the table will be written to, used to decide whether
+            to emit escape sequences (default: standard output)
+        wrap: Whether to word wrap cell contents that are wider than their column
+            onto several lines instead of letting them overflow (used with widths)
 
     Returns:
-        Formatted table as a string
+        Formatted table as a string, or an empty string when a writer is given
     """
     if not headers or not rows:
         return ""
 
-    # Calculate column widths
-    col_widths = _calculate_column_widths(headers, rows, widths)
+    lines = _table_lines(
+        headers,
+        rows,
+        column_styles,
+        header_style,
+        widths,
+        alignments,
+        borders,
+        highlight_rows,
+        highlight_style,
+        cell_formatter,
+        style,
+        wrap,
+        writer.stream if writer is not None else stream,
+    )
+
+    if writer is not None:
+        for line in lines:
+            for text, fragment_style in line:
+                writer.write(text, fragment_style)
+            writer.write("\n")
+        return ""
+
+    return "\n".join(_render_lines(lines, color_depth(stream)))
+
+
+def tabled_bytes(
+    headers: list[str],
+    rows: list[list[Any]],
+    column_styles: list[StyleType] | None = None,
+    header_style: StyleType = Style.BOLD,
+    widths: list[int] | None = None,
+    alignments: list[Align] | None = None,
+    borders: bool = True,
+    highlight_rows: list[int] | None = None,
+    highlight_style: StyleType = Style.REVERSE,
+    cell_formatter: CellFormatterType | None = None,
+    style: str = "default",
+    encoding: str = "utf-8",
+    stream: IO[Any] | None = None,
+    wrap: bool = False,
+) -> list[bytes]:
+    """
+    Create a formatted table as encoded lines, ready for a binary stream.
+
+    Takes the same arguments as tabled(). Each line is rendered like in tabled()
+    and encoded as a whole, which is cheaper than encoding its escape sequences
+    and cells separately.
+
+    Args:
+        See tabled()
+        encoding: Encoding used for the table text (default: utf-8)
+        stream: The binary stream the table will be written to, used to decide
+            whether to emit escape sequences (default: standard output)
+
+    Returns:
+        List of encoded lines, each terminated with a newline, suitable for
+        passing to the writelines() method of a binary stream
+
+    Example:
+        >>> sys.stdout.buffer.writelines(tabled_bytes(["ID", "Name"], [["1", "Alice"]]))
+    """
+    if not headers or not rows:
+        return []
+
+    lines = _table_lines(
+        headers,
+        rows,
+        column_styles,
+        header_style,
+        widths,
+        alignments,
+        borders,
+        highlight_rows,
+        highlight_style,
+        cell_formatter,
+        style,
+        wrap,
+        stream,
+    )
+
+    return [(line + "\n").encode(encoding) for line in _render_lines(lines, color_depth(stream))]
+
+
+def _render_lines(lines: list[list[Fragment]], depth: ColorDepth) -> list[str]:
+    """
+    Render laid out table lines to strings.
+
+    Args:
+        lines: The fragments of each line, from _table_lines()
+        depth: The color depth to render styles at, checked once for the whole table
+
+    Returns:
+        The rendered lines, without line terminators
+    """
+    result = []
+    for line in lines:
+        parts = []
+        for text, fragment_style in line:
+            if fragment_style and depth and text:
+                parts.append(get_style_prefix(fragment_style, depth) + text + RESET)
+            else:
+                parts.append(text)
+        result.append("".join(parts))
+    return result
+
+
+def _table_lines(
+    headers: list[str],
+    rows: list[list[Any]],
+    column_styles: list[StyleType] | None,
+    header_style: StyleType,
+    widths: list[int] | None,
+    alignments: list[Align] | None,
+    borders: bool,
+    highlight_rows: list[int] | None,
+    highlight_style: StyleType,
+    cell_formatter: CellFormatterType | None,
+    style: str,
+    wrap: bool = False,
+    stream: IO[Any] | None = None,
+) -> list[list[Fragment]]:
+    """
+    Lay out a table as lines of (text, style) fragments.
+
+    Args:
+        See tabled()
+
+    Returns:
+        One list of fragments per output line
+    """
+    # Measure every cell once, for the column widths and for padding
+    header_lengths, row_lengths = _measure_cells(headers, rows)
+    col_widths = _calculate_column_widths(header_lengths, row_lengths, widths)
     num_cols = len(headers)
 
     # Set default alignments if not provided
@@ -166,7 +528,7 @@ def tabled(
     highlight_rows = highlight_rows or []
 
     # Initialize result
-    result = []
+    result: list[list[Fragment]] = []
 
     # Determine border style
     if borders:
@@ -199,7 +561,7 @@ def tabled(
 
     # Add top border if needed
     if borders and top_border:
-        result.append(top_border)
+        result.append([(top_border, None)])
 
     # Add header row
     header_cells = []
@@ -214,51 +576,94 @@ def tabled(
     for i, header in enumerate(headers[:num_cols]):
         width = col_widths[i]
         alignment = alignments[i]
-        header_cells.append(_get_cell_content(header, i, -1, width, alignment, actual_header_style))
+        if wrap:
+            header_cells.append(
+                _get_cell_lines(
+                    header,
+                    i,
+                    -1,
+                    width,
+                    alignment,
+                    actual_header_style,
+                    None,
+                    stream,
+                    header_lengths[i],
+                )
+            )
+        else:
+            header_cells.append(
+                [
+                    _get_cell_fragments(
+                        header,
+                        i,
+                        -1,
+                        width,
+                        alignment,
+                        actual_header_style,
+                        None,
+                        header_lengths[i],
+                    )
+                ]
+            )
 
-    if borders:
-        result.append(
-            f"{vertical_border} "
-            + f" {vertical_border} ".join(header_cells)
-            + f" {vertical_border}"
-        )
-    elif style == "compact":
-        result.append(" ".join(header_cells))
-    else:
-        result.append(" ".join(header_cells))
+    result.extend(_join_cell_lines(header_cells, col_widths, borders, vertical_border))
 
     # Add separator after header if needed
     if borders and mid_border and style != "compact" and style != "thin":
-        result.append(mid_border)
+        result.append([(mid_border, None)])
 
     # Add data rows
-    for row_idx, row in enumerate(rows):
+    separator: Fragment = (f" {vertical_border} " if borders else " ", None)
+    for row_idx, (row, lengths) in enumerate(zip(rows, row_lengths, strict=True)):
         row_style = highlight_style if row_idx in highlight_rows else None
-        row_cells = []
 
+        if wrap:
+            row_cells = [
+                _get_cell_lines(
+                    cell,
+                    col_idx,
+                    row_idx,
+                    col_widths[col_idx],
+                    alignments[col_idx],
+                    row_style or column_styles[col_idx],
+                    cell_formatter,
+                    stream,
+                    lengths[col_idx],
+                )
+                for col_idx, cell in enumerate(row[:num_cols])
+            ]
+            result.extend(_join_cell_lines(row_cells, col_widths, borders, vertical_border))
+            continue
+
+        # Rows of single-line cells are joined as they are built
+        line: list[Fragment] = [(f"{vertical_border} ", None)] if borders else []
         for col_idx, cell in enumerate(row[:num_cols]):
-            width = col_widths[col_idx]
-            alignment = alignments[col_idx]
+            if col_idx:
+                line.append(separator)
             cell_style = row_style or column_styles[col_idx]
-
-            # Get the cell content with appropriate styling and width
-            cell_content = _get_cell_content(
-                cell, col_idx, row_idx, width, alignment, cell_style, cell_formatter
-            )
-
-            row_cells.append(cell_content)
-
+            if cell.__class__ is str and cell and cell_formatter is None:
+                # Plain strings, the common case, only need padding
+                padded = _pad(cell, col_widths[col_idx], alignments[col_idx], lengths[col_idx])
+                line.append((padded, cell_style))
+            else:
+                line.extend(
+                    _get_cell_fragments(
+                        cell,
+                        col_idx,
+                        row_idx,
+                        col_widths[col_idx],
+                        alignments[col_idx],
+                        cell_style,
+                        cell_formatter,
+                        lengths[col_idx],
+                    )
+                )
         if borders:
-            result.append(
-                f"{vertical_border} "
-                + f" {vertical_border} ".join(row_cells)
-                + f" {vertical_border}"
-            )
-        else:
-            result.append(" ".join(row_cells))
+            line.append((f" {vertical_border}", None))
+        result.append(line)
 
     # Add bottom border if needed
     if borders and bottom_border:
-        result.append(bottom_border)
+        result.append([(bottom_border, None)])
 
-    return "\n".join(result)
+    return result
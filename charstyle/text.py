@@ -0,0 +1,429 @@
+"""
+Lazily rendered styled text for the charstyle library.
+
+This module provides the StyledText class, which keeps text and its style apart
+until the text is printed. Because the visible width is measured once when the
+object is created, layout code such as tabled() and styled(width=...) can align
+styled text without scanning its escape sequences again.
+
+It also provides the RichText class, a mutable sequence of styled spans that
+can be extended, measured and sliced by display column without rendering.
+"""
+
+import builtins
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator
+from typing import IO, Any
+
+from charstyle.ansi import ELLIPSIS
+from charstyle.capabilities import ColorDepth
+from charstyle.charstyle import (
+    RESET,
+    StyleType,
+    color_depth,
+    get_style_prefix,
+    get_visible_length,
+)
+from charstyle.width import slice_columns
+
+# A run of text and the style it is rendered in
+Fragment = tuple[str, StyleType | None]
+
+
+class StyledText:
+    """
+    Styled text that knows its visible width and is rendered on demand.
+
+    A StyledText holds one or more (text, style) fragments and their total width
+    in terminal columns. The escape sequences are only built when the text is
+    converted to a string, and the result is cached per color depth. Adding
+    StyledText objects, or a StyledText and a str, sums the stored widths instead
+    of measuring the combined text.
+
+    Example:
+        >>> from charstyle import Style, StyledText
+        >>> line = StyledText("ERROR", Style.RED) + ": " + StyledText("disk full", Style.BOLD)
+        >>> line.width
+        16
+        >>> print(line)
+    """
+
+    __slots__ = ("fragments", "width", "stream", "_rendered")
+
+    def __init__(
+        self,
+        text: str = "",
+        style: StyleType | None = None,
+        stream: IO[Any] | None = None,
+    ) -> None:
+        """
+        Create styled text.
+
+        Args:
+            text (str): The text, which may already contain escape sequences
+            style (Style, Color, tuple, optional): The style of the text
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+        """
+        self.fragments: tuple[Fragment, ...] = ((text, style),) if text else ()
+        self.width = get_visible_length(text)
+        self.stream = stream
+        self._rendered: tuple[ColorDepth, str] | None = None
+
+    @classmethod
+    def from_fragments(
+        cls,
+        fragments: tuple[Fragment, ...],
+        width: int,
+        stream: IO[Any] | None = None,
+    ) -> "StyledText":
+        """
+        Create styled text from fragments whose total width is already known.
+
+        Args:
+            fragments (tuple): The (text, style) fragments
+            width (int): The visible width of all fragments together
+            stream (IO, optional): The stream the text will be written to
+
+        Returns:
+            StyledText: The styled text
+        """
+        self = cls.__new__(cls)
+        self.fragments = fragments
+        self.width = width
+        self.stream = stream
+        self._rendered = None
+        return self
+
+    @property
+    def text(self) -> str:
+        """The text without styles applied."""
+        return "".join(text for text, _ in self.fragments)
+
+    @property
+    def style(self) -> StyleType | None:
+        """The style of the text, or None if it has several differently styled fragments."""
+        styles = {style for _, style in self.fragments}
+        return styles.pop() if len(styles) == 1 else None
+
+    def render(self, stream: IO[Any] | None = None) -> str:
+        """
+        Render the text with escape sequences for a stream.
+
+        Args:
+            stream (IO, optional): The stream the text will be written to
+                (default: the stream given when the text was created)
+
+        Returns:
+            str: The rendered text
+        """
+        depth = color_depth(stream if stream is not None else self.stream)
+        if self._rendered is not None and self._rendered[0] == depth:
+            return self._rendered[1]
+
+        parts = []
+        for text, style in self.fragments:
+            if style and depth:
+                parts.append(get_style_prefix(style, depth) + text + RESET)
+            else:
+                parts.append(text)
+        rendered = "".join(parts)
+
+        self._rendered = (depth, rendered)
+        return rendered
+
+    def __iter__(self) -> Iterator[Fragment]:
+        return iter(self.fragments)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __bool__(self) -> bool:
+        return bool(self.fragments)
+
+    def __add__(self, other: "StyledText | str") -> "StyledText":
+        if isinstance(other, StyledText):
+            fragments, width = other.fragments, other.width
+        elif isinstance(other, str):
+            fragments, width = ((other, None),) if other else (), get_visible_length(other)
+        else:
+            return NotImplemented
+        return StyledText.from_fragments(
+            self.fragments + fragments, self.width + width, self.stream
+        )
+
+    def __radd__(self, other: str) -> "StyledText":
+        if not isinstance(other, str):
+            return NotImplemented
+        fragments = ((other, None),) if other else ()
+        return StyledText.from_fragments(
+            fragments + self.fragments, get_visible_length(other) + self.width, self.stream
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StyledText):
+            return NotImplemented
+        return self.fragments == other.fragments
+
+    def __hash__(self) -> int:
+        return hash(self.fragments)
+
+    def __repr__(self) -> str:
+        if not self.fragments:
+            return "StyledText('')"
+        return " + ".join(f"StyledText({text!r}, {style!r})" for text, style in self.fragments)
+
+
+class RichText:
+    """
+    A mutable sequence of (text, style) spans with running width totals.
+
+    Span texts and styles are held in parallel lists, and the column at which
+    each span ends in an array, so the width of the whole text is known without
+    measuring it, and slicing by display column only has to measure the spans
+    at the edges of the slice. Rendering joins all spans in a single pass.
+
+    Span texts are measured when they are appended and should not contain
+    escape sequences of their own if the text is going to be sliced.
+
+    Example:
+        >>> from charstyle import RichText, Style
+        >>> line = RichText("12:00:01 ", Style.DIM).append("ERROR", Style.RED)
+        >>> line.append(" disk full")
+        >>> line.width
+        24
+        >>> print(line[:14])  # The timestamp and "ERROR"
+    """
+
+    __slots__ = ("_texts", "_styles", "_ends", "stream")
+
+    def __init__(
+        self,
+        text: str = "",
+        style: StyleType | None = None,
+        stream: IO[Any] | None = None,
+    ) -> None:
+        """
+        Create rich text, optionally starting with a single span.
+
+        Args:
+            text (str, optional): The text of the first span
+            style (Style, Color, tuple, optional): The style of the first span
+            stream (IO, optional): The stream the text will be written to, used to
+                decide whether to emit escape sequences (default: standard output)
+        """
+        self._texts: list[str] = []
+        self._styles: list[StyleType | None] = []
+        self._ends = array("q")
+        self.stream = stream
+        if text:
+            self._append(text, style, get_visible_length(text))
+
+    @property
+    def width(self) -> int:
+        """The visible width of the text in terminal columns."""
+        return self._ends[-1] if self._ends else 0
+
+    @property
+    def fragments(self) -> tuple[Fragment, ...]:
+        """The (text, style) spans of the text."""
+        return tuple(zip(self._texts, self._styles, strict=True))
+
+    @property
+    def plain(self) -> str:
+        """The text without styles applied."""
+        return "".join(self._texts)
+
+    def _append(self, text: str, style: StyleType | None, width: int) -> None:
+        """Append a span whose width is already known."""
+        self._texts.append(text)
+        self._styles.append(style)
+        self._ends.append((self._ends[-1] if self._ends else 0) + width)
+
+    def append(
+        self, text: "str | StyledText | RichText", style: StyleType | None = None
+    ) -> "RichText":
+        """
+        Append text as one or more spans.
+
+        Args:
+            text (str | StyledText | RichText): The text to append; the spans of
+                styled text keep their own styles
+            style (Style, Color, tuple, optional): The style of the appended text,
+                also used for unstyled spans of styled text
+
+        Returns:
+            RichText: This object, so that calls can be chained
+        """
+        if isinstance(text, str):
+            if text:
+                self._append(text, style, get_visible_length(text))
+        elif isinstance(text, RichText):
+            if text is self:
+                text = text.copy()
+            offset = self.width
+            for span, span_style, end in zip(text._texts, text._styles, text._ends, strict=True):
+                self._texts.append(span)
+                self._styles.append(span_style or style)
+                self._ends.append(offset + end)
+        elif len(text.fragments) == 1:
+            span, span_style = text.fragments[0]
+            self._append(span, span_style or style, text.width)
+        else:
+            for span, span_style in text.fragments:
+                self._append(span, span_style or style, get_visible_length(span))
+        return self
+
+    def slice(self, start: int, stop: int | None = None) -> "RichText":
+        """
+        Get the part of the text between two display columns.
+
+        Only spans that cross the edges of the slice are measured; spans in
+        between are copied with their stored widths. Wide characters that would
+        straddle an edge are left out.
+
+        Args:
+            start (int): The first column to keep
+            stop (int, optional): The column to stop before (default: the end)
+
+        Returns:
+            RichText: The spans between the two columns
+        """
+        width = self.width
+        if stop is None or stop > width:
+            stop = width
+        start = max(start, 0)
+
+        result = RichText(stream=self.stream)
+        if start >= stop:
+            return result
+
+        # Skip the spans that end before the slice starts
+        ends = self._ends
+        index = bisect_right(ends, start)
+        span_start = ends[index - 1] if index else 0
+        while index < len(ends) and span_start < stop:
+            span_end = ends[index]
+            text = self._texts[index]
+            style = self._styles[index]
+            if span_start >= start and span_end <= stop:
+                result._append(text, style, span_end - span_start)
+            else:
+                # Only spans crossing an edge of the slice are measured
+                text = slice_columns(text, max(start - span_start, 0), stop - span_start)
+                if text:
+                    result._append(text, style, get_visible_length(text))
+            span_start = span_end
+            index += 1
+        return result
+
+    def truncate(self, width: int, placeholder: str = ELLIPSIS) -> "RichText":
+        """
+        Cut the text to a display width, ending it with a placeholder if it is cut.
+
+        Args:
+            width (int): The maximum display width of the result
+            placeholder (str, optional): Text that replaces the cut off part, in the
+                style of the last span that is kept (default: "…"); use "" to clip
+
+        Returns:
+            RichText: The truncated text, or a copy of the text if it fits
+
+        Raises:
+            ValueError: If width is negative
+        """
+        if width < 0:
+            raise ValueError(f"width must not be negative, got {width}")
+        if self.width <= width:
+            return self.copy()
+
+        placeholder_width = get_visible_length(placeholder)
+        if placeholder_width > width:
+            return RichText(slice_columns(placeholder, 0, width), stream=self.stream)
+
+        result = self.slice(0, width - placeholder_width)
+        if placeholder:
+            last_style = result._styles[-1] if result._styles else None
+            result._append(placeholder, last_style, placeholder_width)
+        return result
+
+    def render(self, stream: IO[Any] | None = None) -> str:
+        """
+        Render the text with escape sequences in a single pass over the spans.
+
+        Args:
+            stream (IO, optional): The stream the text will be written to
+                (default: the stream given when the text was created)
+
+        Returns:
+            str: The rendered text
+        """
+        depth = color_depth(stream if stream is not None else self.stream)
+        if not depth:
+            return "".join(self._texts)
+
+        parts = []
+        for text, style in zip(self._texts, self._styles, strict=True):
+            if style:
+                parts.append(get_style_prefix(style, depth) + text + RESET)
+            else:
+                parts.append(text)
+        return "".join(parts)
+
+    def copy(self) -> "RichText":
+        """
+        Get a copy of the text that can be extended independently.
+
+        Returns:
+            RichText: The copy
+        """
+        result = RichText(stream=self.stream)
+        result._texts = self._texts.copy()
+        result._styles = self._styles.copy()
+        result._ends = array("q", self._ends)
+        return result
+
+    def to_styled_text(self) -> StyledText:
+        """
+        Freeze the text into an immutable StyledText.
+
+        Returns:
+            StyledText: Styled text with the same spans and width
+        """
+        return StyledText.from_fragments(self.fragments, self.width, self.stream)
+
+    def __getitem__(self, key: builtins.slice) -> "RichText":
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("RichText only supports slicing by column with a step of 1")
+        start, stop, _ = key.indices(self.width)
+        return self.slice(start, stop)
+
+    def __iter__(self) -> Iterator[Fragment]:
+        return zip(self._texts, self._styles, strict=True)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __bool__(self) -> bool:
+        return bool(self._texts)
+
+    def __add__(self, other: "RichText | StyledText | str") -> "RichText":
+        if not isinstance(other, (str, StyledText, RichText)):
+            return NotImplemented
+        return self.copy().append(other)
+
+    def __iadd__(self, other: "RichText | StyledText | str") -> "RichText":
+        if not isinstance(other, (str, StyledText, RichText)):
+            return NotImplemented
+        return self.append(other)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RichText):
+            return NotImplemented
+        return self._texts == other._texts and self._styles == other._styles
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"RichText({list(self)!r})"
@@ -0,0 +1,222 @@
+"""
+Display width calculation for the charstyle library.
+
+This module measures how many terminal columns a string occupies, accounting for
+East Asian wide characters, emoji and zero-width combining characters, so that
+fixed-width alignment stays correct for text containing icons or CJK characters.
+"""
+
+import functools
+from array import array
+from bisect import bisect_right
+
+from charstyle._width_table import WIDTH_RANGES
+
+# Parallel arrays of the generated ranges, searched with bisect
+_RANGE_STARTS = array("I", (start for start, _, _ in WIDTH_RANGES))
+_RANGE_ENDS = array("I", (end for _, end, _ in WIDTH_RANGES))
+_RANGE_WIDTHS = bytes(width for _, _, width in WIDTH_RANGES)
+
+# Code points below the first range are always one column wide
+_FIRST_SPECIAL = WIDTH_RANGES[0][0]
+
+# Code points below this are looked up in a table built on first use, which
+# covers the Basic Multilingual Plane and the emoji plane; others use bisect
+_TABLE_SIZE = 0x20000
+
+ZERO_WIDTH_JOINER = 0x200D
+VARIATION_SELECTOR_16 = 0xFE0F
+
+
+@functools.lru_cache(maxsize=1)
+def _width_table() -> bytes:
+    """
+    Expand the width ranges below _TABLE_SIZE into a table of one byte per code point.
+
+    The table is built when non-ASCII text is first measured rather than at import,
+    since most programs only ever measure ASCII text.
+
+    Returns:
+        bytes: The display width of every code point below _TABLE_SIZE
+    """
+    widths = bytearray(b"\x01") * _TABLE_SIZE
+    for start, end, width in WIDTH_RANGES:
+        if start < _TABLE_SIZE:
+            stop = min(end + 1, _TABLE_SIZE)
+            widths[start:stop] = bytes((width,)) * (stop - start)
+    return bytes(widths)
+
+
+def char_width(char: str) -> int:
+    """
+    Get the display width of a single character.
+
+    Args:
+        char (str): A single character
+
+    Returns:
+        int: 0 for combining and format characters, 2 for wide characters, 1 otherwise
+    """
+    cp = ord(char)
+    if cp < _TABLE_SIZE:
+        return _width_table()[cp]
+    return _astral_width(cp)
+
+
+def _astral_width(cp: int) -> int:
+    """Look up the width of a code point beyond the lookup table in the range table."""
+    index = bisect_right(_RANGE_STARTS, cp) - 1
+    if index >= 0 and cp <= _RANGE_ENDS[index]:
+        return _RANGE_WIDTHS[index]
+    return 1
+
+
+def display_width(text: str) -> int:
+    """
+    Calculate the number of terminal columns needed to display text.
+
+    ASCII text is measured with len(). Other strings go through the precomputed
+    width table and the result is cached per string.
+
+    Args:
+        text (str): The text to measure, without ANSI escape codes
+
+    Returns:
+        int: The display width of the text
+    """
+    if text.isascii():
+        return len(text)
+    return _unicode_width(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _unicode_width(text: str) -> int:
+    """
+    Measure a non-ASCII string using the width table.
+
+    Emoji sequences are handled approximately: a variation selector 16 widens the
+    preceding narrow character to two columns, and characters joined with a zero
+    width joiner do not add to the width of the sequence. Text without either is
+    measured by simply adding up the widths of its characters.
+
+    Args:
+        text (str): The text to measure
+
+    Returns:
+        int: The display width of the text
+    """
+    widths = _width_table()
+    width = 0
+    if "\u200d" not in text and "\ufe0f" not in text:
+        # Without a joiner or variation selector every character counts on its own
+        for char in text:
+            cp = ord(char)
+            width += widths[cp] if cp < _TABLE_SIZE else _astral_width(cp)
+        return width
+
+    last_width = 0
+    joined = False
+    for char in text:
+        cp = ord(char)
+        if cp < _FIRST_SPECIAL:
+            width += 1
+            last_width = 1
+            joined = False
+            continue
+
+        if cp == VARIATION_SELECTOR_16:
+            # Emoji presentation of a text-style character
+            if last_width == 1 and not joined:
+                width += 1
+                last_width = 2
+            continue
+
+        if cp == ZERO_WIDTH_JOINER:
+            joined = True
+            continue
+
+        char_w = widths[cp] if cp < _TABLE_SIZE else _astral_width(cp)
+
+        if joined:
+            # Part of an emoji ZWJ sequence already counted
+            if char_w:
+                joined = False
+            continue
+
+        width += char_w
+        if char_w:
+            last_width = char_w
+    return width
+
+
+def slice_columns(text: str, start: int, stop: int | None = None) -> str:
+    """
+    Cut text to the characters that occupy a range of display columns.
+
+    Characters that would straddle either boundary are left out, so the result
+    is never wider than ``stop - start``. Zero-width characters, variation
+    selectors and emoji ZWJ sequences stay with the character they belong to.
+
+    Args:
+        text (str): The text to cut, without ANSI escape codes
+        start (int): The first column to keep
+        stop (int, optional): The column to stop before (default: end of the text)
+
+    Returns:
+        str: The characters between the two columns
+
+    Raises:
+        ValueError: If start or stop is negative
+
+    Example:
+        >>> slice_columns("日本語", 1, 5)
+        '本'
+    """
+    if start < 0 or (stop is not None and stop < 0):
+        raise ValueError(f"Columns must not be negative, got {start} and {stop}")
+    if text.isascii():
+        return text[start:stop]
+
+    widths = _width_table()
+    first: int | None = None  # index range of the clusters kept so far
+    last = 0
+    column = 0  # column where the current cluster starts
+    cluster = 0  # index where the current cluster starts
+    cluster_width = 0
+    joined = False
+    for index, char in enumerate(text):
+        cp = ord(char)
+        if cp == VARIATION_SELECTOR_16:
+            if cluster_width == 1 and not joined:
+                cluster_width = 2
+            continue
+        if cp == ZERO_WIDTH_JOINER:
+            joined = True
+            continue
+
+        char_w = widths[cp] if cp < _TABLE_SIZE else _astral_width(cp)
+        if not char_w or joined:
+            # Combining characters and joined emoji extend the current cluster
+            if char_w:
+                joined = False
+            continue
+
+        if index:
+            # Close the current cluster and keep it if it fits between the columns
+            if column >= start and (stop is None or column + cluster_width <= stop):
+                if first is None:
+                    first = cluster
+                last = index
+            column += cluster_width
+            if stop is not None and column >= stop:
+                break
+        cluster = index
+        cluster_width = char_w
+    else:
+        # Close the last cluster
+        if column >= start and (stop is None or column + cluster_width <= stop):
+            if first is None:
+                first = cluster
+            last = len(text)
+
+    return text[first:last] if first is not None else ""
@@ -0,0 +1,187 @@
+"""
+Streaming styled output for the charstyle library.
+
+This module provides the StyledWriter class, which writes styled fragments to a
+stream while tracking the terminal attribute state, so that only the escape
+sequences needed to move between adjacent styles are emitted.
+"""
+
+import sys
+from types import TracebackType
+from typing import TextIO
+
+from charstyle.capabilities import ColorDepth, get_capabilities
+from charstyle.charstyle import StyleType, color_depth
+from charstyle.sgr import (
+    DEFAULT_STATE,
+    SGR_RE,
+    SGRState,
+    affects_spaces,
+    apply_sgr,
+    sgr_transition,
+    style_state,
+)
+from charstyle.text import RichText, StyledText
+
+
+class StyledWriter:
+    """
+    A buffered writer that emits minimal SGR transitions between styled fragments.
+
+    Instead of closing every fragment with a reset and re-opening the next style,
+    the writer remembers the current terminal state and only emits the codes that
+    differ. Unstyled runs of spaces keep the current state when it does not show on
+    spaces. Output is collected in memory and written to the stream in large chunks.
+
+    Example:
+        >>> from charstyle import Style, StyledWriter
+        >>> with StyledWriter() as out:
+        ...     out.write("Status: ", Style.BOLD)
+        ...     out.write("OK", (Style.BOLD, Style.GREEN))
+        ...     out.write("\\n")
+    """
+
+    __slots__ = (
+        "stream",
+        "buffer_size",
+        "color",
+        "depth",
+        "_state",
+        "_pending",
+        "_buffer",
+        "_size",
+    )
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        buffer_size: int = 65536,
+        color: bool | None = None,
+    ) -> None:
+        """
+        Create a writer.
+
+        Args:
+            stream (TextIO, optional): The stream to write to (default: sys.stdout)
+            buffer_size (int, optional): Number of characters to buffer before writing
+            color (bool, optional): Whether to emit escape sequences
+                (default: detected from the capabilities of the stream)
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        if color is None:
+            self.depth = color_depth(stream)
+        elif color:
+            self.depth = max(get_capabilities(self.stream).depth, ColorDepth.BASIC)
+        else:
+            self.depth = ColorDepth.NONE
+        self.color = bool(self.depth)
+        self._state = DEFAULT_STATE
+        self._pending = DEFAULT_STATE
+        self._buffer: list[str] = []
+        self._size = 0
+
+    @property
+    def state(self) -> SGRState:
+        """The terminal state after everything written so far."""
+        return self._pending
+
+    def write(self, text: "str | StyledText | RichText", style: StyleType | None = None) -> None:
+        """
+        Write a fragment of text in the given style.
+
+        Text may already contain SGR escape sequences (for example output from
+        styled()); these are parsed and folded into the tracked state, starting
+        from the given style if there is one.
+        StyledText and RichText are written fragment by fragment, with unstyled
+        fragments taking the given style.
+
+        Args:
+            text (str | StyledText | RichText): The text to write
+            style (Style, Color, tuple, optional): The style of the fragment
+        """
+        if not text:
+            return
+
+        if isinstance(text, (StyledText, RichText)):
+            for fragment, fragment_style in text:
+                self.write(fragment, fragment_style or style)
+            return
+
+        if style is None and "\x1b" in text:
+            self._write_ansi(text)
+            return
+
+        target = style_state(style, self.depth) if style and self.color else DEFAULT_STATE
+
+        # Styled text that contains escape sequences starts from the style and
+        # folds its own SGR changes into it, so the tracked state stays correct
+        if "\x1b" in text:
+            self._pending = target
+            self._write_ansi(text)
+            return
+
+        # Unstyled spaces between fragments can keep the current state when it
+        # does not show on spaces, saving a reset and a re-open
+        if target is DEFAULT_STATE and not text.strip(" ") and not affects_spaces(self._pending):
+            target = self._pending
+
+        self._pending = target
+        self._emit(text)
+
+    def _write_ansi(self, text: str) -> None:
+        """Write text containing escape sequences, deferring its SGR changes."""
+        last_end = 0
+        for match in SGR_RE.finditer(text):
+            start = match.start()
+            if start > last_end:
+                self._emit(text[last_end:start])
+            if self.color:
+                self._pending = apply_sgr(self._pending, match.group(1))
+            last_end = match.end()
+        if last_end < len(text):
+            self._emit(text[last_end:])
+
+    def _emit(self, text: str) -> None:
+        """Append text to the buffer, preceded by any pending state transition."""
+        if self._pending != self._state:
+            transition = sgr_transition(self._state, self._pending)
+            self._buffer.append(transition)
+            self._size += len(transition)
+            self._state = self._pending
+
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def reset(self) -> None:
+        """Return the terminal to its default state."""
+        self._pending = DEFAULT_STATE
+        if self._state != DEFAULT_STATE:
+            self._emit("")
+
+    def flush(self) -> None:
+        """Write the buffered output to the stream."""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._size = 0
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Reset the terminal state and flush the buffered output."""
+        self.reset()
+        self.flush()
+
+    def __enter__(self) -> "StyledWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
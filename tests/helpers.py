@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the charstyle tests.
+"""
+
+import io
+import os
+from unittest.mock import patch
+
+from charstyle import invalidate_capabilities
+
+
+class FakeTTY(io.StringIO):
+    """A StringIO that reports itself as a terminal."""
+
+    def isatty(self):
+        return True
+
+
+# Environment without any color settings, on a basic color terminal
+CLEAN_ENV = {"NO_COLOR": "", "FORCE_COLOR": "", "COLORTERM": "", "TERM": "xterm"}
+
+
+class ForceColorMixin:
+    """Mixin for test cases that expect escape sequences on standard output."""
+
+    def setUp(self):
+        """Render with basic colors on standard output."""
+        self.env_patcher = patch.dict(os.environ, {"NO_COLOR": "", "FORCE_COLOR": "1"})
+        self.env_patcher.start()
+        invalidate_capabilities()
+        super().setUp()
+
+    def tearDown(self):
+        """Do not leak capabilities detected under a patched environment."""
+        super().tearDown()
+        self.env_patcher.stop()
+        invalidate_capabilities()
@@ -0,0 +1,150 @@
+"""
+Tests for the ANSI escape sequence utilities.
+"""
+
+import unittest
+
+from charstyle import RichText, Style, strip_ansi, truncate, wrap
+from charstyle.ansi import iter_strip_ansi
+
+
+class TestStripAnsi(unittest.TestCase):
+    """Test cases for strip_ansi and iter_strip_ansi."""
+
+    def test_strip_str(self):
+        """Test stripping escape sequences from strings."""
+        plain = "no escapes here"
+        self.assertIs(strip_ansi(plain), plain)
+        self.assertEqual(strip_ansi("\033[1;31mError\033[0m: failed"), "Error: failed")
+
+    def test_strip_hyperlink(self):
+        """Test that OSC 8 hyperlinks are removed completely."""
+        text = "\033[4m\033]8;;https://example.com\033\\link\033]8;;\033\\\033[0m"
+        self.assertEqual(strip_ansi(text), "link")
+        self.assertEqual(strip_ansi("\033]8;;https://example.com\007link\033]8;;\007"), "link")
+
+    def test_strip_bytes_like(self):
+        """Test stripping escape sequences from bytes-like objects."""
+        data = "\033[32mOK ✓\033[0m".encode()
+        for value in (data, bytearray(data), memoryview(data)):
+            self.assertEqual(strip_ansi(value), "OK ✓".encode())
+        self.assertEqual(strip_ansi(memoryview(b"plain")), b"plain")
+
+    def test_iter_strip_ansi(self):
+        """Test that chunked stripping never splits an escape sequence."""
+        line = "\033[1;31mERROR\033[0m \033]8;;https://example.com\033\\x\033]8;;\033\\ done\n"
+        text = line * 2000
+        expected = strip_ansi(text)
+        self.assertEqual("".join(iter_strip_ansi(text, chunk_size=5000)), expected)
+        self.assertEqual(
+            b"".join(iter_strip_ansi(memoryview(text.encode()), chunk_size=5000)),
+            expected.encode(),
+        )
+        with self.assertRaises(ValueError):
+            list(iter_strip_ansi(text, chunk_size=10))
+
+
+class TestTruncate(unittest.TestCase):
+    """Test cases for truncate."""
+
+    def test_plain_text(self):
+        """Test truncating text without escape sequences."""
+        text = "short"
+        self.assertIs(truncate(text, 5), text)
+        self.assertEqual(truncate("Hello World", 8), "Hello W…")
+        self.assertEqual(truncate("Hello World", 8, ""), "Hello Wo")
+        self.assertEqual(truncate("日本語", 4), "日…")
+        self.assertEqual(truncate("日本語", 5, ""), "日本")
+        self.assertEqual(truncate("Hello", 2, "..."), "..")
+        self.assertEqual(truncate("Hello", 0), "")
+        with self.assertRaises(ValueError):
+            truncate("Hello", -1)
+
+    def test_escapes_are_kept(self):
+        """Test that escapes are kept intact and open styles are closed."""
+        text = "\033[31mError\033[0m: disk full"
+        self.assertIs(truncate(text, 16), text)
+        self.assertEqual(truncate(text, 8), "\033[31mError\033[0m: …")
+        self.assertEqual(truncate(text, 4), "\033[31mErr…\033[0m")
+        self.assertEqual(truncate("ab\033[1mcdef", 4, ""), "ab\033[1mcd\033[0m")
+        self.assertEqual(truncate("ab\033[1mcd\033[22mef", 4, ""), "ab\033[1mcd\033[22m")
+
+        # Open hyperlinks are closed as well
+        link = "\033]8;;https://example.com\033\\a long link\033]8;;\033\\"
+        self.assertEqual(truncate(link, 3), "\033]8;;https://example.com\033\\a …\033]8;;\033\\")
+
+    def test_rich_text(self):
+        """Test truncating RichText spans."""
+        line = RichText("ERROR", Style.RED).append(" disk full")
+        self.assertEqual(line.truncate(20), line)
+        self.assertEqual(
+            line.truncate(7).fragments, (("ERROR", Style.RED), (" ", None), ("…", None))
+        )
+        self.assertEqual(line.truncate(4).fragments, (("ERR", Style.RED), ("…", Style.RED)))
+        with self.assertRaises(ValueError):
+            line.truncate(-1)
+
+
+class TestWrap(unittest.TestCase):
+    """Test cases for wrap."""
+
+    def test_plain_text(self):
+        """Test wrapping text without escape sequences."""
+        self.assertEqual(
+            list(wrap("the quick brown fox jumps", 10)), ["the quick", "brown fox", "jumps"]
+        )
+        self.assertEqual(list(wrap("supercalifragilistic", 8)), ["supercal", "ifragili", "stic"])
+        self.assertEqual(list(wrap("  indented\n\nnext", 12)), ["  indented", "", "next"])
+        self.assertEqual(list(wrap("日本語のテキスト", 5)), ["日本", "語の", "テキ", "スト"])
+        self.assertEqual(list(wrap("", 5)), [""])
+        # Leading spaces are kept only if the word after them fits on the line
+        self.assertEqual(list(wrap("    abcdef", 3)), ["abc", "def"])
+        self.assertEqual(list(wrap("  abcdef", 3)), ["abc", "def"])
+        self.assertEqual(list(wrap("  ab cd", 4)), ["  ab", "cd"])
+        self.assertEqual(
+            list(wrap("   leading spaces here", 5)), ["leadi", "ng", "space", "s", "here"]
+        )
+        # Bad widths are rejected when wrap() is called, not when it is iterated
+        with self.assertRaises(ValueError):
+            wrap("text", 0)
+        with self.assertRaises(ValueError):
+            wrap("text", -1)
+
+    def test_style_is_carried(self):
+        """Test that styles are closed and reopened at line breaks."""
+        text = "ok \033[1;31mred bold words\033[0m done"
+        self.assertEqual(
+            list(wrap(text, 9)),
+            [
+                "ok \033[1;31mred\033[0m",
+                "\033[1;31mbold\033[0m",
+                "\033[1;31mwords\033[0m",
+                "done",
+            ],
+        )
+        for line in wrap(text, 9):
+            self.assertLessEqual(len(strip_ansi(line)), 9)
+
+        # Hyperlinks are carried the same way
+        link = "\033]8;;https://example.com\033\\two words\033]8;;\033\\"
+        self.assertEqual(
+            list(wrap(link, 5)),
+            [
+                "\033]8;;https://example.com\033\\two\033]8;;\033\\",
+                "\033]8;;https://example.com\033\\words\033]8;;\033\\",
+            ],
+        )
+
+    def test_streaming(self):
+        """Test that lines are produced lazily from an iterable of lines."""
+        lines = iter(["\033[32mgreen line\n", "still green\033[0m\n"])
+        wrapped = wrap(lines, 6)
+        self.assertEqual(next(wrapped), "\033[32mgreen\033[0m")
+        self.assertEqual(
+            list(wrapped),
+            ["\033[32mline\033[0m", "\033[32mstill\033[0m", "\033[32mgreen\033[0m"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
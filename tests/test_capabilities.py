@@ -0,0 +1,128 @@
+"""
+Tests for the per-stream capability detection.
+"""
+
+import asyncio
+import io
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from charstyle import (
+    Color,
+    ColorDepth,
+    Style,
+    color,
+    get_capabilities,
+    invalidate_capabilities,
+    styled,
+    styled_pattern,
+    tabled,
+)
+from charstyle.charstyle import color_depth
+from tests.helpers import CLEAN_ENV, FakeTTY
+
+
+class TestCapabilities(unittest.TestCase):
+    """Test cases for the capabilities module."""
+
+    def setUp(self):
+        """Start every test with an empty capability cache."""
+        invalidate_capabilities()
+
+    def tearDown(self):
+        """Do not leak capabilities detected under a patched environment."""
+        invalidate_capabilities()
+
+    def test_per_stream_detection(self):
+        """Test that a terminal and a log file get different capabilities."""
+        with patch.dict(os.environ, CLEAN_ENV):
+            tty = FakeTTY()
+            log = io.StringIO()
+            self.assertTrue(get_capabilities(tty).color)
+            self.assertFalse(get_capabilities(log).color)
+            self.assertEqual(styled("x", Style.RED, stream=tty), "\033[31mx\033[0m")
+            self.assertEqual(styled("x", Style.RED, stream=log), "x")
+            self.assertNotIn("\033[", tabled(["A"], [["1"]], stream=log))
+
+    def test_color_depth(self):
+        """Test color depth detection from TERM and COLORTERM."""
+        cases = [
+            ({"TERM": "xterm"}, ColorDepth.BASIC),
+            ({"TERM": "xterm-256color"}, ColorDepth.EIGHT_BIT),
+            ({"TERM": "xterm-256color", "COLORTERM": "truecolor"}, ColorDepth.TRUECOLOR),
+            ({"TERM": "dumb"}, ColorDepth.NONE),
+        ]
+        for env, depth in cases:
+            with patch.dict(os.environ, {**CLEAN_ENV, **env}):
+                self.assertEqual(get_capabilities(FakeTTY()).depth, depth)
+
+        with patch.dict(os.environ, {**CLEAN_ENV, "FORCE_COLOR": "3"}):
+            capabilities = get_capabilities(io.StringIO())
+            self.assertTrue(capabilities.color)
+            self.assertEqual(capabilities.depth, ColorDepth.TRUECOLOR)
+
+    def test_invalidation(self):
+        """Test that capabilities are cached until invalidated."""
+        tty = FakeTTY()
+        with patch.dict(os.environ, CLEAN_ENV):
+            self.assertTrue(get_capabilities(tty).color)
+        with patch.dict(os.environ, {**CLEAN_ENV, "NO_COLOR": "1"}):
+            self.assertTrue(get_capabilities(tty).color)
+            invalidate_capabilities(tty)
+            self.assertFalse(get_capabilities(tty).color)
+
+    def test_color_override(self):
+        """Test that color() overrides detection for the current context only."""
+        with patch.dict(os.environ, CLEAN_ENV):
+            tty = FakeTTY()
+            log = io.StringIO()
+            with color(False):
+                self.assertEqual(styled("x", Style.RED, stream=tty), "x")
+                self.assertEqual(styled_pattern("a1", r"(\d)", Style.RED), "a1")
+                self.assertFalse(color_depth(tty))
+                with color():
+                    self.assertEqual(styled("x", Style.RED, stream=log), "\033[31mx\033[0m")
+                    self.assertIn("\033[", tabled(["A"], [["1"]], stream=log))
+                self.assertEqual(styled("x", Style.RED, stream=log), "x")
+            with color(ColorDepth.EIGHT_BIT):
+                self.assertEqual(styled("x", Color.rgb(255, 135, 0)), "\033[38;5;208mx\033[0m")
+            self.assertEqual(styled("x", Style.RED, stream=tty), "\033[31mx\033[0m")
+            self.assertEqual(styled("x", Style.RED, stream=log), "x")
+
+    def test_color_override_concurrency(self):
+        """Test that threads and asyncio tasks keep their own color overrides."""
+        log = io.StringIO()
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def render(enabled):
+            with color(enabled):
+                barrier.wait()
+                results[enabled] = styled("x", Style.RED, stream=log)
+
+        threads = [threading.Thread(target=render, args=(enabled,)) for enabled in (True, False)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {True: "\033[31mx\033[0m", False: "x"})
+
+        async def render_task(enabled, event):
+            with color(enabled):
+                await event.wait()
+                return styled("x", Style.RED, stream=log)
+
+        async def main():
+            event = asyncio.Event()
+            tasks = [asyncio.create_task(render_task(enabled, event)) for enabled in (True, False)]
+            await asyncio.sleep(0)
+            event.set()
+            return await asyncio.gather(*tasks)
+
+        self.assertEqual(asyncio.run(main()), ["\033[31mx\033[0m", "x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,12 +3,14 @@ Tests for the core charstyle functionality.
 """
 
 import os
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch
 
 import charstyle.charstyle
-from charstyle import Style, styled
-from charstyle.charstyle import supports_color
+from charstyle import Align, Color, Style, resolve_style, styled, styled_bytes
+from charstyle.charstyle import get_style_prefix, get_visible_length, supports_color
 
 
 class TestCharstyle(unittest.TestCase):
@@ -74,6 +76,69 @@ class TestCharstyle(unittest.TestCase):
         expected = "\033[102mHello\033[0m"
         self.assertEqual(result, expected)
 
+    def test_style_prefix_cache(self):
+        """Test that style prefixes are cached and reused."""
+        get_style_prefix.cache_clear()
+
+        self.assertEqual(get_style_prefix(Style.RED), "\033[31m")
+        self.assertEqual(get_style_prefix((Style.BOLD, Style.RED)), "\033[1;31m")
+
+        # Repeated styles are served from the cache
+        get_style_prefix.cache_clear()
+        styled("Hello", (Style.BOLD, Style.RED))
+        styled("World", (Style.BOLD, Style.RED))
+        info = get_style_prefix.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
+    def test_get_visible_length(self):
+        """Test measuring text with and without escape codes."""
+        self.assertEqual(get_visible_length(""), 0)
+        self.assertEqual(get_visible_length("Hello"), 5)
+        self.assertEqual(get_visible_length(styled("Hello", (Style.BOLD, Style.RED))), 5)
+        self.assertEqual(
+            get_visible_length(styled("a", Style.RED) + " " + styled("bc", Style.GREEN)), 4
+        )
+
+    def test_styled_bytes(self):
+        """Test that styled_bytes matches the encoded output of styled."""
+        cases = [
+            ("Hello", {"style": Style.RED}),
+            ("Olá ✓", {"style": (Style.BOLD, Style.GREEN), "width": 10, "align": Align.CENTER}),
+            ("link", {"style": Style.UNDERLINE, "hyperlink": "https://example.com"}),
+            ("plain", {}),
+            ("", {"style": Style.RED}),
+            ("日本語テキスト", {"style": Style.RED, "max_width": 7}),
+        ]
+        for text, kwargs in cases:
+            self.assertEqual(styled_bytes(text, **kwargs), styled(text, **kwargs).encode())
+
+    def test_styled_max_width(self):
+        """Test truncating text that is wider than max_width."""
+        self.assertEqual(styled("Hello World", Style.RED, max_width=8), "\033[31mHello W…\033[0m")
+        self.assertEqual(styled("Hello World", max_width=8, overflow="clip"), "Hello Wo")
+        self.assertEqual(styled("Hi", max_width=8, width=4, align=Align.RIGHT), "  Hi")
+        self.assertEqual(styled("Hello World", width=6, max_width=6), "Hello…")
+        with self.assertRaises(ValueError):
+            styled("Hello World", max_width=4, overflow="fade")
+        with self.assertRaises(ValueError):
+            styled("Hello World", Style.RED, max_width=-1)
+
+    def test_styled_wrap(self):
+        """Test wrapping text onto several padded lines."""
+        result = styled("the quick brown fox", Style.RED, width=10, wrap=True)
+        self.assertEqual(
+            result.split("\n"),
+            ["\033[31mthe quick \033[0m", "\033[31mbrown fox \033[0m"],
+        )
+        self.assertEqual(styled("short", width=10, wrap=True), "short     ")
+        indented = styled("      hello world", Style.RED, width=5, wrap=True)
+        self.assertEqual(indented.split("\n"), ["\033[31mhello\033[0m", "\033[31mworld\033[0m"])
+        self.assertEqual(
+            styled_bytes("the quick brown fox", Style.RED, width=10, wrap=True),
+            result.encode(),
+        )
+
     def test_styled_no_color_support(self):
         """Test styled when color is not supported."""
         # Mock supports_color to return False
@@ -100,6 +165,36 @@ class TestCharstyle(unittest.TestCase):
         self.assertFalse(supports_color())
         del os.environ["NO_COLOR"]
 
+    def test_resolve_style(self):
+        """Test that resolved styles render like the styles they were resolved from."""
+        style = (Style.BOLD, Color.rgb(255, 135, 0))
+        resolved = resolve_style(style)
+        self.assertIs(resolve_style(resolved), resolved)
+        self.assertEqual(styled("x", resolved), styled("x", style))
+        self.assertEqual(styled_bytes("x", resolved), styled_bytes("x", style))
+        self.assertEqual(styled("x", (resolved, Style.UNDERLINE)), "\033[1;33;4mx\033[0m")
+        self.assertEqual(get_style_prefix(resolved), "\033[1;38;2;255;135;0m")
+        with self.assertRaises(ValueError):
+            resolve_style(())
+
+    def test_lazy_imports(self):
+        """Test that only the core modules are imported until other names are used."""
+        code = (
+            "import sys, charstyle; "
+            "optional = ['ansi', 'highlight', 'icons', 'keywords', 'markup', "
+            "'pattern_style', 'sgr', 'styler', 'tables', 'text', 'writer']; "
+            "assert not [m for m in optional if 'charstyle.' + m in sys.modules]; "
+            "from charstyle import Icon, get_icon, tabled; "
+            "assert Icon.CHECK == get_icon('CHECK') == '\u2713'; "
+            "assert 'charstyle.tables' in sys.modules; "
+            "assert 'Icon' in dir(charstyle) and 'StyledWriter' in dir(charstyle); "
+            "from charstyle import *"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+        with self.assertRaises(AttributeError):
+            charstyle.NoSuchName  # noqa: B018
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for 256-color and truecolor styles.
+"""
+
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from charstyle import (
+    Color,
+    ColorDepth,
+    Style,
+    StyledWriter,
+    invalidate_capabilities,
+    styled,
+    tabled,
+)
+from charstyle.colors import rgb_to_xterm, xterm_to_basic
+from tests.helpers import CLEAN_ENV, FakeTTY
+
+
+class TestColors(unittest.TestCase):
+    """Test cases for the colors module."""
+
+    def setUp(self):
+        """Start every test with an empty capability cache."""
+        invalidate_capabilities()
+
+    def tearDown(self):
+        """Do not leak capabilities detected under a patched environment."""
+        invalidate_capabilities()
+
+    def test_codes(self):
+        """Test the codes of a color at each color depth."""
+        orange = Color.rgb(255, 135, 0)
+        self.assertEqual(orange.codes(ColorDepth.TRUECOLOR), "38;2;255;135;0")
+        self.assertEqual(orange.codes(ColorDepth.EIGHT_BIT), "38;5;208")
+        self.assertEqual(orange.codes(ColorDepth.BASIC), "33")
+        self.assertEqual(Color.rgb(255, 0, 0).codes(ColorDepth.BASIC), "91")
+        self.assertEqual(Color.xterm(21, background=True).codes(ColorDepth.TRUECOLOR), "48;5;21")
+        self.assertEqual(Color.xterm(21, background=True).codes(ColorDepth.BASIC), "44")
+        self.assertEqual(Color.xterm(2).codes(ColorDepth.BASIC), "32")
+
+    def test_constructors(self):
+        """Test the hex constructor, equality and validation."""
+        self.assertEqual(Color.hex("#ff8700"), Color.rgb(255, 135, 0))
+        self.assertEqual(hash(Color.hex("ff8700")), hash(Color.rgb(255, 135, 0)))
+        self.assertNotEqual(Color.rgb(1, 2, 3), Color.rgb(1, 2, 3, background=True))
+        self.assertEqual(repr(Color.xterm(7, background=True)), "Color.xterm(7, background=True)")
+        for invalid in (
+            lambda: Color.hex("#fff"),
+            lambda: Color.xterm(256),
+            lambda: Color.rgb(0, 0, 300),
+        ):
+            with self.assertRaises(ValueError):
+                invalid()
+
+    def test_downsampling(self):
+        """Test that the lookup tables pick the nearest palette entries."""
+        self.assertEqual(rgb_to_xterm(0, 0, 0), 16)
+        self.assertEqual(rgb_to_xterm(255, 255, 255), 231)
+        self.assertEqual(rgb_to_xterm(128, 128, 128), 244)
+        self.assertEqual(rgb_to_xterm(95, 135, 175), 67)
+        self.assertEqual(xterm_to_basic(9), 9)
+        self.assertEqual(xterm_to_basic(196), 9)
+        self.assertEqual(xterm_to_basic(232), 0)
+
+    def test_styled_with_color(self):
+        """Test that styled() downsamples colors to the depth of the stream."""
+        style = (Style.BOLD, Color.rgb(255, 135, 0))
+        cases = [
+            ({"TERM": "xterm"}, "\033[1;33mx\033[0m"),
+            ({"TERM": "xterm-256color"}, "\033[1;38;5;208mx\033[0m"),
+            ({"COLORTERM": "truecolor"}, "\033[1;38;2;255;135;0mx\033[0m"),
+        ]
+        for env, expected in cases:
+            with patch.dict(os.environ, {**CLEAN_ENV, **env}):
+                self.assertEqual(styled("x", style, stream=FakeTTY()), expected)
+            invalidate_capabilities()
+
+        self.assertEqual(styled("x", style, stream=io.StringIO()), "x")
+
+    def test_tables_and_writer(self):
+        """Test that tables and writers render extended colors."""
+        with patch.dict(os.environ, {**CLEAN_ENV, "TERM": "xterm-256color"}):
+            tty = FakeTTY()
+            table = tabled(["A"], [["1"]], column_styles=[Color.xterm(39)], stream=tty)
+            self.assertIn("\033[38;5;39m1", table)
+
+            writer = StyledWriter(tty)
+            writer.write("a", Color.xterm(39))
+            writer.write("b", (Style.BOLD, Color.xterm(39)))
+            writer.close()
+            self.assertEqual(tty.getvalue(), "\033[38;5;39ma\033[1mb\033[0m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,9 +7,17 @@ import unittest
 from unittest.mock import patch
 
 import charstyle.charstyle
-from charstyle import Style
+from charstyle import Align, Style
 from charstyle.charstyle import supports_color
 from charstyle.pattern_style import (
+    DEFAULT_PATTERN_CACHE_SIZE,
+    StyledTemplate,
+    clear_pattern_cache,
+    pattern_cache_info,
+    pattern_match_spans,
+    pattern_spans,
+    set_pattern_cache_size,
+    split_spans,
     styled_format,
     styled_pattern,
     styled_pattern_match,
@@ -97,6 +105,11 @@ class TestComplexStyle(unittest.TestCase):
         expected = "Hello \033[1;31mWorld\033[0m"
         self.assertEqual(result, expected)
 
+        # Test that text between matches is kept and text outside the groups is not
+        result = styled_pattern("a=1, b=2", r"(\w)=(\d)", Style.RED, Style.GREEN)
+        expected = "\033[31ma\033[0m\033[32m1\033[0m, \033[31mb\033[0m\033[32m2\033[0m"
+        self.assertEqual(result, expected)
+
     def test_styled_pattern_match(self):
         """Test the styled_pattern_match function."""
         # Test with named groups
@@ -127,6 +140,25 @@ class TestComplexStyle(unittest.TestCase):
         expected = "\033[1;31mHello\033[0m \033[3;32mWorld\033[0m"
         self.assertEqual(result, expected)
 
+        # Groups are styled in text order, whatever the order of the style map
+        pattern = r"(?P<key>\w+)=(?P<value>\w+)"
+        style_map = {"value": Style.GREEN, "key": Style.BLUE}
+        result = styled_pattern_match("a=1 b=2", pattern, style_map)
+        expected = "\033[34ma\033[0m=\033[32m1\033[0m b=2"
+        self.assertEqual(result, expected)
+
+        # Test styling every match
+        result = styled_pattern_match("a=1 b=2", pattern, style_map, all_matches=True)
+        expected = "\033[34ma\033[0m=\033[32m1\033[0m \033[34mb\033[0m=\033[32m2\033[0m"
+        self.assertEqual(result, expected)
+
+        # A group is kept over the groups nested in it, and unmatched groups are skipped
+        pattern = r"(?P<pair>(?P<key>\w)=\d)(?P<unit>ms)?"
+        style_map = {"key": Style.BLUE, "pair": Style.RED, "unit": Style.GREEN}
+        result = styled_pattern_match("a=1 b=2ms", pattern, style_map, all_matches=True)
+        expected = "\033[31ma=1\033[0m \033[31mb=2\033[0m\033[32mms\033[0m"
+        self.assertEqual(result, expected)
+
     def test_styled_format(self):
         """Test the styled_format function."""
         # Test with positional arguments
@@ -158,6 +190,77 @@ class TestComplexStyle(unittest.TestCase):
         expected = "\033[31mHello\033[0m:\033[32mWorld\033[0m"
         self.assertEqual(result, expected)
 
+    def test_spans(self):
+        """Test the span variants of the pattern functions."""
+        spans = pattern_spans("id=42 ok", r"(?<=id=)(\d+)", Style.GREEN)
+        self.assertEqual(spans.fragments, (("id=", None), ("42", Style.GREEN), (" ok", None)))
+        self.assertEqual(spans.width, 8)
+
+        spans = pattern_match_spans("Count: 42", r"(?P<n>\w+): (?P<v>\d+)", {"v": Style.RED})
+        self.assertEqual(spans.fragments, (("Count: ", None), ("42", Style.RED)))
+        self.assertEqual(pattern_match_spans("none", r"(?P<v>\d+)", {"v": Style.RED}).plain, "none")
+
+        spans = split_spans("a,b", ",", Style.RED, Style.GREEN)
+        self.assertEqual(spans.fragments, (("a", Style.RED), (",", None), ("b", Style.GREEN)))
+        self.assertEqual(str(spans[1:]), ",\033[32mb\033[0m")
+
+    def test_pattern_cache(self):
+        """Test that string patterns are compiled once and kept in the pattern cache."""
+        clear_pattern_cache()
+        for _ in range(3):
+            styled_pattern("a=1", r"(\w)=(\d)", Style.RED, Style.GREEN)
+            styled_pattern_match("a=1", r"(?P<k>\w)=", {"k": Style.RED})
+        info = pattern_cache_info()
+        self.assertEqual((info.misses, info.hits, info.currsize), (2, 4, 2))
+
+        try:
+            set_pattern_cache_size(1)
+            styled_pattern("a", r"(a)", Style.RED)
+            styled_pattern("b", r"(b)", Style.RED)
+            info = pattern_cache_info()
+            self.assertEqual((info.maxsize, info.currsize, info.misses), (1, 1, 2))
+        finally:
+            set_pattern_cache_size(DEFAULT_PATTERN_CACHE_SIZE)
+
+    def test_styled_template(self):
+        """Test compiled templates against styled_format."""
+        template = StyledTemplate("{} {}", styles=(Style.RED, Style.GREEN))
+        self.assertEqual(
+            template.format("Hello", "World"),
+            styled_format("{} {}", ("Hello", Style.RED), ("World", Style.GREEN)),
+        )
+        self.assertEqual(template("a", "b"), "\033[31ma\033[0m \033[32mb\033[0m")
+
+        # Widths pad by display column inside the style; specs apply to the value
+        template = StyledTemplate(
+            "{level}|{0:.1f}|{name!r}",
+            styles={"level": (Style.BOLD, Style.RED)},
+            widths={"level": 5, 0: 5},
+            aligns={0: Align.RIGHT},
+        )
+        self.assertEqual(
+            template.format(2.25, level="日本", name="x"),
+            "\033[1;31m日本 \033[0m|  2.2|'x'",
+        )
+
+        # Attribute and index lookups, and literal braces
+        template = StyledTemplate("{{{p.real}}} {items[1]}", styles={"p.real": Style.BLUE})
+        self.assertEqual(template.format(p=3, items="ab"), "{\033[34m3\033[0m} b")
+
+        # Unstyled when color is not supported
+        with patch.dict(os.environ, {"NO_COLOR": "1"}):
+            charstyle.charstyle.invalidate_capabilities()
+            template = StyledTemplate("{}", styles=(Style.RED,), widths=(3,))
+        charstyle.charstyle.invalidate_capabilities()
+        self.assertEqual(template.format("a"), "a  ")
+
+        with self.assertRaises(ValueError):
+            StyledTemplate("{} {0}")
+        with self.assertRaises(ValueError):
+            StyledTemplate("{:{width}}")
+        with self.assertRaises(KeyError):
+            StyledTemplate("{name}").format()
+
 
 if __name__ == "__main__":
     unittest.main()
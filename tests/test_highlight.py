@@ -0,0 +1,129 @@
+"""
+Tests for the single-pass highlighter.
+"""
+
+import io
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+from charstyle import Highlighter, Style, color, styled_pattern
+from charstyle.cli.highlight_files import parse_rule
+from charstyle.highlight import highlight_lines, highlight_stream, read_lines
+from tests.helpers import ForceColorMixin
+
+
+class TestHighlighter(ForceColorMixin, unittest.TestCase):
+    """Test cases for the highlight module."""
+
+    def test_highlight(self):
+        """Test that every rule is applied in a single pass."""
+        highlighter = Highlighter(
+            [
+                (r"\d{2}:\d{2}:\d{2}", Style.DIM),
+                (r"\b(ERROR|FATAL)\b", (Style.BOLD, Style.RED)),
+                (re.compile(r"\bwarn(ing)?\b", re.IGNORECASE), Style.YELLOW),
+                (r"\d+", Style.CYAN),
+            ]
+        )
+        self.assertEqual(
+            highlighter("12:00:01 ERROR 42 Warning"),
+            "\033[2m12:00:01\033[0m \033[1;31mERROR\033[0m \033[36m42\033[0m "
+            "\033[33mWarning\033[0m",
+        )
+        self.assertEqual(highlighter("nothing here"), "nothing here")
+        with color(False):
+            self.assertEqual(highlighter("ERROR"), "ERROR")
+        self.assertEqual(
+            highlighter.spans("at 12:00:01").fragments,
+            (("at ", None), ("12:00:01", Style.DIM)),
+        )
+
+    def test_priority(self):
+        """Test that the first rule matching at a position wins."""
+        highlighter = Highlighter({r"\d+\.\d+": Style.GREEN, r"\d+": Style.CYAN, r"\.": None})
+        self.assertEqual(highlighter("v1.25 ."), "v\033[32m1.25\033[0m .")
+        # An unstyled rule keeps later rules from matching its text
+        highlighter = Highlighter([(r"id=\w+", None), (r"\d+", Style.CYAN)])
+        self.assertEqual(highlighter("id=42 n=7"), "id=42 n=\033[36m7\033[0m")
+
+    def test_flags(self):
+        """Test that the flags of each rule apply to that rule alone."""
+        highlighter = Highlighter(
+            [
+                (r"(?i)error", Style.RED),
+                (re.compile(r"\w+", re.ASCII), Style.CYAN),
+                (re.compile(r"é  # accented", re.VERBOSE), Style.BLUE),
+            ]
+        )
+        self.assertEqual(
+            highlighter("ERROR été"),
+            "\033[31mERROR\033[0m \033[34mé\033[0m\033[36mt\033[0m\033[34mé\033[0m",
+        )
+
+    def test_invalid(self):
+        """Test that highlighters need rules with unique group names."""
+        with self.assertRaises(ValueError):
+            Highlighter([])
+        with self.assertRaises(ValueError):
+            Highlighter([(r"(?P<n>\d+)", Style.RED), (r"(?P<n>[a-z]+)", Style.BLUE)])
+
+    def test_read_lines(self):
+        """Test reading lines by line and in chunks smaller than a line."""
+        text = "first line\nsecond\r\n\nlast"
+        expected = ["first line\n", "second\r\n", "\n", "last"]
+        self.assertEqual(list(read_lines(io.StringIO(text))), expected)
+        for chunk_size in (1, 3, 64):
+            self.assertEqual(list(read_lines(io.StringIO(text), chunk_size)), expected)
+
+    def test_highlight_stream(self):
+        """Test highlighting a stream with a Highlighter or a styling function."""
+        source = "a ERROR\r\nok\nERROR"
+        highlighter = Highlighter([("ERROR", Style.RED)])
+        output = io.StringIO()
+        with color(True):
+            highlight_stream(io.StringIO(source), output, highlighter, chunk_size=4, buffer_size=8)
+        self.assertEqual(output.getvalue(), "a \033[31mERROR\033[0m\r\nok\n\033[31mERROR\033[0m")
+
+        output = io.StringIO()
+        with color(False):
+            highlight_stream(io.StringIO(source), output, highlighter)
+        self.assertEqual(output.getvalue(), source)
+
+        # Line endings are not passed to styling functions
+        lines = highlight_lines(
+            ["x=1\n", "y=2"], lambda s: styled_pattern(s, r"(?<==)(.*)$", Style.RED)
+        )
+        self.assertEqual(list(lines), ["x=\033[31m1\033[0m\n", "y=\033[31m2\033[0m"])
+
+    def test_command(self):
+        """Test the highlight command and its rule parsing."""
+        self.assertEqual(parse_rule("a=b=bold red"), ("a=b", (Style.BOLD, Style.RED)))
+        for invalid in ("ERROR", "ERROR=", "ERROR= "):
+            with self.assertRaises(ValueError):
+                parse_rule(invalid)
+
+        # Invalid patterns and unreadable files are usage errors, not tracebacks
+        for args in (["-r", "(=red", os.devnull], ["missing.log"]):
+            result = subprocess.run(
+                [sys.executable, "-m", "charstyle", "highlight", *args],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertNotIn("Traceback", result.stderr)
+
+        result = subprocess.run(
+            [sys.executable, "-m", "charstyle", "highlight", "-r", r"\d+=cyan", "--color=always"],
+            input="id 42\n",
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout, "id \033[36m42\033[0m\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
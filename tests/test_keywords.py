@@ -0,0 +1,64 @@
+"""
+Tests for the keyword highlighter.
+"""
+
+import pickle
+import unittest
+
+from charstyle import KeywordHighlighter, Style, color
+from tests.helpers import ForceColorMixin
+
+
+class TestKeywordHighlighter(ForceColorMixin, unittest.TestCase):
+    """Test cases for the keywords module."""
+
+    def test_highlight(self):
+        """Test that every keyword is styled in a single scan."""
+        highlighter = KeywordHighlighter({"db-01": Style.CYAN, "E1042": (Style.BOLD, Style.RED)})
+        self.assertEqual(
+            highlighter("E1042 lag on db-01"),
+            "\033[1;31mE1042\033[0m lag on \033[36mdb-01\033[0m",
+        )
+        self.assertEqual(highlighter("nothing here"), "nothing here")
+        with color(False):
+            self.assertEqual(highlighter("E1042"), "E1042")
+        self.assertEqual(
+            highlighter.spans("on db-01").fragments, (("on ", None), ("db-01", Style.CYAN))
+        )
+        self.assertEqual(len(highlighter), 2)
+
+    def test_overlaps(self):
+        """Test that the leftmost, then longest, keyword wins where keywords overlap."""
+        highlighter = KeywordHighlighter(
+            [("he", Style.RED), ("she", Style.GREEN), ("his", Style.BLUE), ("hers", Style.CYAN)],
+            whole_words=False,
+        )
+        self.assertEqual(
+            list(highlighter.matches("ushers ahishe")),
+            [(1, 4, "she"), (8, 11, "his"), (11, 13, "he")],
+        )
+        highlighter = KeywordHighlighter({"ab": Style.RED, "abcd": Style.GREEN, "bc": Style.BLUE})
+        self.assertEqual(list(highlighter.matches("abcd abc")), [(0, 4, "abcd")])
+
+    def test_options(self):
+        """Test matching whole words only and regardless of case."""
+        highlighter = KeywordHighlighter({"db-1": Style.RED, "err": Style.BLUE})
+        self.assertEqual(list(highlighter.matches("db-10 db-1 error")), [(6, 10, "db-1")])
+
+        highlighter = KeywordHighlighter({"DB-1": Style.RED}, ignore_case=True, whole_words=False)
+        self.assertEqual(highlighter("db-10 İ Db-1"), "\033[31mdb-1\033[0m0 İ \033[31mDb-1\033[0m")
+
+        with self.assertRaises(ValueError):
+            KeywordHighlighter({"": Style.RED})
+
+    def test_pickle(self):
+        """Test that a built highlighter survives pickling."""
+        highlighter = KeywordHighlighter({f"host{i}": Style.CYAN for i in range(100)})
+        restored = pickle.loads(pickle.dumps(highlighter))
+        text = "host7 host42 host100"
+        self.assertEqual(restored(text), highlighter(text))
+        self.assertEqual(restored.keywords, highlighter.keywords)
+
+
+if __name__ == "__main__":
+    unittest.main()
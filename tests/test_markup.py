@@ -0,0 +1,84 @@
+"""
+Tests for inline markup.
+"""
+
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from charstyle import Color, Style, invalidate_capabilities, parse_markup, styled_markup
+from tests.helpers import ForceColorMixin
+
+
+class TestMarkup(ForceColorMixin, unittest.TestCase):
+    """Test cases for the markup module."""
+
+    def test_fragments(self):
+        """Test that tags are parsed into styled fragments."""
+        parsed = parse_markup("[bold]a [red]b[/] c[/] d")
+        self.assertEqual(
+            parsed.fragments,
+            (
+                ("a ", (Style.BOLD,)),
+                ("b", (Style.BOLD, Style.RED)),
+                (" c", (Style.BOLD,)),
+                (" d", None),
+            ),
+        )
+        self.assertEqual(parsed.plain, "a b c d")
+
+        # Background colors, hex colors and closing a tag by name
+        parsed = parse_markup("[green on white]x[italic]y[/green  on white]z")
+        self.assertEqual(
+            parsed.fragments,
+            (
+                ("x", (Style.GREEN, Style.BG_WHITE)),
+                ("y", (Style.GREEN, Style.BG_WHITE, Style.ITALIC)),
+                ("z", (Style.ITALIC,)),
+            ),
+        )
+        self.assertEqual(
+            parse_markup("[#ff8700 on #000000]x").fragments,
+            (("x", (Color.rgb(255, 135, 0), Color.rgb(0, 0, 0, background=True))),),
+        )
+
+        # Escaped brackets and brackets that do not look like tags are text
+        self.assertEqual(parse_markup(r"\[bold] [1, 2] []").plain, "[bold] [1, 2] []")
+
+    def test_render(self):
+        """Test rendering and placeholder substitution."""
+        self.assertEqual(
+            styled_markup("[bold red]Error:[/] {}", "disk full"),
+            "\033[1;31mError:\033[0m disk full",
+        )
+        self.assertEqual(
+            styled_markup("[green]{dest}[/] {{x}}", dest="/tmp"), "\033[32m/tmp\033[0m {x}"
+        )
+        # Without values, braces are left alone
+        self.assertEqual(styled_markup("[blue]{x}"), "\033[34m{x}\033[0m")
+        self.assertEqual(parse_markup("[red]x").render(io.StringIO()), "\033[31mx\033[0m")
+
+        with patch.dict(os.environ, {"NO_COLOR": "1"}):
+            invalidate_capabilities()
+            self.assertEqual(styled_markup("[bold]{}[/]!", 3), "3!")
+
+    def test_cache(self):
+        """Test that markup strings are only parsed once."""
+        parse_markup.cache_clear()
+        first = parse_markup("[bold]{}[/]")
+        self.assertIs(parse_markup("[bold]{}[/]"), first)
+        styled_markup("[bold]{}[/]", 1)
+        styled_markup("[bold]{}[/]", 2)
+        self.assertEqual(parse_markup.cache_info().misses, 1)
+        self.assertEqual(parse_markup.cache_info().hits, 3)
+
+    def test_errors(self):
+        """Test that invalid tags are reported."""
+        for invalid in ("[blod]x", "[red on]x", "[on purple]x", "x[/]", "[bold]x[/red]"):
+            with self.assertRaises(ValueError):
+                parse_markup(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the compiled Styler functionality.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+import charstyle.charstyle
+from charstyle import Align, Style, Styler, styled, styled_many
+from charstyle.charstyle import supports_color
+
+
+class TestStyler(unittest.TestCase):
+    """Test cases for the Styler class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        # Reset the global cache
+        charstyle.charstyle._SUPPORTS_COLOR = None
+
+        # Clear the lru_cache
+        supports_color.cache_clear()
+
+        # Force color support for testing
+        os.environ["FORCE_COLOR"] = "1"
+
+    def tearDown(self):
+        """Clean up the test environment."""
+        if "FORCE_COLOR" in os.environ:
+            del os.environ["FORCE_COLOR"]
+
+    def test_styler_matches_styled(self):
+        """Test that a Styler produces the same output as styled."""
+        cases = [
+            {"style": Style.RED},
+            {"style": (Style.BOLD, Style.GREEN), "width": 10},
+            {"style": Style.BLUE, "width": 9, "align": Align.CENTER, "fill_char": "-"},
+            {"style": None, "width": 8, "align": Align.RIGHT},
+            {"style": Style.UNDERLINE, "hyperlink": "https://example.com"},
+            {"style": Style.RED, "width": 8, "max_width": 8},
+            {"style": Style.RED, "max_width": 4, "overflow": "clip"},
+        ]
+        for kwargs in cases:
+            styler = Styler(**kwargs)
+            for text in ["", "Hi", "Hello World!"]:
+                self.assertEqual(styler(text), styled(text, **kwargs))
+
+    def test_styler_no_color_support(self):
+        """Test that a Styler compiled without color support emits plain text."""
+        with patch("charstyle.charstyle.supports_color", return_value=False):
+            styler = Styler(Style.RED, width=6, align=Align.RIGHT)
+        self.assertEqual(styler("Hi"), "    Hi")
+
+    def test_styled_many(self):
+        """Test that styled_many matches styling each string individually."""
+        texts = ["a", "", "status"]
+        for width in (None, 8):
+            result = styled_many(iter(texts), Style.GREEN, width=width, align=Align.CENTER)
+            self.assertEqual(
+                result, [styled(t, Style.GREEN, width=width, align=Align.CENTER) for t in texts]
+            )
+
+        # Generators are supported through Styler.map
+        styler = Styler(Style.RED)
+        self.assertEqual(list(styler.map(t for t in texts)), styled_many(texts, Style.RED))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the table formatting functionality.
+"""
+
+import os
+import unittest
+
+import charstyle.charstyle
+from charstyle import Align, Style, styled, tabled, tabled_bytes
+from charstyle.charstyle import supports_color
+
+
+class TestTables(unittest.TestCase):
+    """Test cases for the tables module."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        # Reset the global cache
+        charstyle.charstyle._SUPPORTS_COLOR = None
+
+        # Clear the lru_cache
+        supports_color.cache_clear()
+
+        # Force color support for testing
+        os.environ["FORCE_COLOR"] = "1"
+
+    def tearDown(self):
+        """Clean up the test environment."""
+        if "FORCE_COLOR" in os.environ:
+            del os.environ["FORCE_COLOR"]
+
+    def test_tabled_bytes(self):
+        """Test that tabled_bytes matches the encoded output of tabled."""
+        headers = ["ID", "Name", "Status"]
+        rows = [["1", "Zoë", "Active"], ["2", "", "Inactive"]]
+
+        def cell_formatter(row, col, value):
+            if col == 2:
+                return styled(value, Style.GREEN if value == "Active" else Style.RED)
+            return None
+
+        for table_style in ("default", "compact", "thin"):
+            kwargs = {
+                "column_styles": [Style.BLUE],
+                "alignments": [Align.RIGHT],
+                "highlight_rows": [1],
+                "cell_formatter": cell_formatter,
+                "style": table_style,
+            }
+            lines = tabled_bytes(headers, rows, **kwargs)
+            self.assertTrue(all(line.endswith(b"\n") for line in lines))
+            self.assertEqual(b"".join(lines), (tabled(headers, rows, **kwargs) + "\n").encode())
+
+        self.assertEqual(tabled_bytes(headers, []), [])
+
+    def test_wrap(self):
+        """Test that wide cells are wrapped onto several lines."""
+        headers = ["ID", "Description"]
+        rows = [["1", "a long description"], ["2", "short"]]
+        table = tabled(headers, rows, widths=[2, 11], wrap=True, borders=False, header_style=None)
+        self.assertEqual(
+            table.split("\n"),
+            ["ID Description", "1  a long     ", "   description", "2  short      "],
+        )
+
+        # Styled cells keep their style on every line
+        table = tabled(
+            ["X"], [["red text"]], widths=[4], wrap=True, borders=False, column_styles=[Style.RED]
+        )
+        self.assertEqual(table.split("\n")[1:], ["\033[31mred \033[0m", "\033[31mtext\033[0m"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for lazily rendered StyledText.
+"""
+
+import io
+import unittest
+
+from charstyle import (
+    Align,
+    RichText,
+    Style,
+    StyledText,
+    StyledWriter,
+    styled,
+    tabled,
+)
+from charstyle.charstyle import get_visible_length
+from tests.helpers import ForceColorMixin
+
+
+class TestStyledText(ForceColorMixin, unittest.TestCase):
+    """Test cases for the StyledText class."""
+
+    def test_render(self):
+        """Test that StyledText renders like styled() and caches the result."""
+        text = StyledText("hello", (Style.BOLD, Style.RED))
+        self.assertEqual(text.width, 5)
+        self.assertEqual(str(text), styled("hello", (Style.BOLD, Style.RED)))
+        self.assertIs(str(text), str(text))
+        self.assertEqual(f"[{text}]", f"[{styled('hello', (Style.BOLD, Style.RED))}]")
+
+    def test_concatenation(self):
+        """Test that concatenation sums widths and keeps fragments."""
+        line = StyledText("ERROR", Style.RED) + ": " + StyledText("日本", Style.BOLD)
+        self.assertEqual(line.width, 11)
+        self.assertEqual(line.text, "ERROR: 日本")
+        self.assertIsNone(line.style)
+        self.assertEqual(str(line), "\033[31mERROR\033[0m: \033[1m日本\033[0m")
+
+        prefixed = "> " + StyledText("x", Style.GREEN)
+        self.assertEqual(prefixed.width, 3)
+        self.assertEqual(prefixed.fragments, (("> ", None), ("x", Style.GREEN)))
+        self.assertEqual(StyledText("x", Style.GREEN) + "", StyledText("x", Style.GREEN))
+
+    def test_stored_width_is_used(self):
+        """Test that consumers use the stored width instead of measuring."""
+        text = StyledText("abc", Style.BLUE)
+        self.assertEqual(get_visible_length(text), 3)
+        self.assertEqual(styled(text, width=7, align=Align.CENTER), "  \033[34mabc\033[0m  ")
+
+        table = tabled(["Name"], [[text]], header_style=None, borders=False)
+        self.assertEqual(table.split("\n")[1], "\033[34mabc \033[0m")
+
+        table = tabled(["Name"], [[text + "!"]], header_style=None, borders=False)
+        self.assertEqual(table.split("\n")[1], "\033[34mabc\033[0m!")
+
+    def test_writer(self):
+        """Test that the writer writes StyledText fragment by fragment."""
+        out = io.StringIO()
+        writer = StyledWriter(out, color=True)
+        writer.write(StyledText("a", Style.BOLD) + StyledText("b", (Style.BOLD, Style.RED)))
+        writer.close()
+        self.assertEqual(out.getvalue(), "\033[1ma\033[31mb\033[0m")
+
+
+class TestRichText(ForceColorMixin, unittest.TestCase):
+    """Test cases for the RichText class."""
+
+    def test_append_and_render(self):
+        """Test that spans are appended, measured and rendered."""
+        line = RichText("12:00 ", Style.DIM).append("ERROR", Style.RED).append(" 日本")
+        self.assertEqual(line.width, 16)
+        self.assertEqual(line.plain, "12:00 ERROR 日本")
+        self.assertEqual(str(line), "\033[2m12:00 \033[0m\033[31mERROR\033[0m 日本")
+        self.assertEqual(get_visible_length(line), 16)
+
+        line.append(StyledText("!", Style.BOLD) + "?")
+        self.assertEqual(line.width, 18)
+        self.assertEqual(list(line)[-2:], [("!", Style.BOLD), ("?", None)])
+
+        doubled = line + line
+        self.assertEqual(doubled.width, 36)
+        self.assertEqual(line.width, 18)
+
+    def test_slice(self):
+        """Test slicing by display column."""
+        line = RichText("12:00 ", Style.DIM).append("ERROR", Style.RED).append(" 日本")
+        self.assertEqual(line[:11], RichText("12:00 ", Style.DIM).append("ERROR", Style.RED))
+        self.assertEqual(line[3:8].fragments, (("00 ", Style.DIM), ("ER", Style.RED)))
+        self.assertEqual(line[-3:].fragments, (("本", None),))
+        self.assertEqual(line[13:15].width, 0)  # wide characters straddle both edges
+        self.assertEqual(line[20:].width, 0)
+        with self.assertRaises(TypeError):
+            line[1]
+
+    def test_consumers(self):
+        """Test that tables, styled() and writers accept RichText."""
+        line = RichText("a", Style.RED).append("b")
+        self.assertEqual(styled(line, width=3), "\033[31ma\033[0mb ")
+
+        table = tabled(["X"], [[line]], header_style=None, borders=False)
+        self.assertEqual(table.split("\n")[1], "\033[31ma\033[0mb")
+
+        out = io.StringIO()
+        writer = StyledWriter(out, color=True)
+        writer.write(line, Style.BOLD)
+        writer.close()
+        self.assertEqual(out.getvalue(), "\033[31ma\033[0;1mb\033[0m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the display width calculation.
+"""
+
+import unittest
+
+from charstyle import Align, Icon, Style, styled, tabled
+from charstyle.charstyle import get_visible_length
+from charstyle.width import char_width, display_width, slice_columns
+
+
+class TestDisplayWidth(unittest.TestCase):
+    """Test cases for the width module."""
+
+    def test_char_width(self):
+        """Test the width of single characters."""
+        self.assertEqual(char_width("a"), 1)
+        self.assertEqual(char_width("é"), 1)
+        self.assertEqual(char_width("́"), 0)  # combining acute accent
+        self.assertEqual(char_width("日"), 2)
+        self.assertEqual(char_width("🌍"), 2)
+        self.assertEqual(char_width("\U00020000"), 2)  # beyond the lookup table
+
+    def test_display_width(self):
+        """Test the width of strings with wide characters and emoji sequences."""
+        self.assertEqual(display_width(""), 0)
+        self.assertEqual(display_width("Hello"), 5)
+        self.assertEqual(display_width("日本語"), 6)
+        self.assertEqual(display_width("e\u0301 日本 🌍 \U00020000"), 12)
+        self.assertEqual(display_width("é"), 1)
+        self.assertEqual(display_width(Icon.WEATHER_SUN), 2)  # VS16 sequence
+        self.assertEqual(display_width(Icon.FLAG_PIRATE), 2)  # ZWJ sequence
+        self.assertEqual(display_width(Icon.FLAG_USA), 2)  # regional indicators
+        self.assertEqual(display_width(Icon.CHECK), 1)
+
+    def test_visible_length_uses_display_width(self):
+        """Test that escape codes are ignored and wide characters counted."""
+        self.assertEqual(get_visible_length("\033[31m日本\033[0m"), 4)
+
+    def test_alignment_with_wide_characters(self):
+        """Test that styled and tabled pad wide characters correctly."""
+        self.assertEqual(styled("日本", None, width=6, align=Align.RIGHT), "  日本")
+
+        table = tabled(["Name"], [["日本"], ["abc"]], header_style=Style.NORMAL, borders=False)
+        lines = table.split("\n")
+        self.assertEqual(display_width(lines[1]), display_width(lines[2]))
+
+    def test_slice_columns(self):
+        """Test cutting text to a range of display columns."""
+        self.assertEqual(slice_columns("Hello", 1, 3), "el")
+        self.assertEqual(slice_columns("日本語", 2), "本語")
+        self.assertEqual(slice_columns("日本語", 1, 5), "本")
+        self.assertEqual(slice_columns("e\u0301x", 0, 1), "e\u0301")
+        self.assertEqual(slice_columns(Icon.FLAG_PIRATE + "ab", 0, 2), str(Icon.FLAG_PIRATE))
+        self.assertEqual(slice_columns(Icon.WEATHER_SUN + "ab", 2), "ab")
+        for start, stop in ((-1, None), (0, -1), (-3, -1)):
+            with self.assertRaises(ValueError):
+                slice_columns("Hello", start, stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the SGR state tracking and the StyledWriter.
+"""
+
+import io
+import unittest
+
+from charstyle import Style, StyledWriter, tabled
+from charstyle.charstyle import ANSI_ESCAPE_RE
+from charstyle.sgr import DEFAULT_STATE, SGRState, apply_sgr, optimize_sgr, sgr_transition
+
+
+class TestSGRState(unittest.TestCase):
+    """Test cases for the sgr module."""
+
+    def test_apply_sgr(self):
+        """Test applying SGR parameters to a state."""
+        state = apply_sgr(DEFAULT_STATE, "1;31;44")
+        self.assertEqual(state, SGRState(frozenset({"1"}), "31", "44"))
+        self.assertEqual(apply_sgr(state, "22;39"), SGRState(frozenset(), None, "44"))
+        self.assertEqual(apply_sgr(state, "0"), DEFAULT_STATE)
+        self.assertEqual(apply_sgr(state, ""), DEFAULT_STATE)
+        self.assertEqual(apply_sgr(DEFAULT_STATE, "38;5;196").fg, "38;5;196")
+        self.assertEqual(apply_sgr(DEFAULT_STATE, "48;2;1;2;3").bg, "48;2;1;2;3")
+
+    def test_sgr_transition(self):
+        """Test that transitions only contain the codes that change."""
+        bold_red = apply_sgr(DEFAULT_STATE, "1;31")
+        self.assertEqual(sgr_transition(bold_red, bold_red), "")
+        self.assertEqual(sgr_transition(bold_red, DEFAULT_STATE), "\033[0m")
+        self.assertEqual(sgr_transition(bold_red, apply_sgr(DEFAULT_STATE, "1;32")), "\033[32m")
+        self.assertEqual(sgr_transition(bold_red, apply_sgr(DEFAULT_STATE, "31")), "\033[22m")
+        # Resetting is shorter than switching off several attributes
+        many = apply_sgr(DEFAULT_STATE, "1;3;4;9")
+        self.assertEqual(sgr_transition(many, apply_sgr(DEFAULT_STATE, "32")), "\033[0;32m")
+
+    def test_optimize_sgr(self):
+        """Test collapsing redundant escape sequences in rendered text."""
+        self.assertEqual(optimize_sgr("plain"), "plain")
+        self.assertEqual(optimize_sgr("\033[31ma\033[0m\033[31mb\033[0m"), "\033[31mab\033[0m")
+        self.assertEqual(optimize_sgr("\033[0m\033[1ma\033[0m"), "\033[1ma\033[0m")
+        self.assertEqual(optimize_sgr("\033[1m\033[0mx"), "x")
+        self.assertEqual(
+            optimize_sgr("\033[31ma\033[0m \033[32mb\033[0m"), "\033[31ma \033[32mb\033[0m"
+        )
+        # Spaces keep styles that are visible on them
+        self.assertEqual(
+            optimize_sgr("\033[4ma\033[0m \033[4mb\033[0m"), "\033[4ma\033[0m \033[4mb\033[0m"
+        )
+        # Hyperlinks and unterminated styles are preserved
+        self.assertEqual(
+            optimize_sgr("\033]8;;u\033\\\033[1mx\033]8;;\033\\"),
+            "\033]8;;u\033\\\033[1mx\033]8;;\033\\",
+        )
+        self.assertEqual(optimize_sgr("\033[1mx"), "\033[1mx")
+
+
+class TestStyledWriter(unittest.TestCase):
+    """Test cases for the StyledWriter class."""
+
+    def test_adjacent_fragments(self):
+        """Test that adjacent fragments share escape sequences."""
+        out = io.StringIO()
+        with StyledWriter(out, color=True) as writer:
+            writer.write("a", Style.RED)
+            writer.write("b", Style.RED)
+            writer.write("c", (Style.BOLD, Style.RED))
+            writer.write("d")
+        self.assertEqual(out.getvalue(), "\033[31mab\033[1mc\033[0md")
+
+    def test_prestyled_text(self):
+        """Test that pre-styled text is folded into the tracked state."""
+        out = io.StringIO()
+        with StyledWriter(out, color=True) as writer:
+            writer.write("\033[31ma\033[0m\033[31mb\033[0m")
+        self.assertEqual(out.getvalue(), "\033[31mab\033[0m")
+
+    def test_styled_prestyled_text(self):
+        """Test that pre-styled text written with a style keeps the state in sync."""
+        out = io.StringIO()
+        with StyledWriter(out, color=True) as writer:
+            writer.write("\033[31mx\033[0m", Style.BOLD)
+            writer.write("y", Style.BOLD)
+        self.assertEqual(out.getvalue(), "\033[1;31mx\033[39my\033[0m")
+
+    def test_no_color(self):
+        """Test that a writer without color emits plain text."""
+        out = io.StringIO()
+        with StyledWriter(out, color=False) as writer:
+            writer.write("a", Style.RED)
+            writer.write("\033[1mb\033[0m")
+        self.assertEqual(out.getvalue(), "ab")
+
+    def test_tabled_through_writer(self):
+        """Test that tables rendered through a writer have the same visible content."""
+        headers = ["ID", "Name"]
+        rows = [["1", "Alice"], ["2", "Bob"]]
+        kwargs = {"column_styles": [Style.RED, Style.RED], "borders": False, "style": "compact"}
+
+        out = io.StringIO()
+        with StyledWriter(out, color=True) as writer:
+            self.assertEqual(tabled(headers, rows, writer=writer, **kwargs), "")
+
+        expected = ANSI_ESCAPE_RE.sub("", tabled(headers, rows, **kwargs)) + "\n"
+        self.assertEqual(ANSI_ESCAPE_RE.sub("", out.getvalue()), expected)
+        self.assertIn("\033[31m1  Alice\033[0m", out.getvalue())
+
+    def test_tabled_prestyled_cell(self):
+        """Test that a pre-styled cell does not lose the style of the cells after it."""
+        rows = [["\033[32mok\033[0m", "done"]]
+        kwargs = {"column_styles": [Style.BOLD, Style.BOLD], "borders": False}
+
+        out = io.StringIO()
+        with StyledWriter(out, color=True) as writer:
+            tabled(["A", "B"], rows, writer=writer, **kwargs)
+        self.assertIn("\033[1;32mok\033[0m \033[1mdone\033[0m", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the charstyle styling hot paths.
+
+Usage:
+    python tools/benchmarks.py            # run all benchmarks
+    python tools/benchmarks.py batch      # run a single benchmark
+"""
+
+import io
+import os
+import pickle
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import timeit
+import tracemalloc
+import unicodedata
+from collections.abc import Callable
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Benchmarks measure the colored code paths
+os.environ.setdefault("FORCE_COLOR", "1")
+
+import charstyle.tables  # noqa: E402
+from charstyle import (  # noqa: E402
+    Align,
+    Color,
+    ColorDepth,
+    Highlighter,
+    KeywordHighlighter,
+    Style,
+    StyledTemplate,
+    StyledText,
+    optimize_sgr,
+    pattern_spans,
+    resolve_style,
+    strip_ansi,
+    styled,
+    styled_bytes,
+    styled_format,
+    styled_many,
+    styled_markup,
+    styled_pattern,
+    styled_pattern_match,
+    tabled,
+    tabled_bytes,
+    truncate,
+    wrap,
+)
+from charstyle.ansi import iter_strip_ansi  # noqa: E402
+from charstyle.charstyle import (  # noqa: E402
+    ANSI_ESCAPE_RE,
+    RESET,
+    StyleType,
+    _escaped_visible_length,
+    color_depth,
+    get_style_prefix,
+    get_visible_length,
+)
+from charstyle.colors import rgb_to_xterm  # noqa: E402
+from charstyle.highlight import LOG_RULES, highlight_stream  # noqa: E402
+from charstyle.markup import parse_markup  # noqa: E402
+from charstyle.pattern_style import clear_pattern_cache  # noqa: E402
+from charstyle.width import _unicode_width, display_width  # noqa: E402
+
+
+def report(name: str, func: Callable[[], object], number: int, items: int = 1) -> float:
+    """Time a function and print the cost per item in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    per_item = best / (number * items) * 1e6
+    print(f"  {name:<40} {per_item:8.3f} us/item")
+    return per_item
+
+
+def bench_batch() -> None:
+    """Compare styled_many() against a per-call styled() loop."""
+    texts = [f"status-{i}" for i in range(10_000)]
+    style = (Style.BOLD, Style.GREEN)
+
+    print("styled() loop vs styled_many() (10k strings)")
+    for width in (None, 16):
+        suffix = f" width={width}" if width else ""
+        report(
+            "styled() loop" + suffix,
+            lambda width=width: [styled(t, style, width=width, align=Align.RIGHT) for t in texts],
+            number=10,
+            items=len(texts),
+        )
+        report(
+            "styled_many()" + suffix,
+            lambda width=width: styled_many(texts, style, width=width, align=Align.RIGHT),
+            number=10,
+            items=len(texts),
+        )
+
+
+def bench_visible_length() -> None:
+    """Compare get_visible_length() against stripping escapes, and time tabled()."""
+    plain = "a plain table cell"
+    colored = styled(plain, (Style.BOLD, Style.RED))
+
+    print("get_visible_length()")
+    for label, text in (("plain", plain), ("styled", colored)):
+        report(
+            f"strip and len() ({label})",
+            lambda text=text: len(ANSI_ESCAPE_RE.sub("", text)),
+            number=100_000,
+        )
+        report(
+            f"get_visible_length() ({label})",
+            lambda text=text: get_visible_length(text),
+            number=100_000,
+        )
+
+    headers = ["ID", "Name", "Status", "Score"]
+    rows = [
+        [str(i), f"user-{i}", "Active" if i % 2 else "Inactive", str(i * 7 % 100)]
+        for i in range(500)
+    ]
+
+    def cell_formatter(row: int, col: int, value: object) -> str | None:
+        if col == 2:
+            return styled(str(value), Style.GREEN if value == "Active" else Style.RED)
+        return None
+
+    def strip_and_len(text: str) -> int:
+        return len(ANSI_ESCAPE_RE.sub("", text))
+
+    # The same tables measured the way they were before get_visible_length() got
+    # its fast path, as the baseline for the effect on tabled()
+    print("tabled() (500 rows x 4 columns)")
+    for suffix, measure in ((", strip and len()", strip_and_len), ("", get_visible_length)):
+        with mock.patch.object(charstyle.tables, "get_visible_length", measure):
+            report(f"tabled(){suffix}", lambda: tabled(headers, rows), number=20, items=len(rows))
+            report(
+                f"with cell_formatter{suffix}",
+                lambda: tabled(headers, rows, cell_formatter=cell_formatter),
+                number=20,
+                items=len(rows),
+            )
+
+
+def bench_width() -> None:
+    """Compare display_width() against a per-character unicodedata loop."""
+
+    def unicodedata_width(text: str) -> int:
+        return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+    print("display width")
+    for label, text in (("ascii", "plain ascii cell"), ("cjk", "日本語のテキスト 🌍")):
+        report(
+            f"unicodedata loop ({label})",
+            lambda text=text: unicodedata_width(text),
+            number=50_000,
+        )
+        if not text.isascii():
+            report(
+                f"display_width() uncached ({label})",
+                lambda text=text: _unicode_width.__wrapped__(text),
+                number=50_000,
+            )
+        report(f"display_width() ({label})", lambda text=text: display_width(text), number=50_000)
+
+
+def bench_optimize() -> None:
+    """Measure the size reduction and throughput of optimize_sgr()."""
+    line = styled_pattern(
+        "2025-03-07 12:00:01 INFO worker-1 request id=42 status=200 size=1024 path=/api/items",
+        r"(\d+-\d+-\d+) (\S+) (\w+) (\S+)",
+        Style.DIM,
+        Style.DIM,
+        (Style.BOLD, Style.GREEN),
+        Style.CYAN,
+    )
+    table = tabled(
+        ["ID", "Name", "Status"],
+        [[str(i), f"user-{i}", "Active"] for i in range(200)],
+        column_styles=[Style.RED, Style.RED, Style.GREEN],
+        borders=False,
+    )
+
+    print("optimize_sgr()")
+    for label, text in (("log line", line), ("table", table)):
+        optimized = optimize_sgr(text)
+        ratio = len(optimized) / len(text) * 100
+        print(f"  {label}: {len(text)} -> {len(optimized)} chars ({ratio:.0f}%)")
+        report(f"optimize_sgr() ({label})", lambda text=text: optimize_sgr(text), number=200)
+
+
+def bench_strip() -> None:
+    """Compare strip_ansi() against a plain regex substitution."""
+    colored = (styled("ERROR", (Style.BOLD, Style.RED)) + " request failed " * 4 + "\n") * 20_000
+    plain = ANSI_ESCAPE_RE.sub("", colored)
+    colored_bytes = colored.encode()
+
+    print(f"strip_ansi() ({len(colored) // 1024} KiB buffer)")
+    for label, text in (("plain", plain), ("colored", colored)):
+        report(f"regex sub ({label})", lambda text=text: ANSI_ESCAPE_RE.sub("", text), number=10)
+        report(f"strip_ansi() ({label})", lambda text=text: strip_ansi(text), number=10)
+    report("strip_ansi() (bytes)", lambda: strip_ansi(colored_bytes), number=10)
+    report(
+        "iter_strip_ansi() (memoryview)",
+        lambda: b"".join(iter_strip_ansi(memoryview(colored_bytes), chunk_size=1 << 16)),
+        number=10,
+    )
+
+
+def bench_bytes() -> None:
+    """Compare encoding styled() output against the bytes rendering path."""
+    texts = [f"status-{i}" for i in range(10_000)]
+    style = (Style.BOLD, Style.GREEN)
+
+    def styled_encoded() -> None:
+        out = io.BytesIO()
+        out.writelines(styled(t, style, width=16).encode() for t in texts)
+
+    def styled_as_bytes() -> None:
+        out = io.BytesIO()
+        out.writelines(styled_bytes(t, style, width=16) for t in texts)
+
+    print("bytes output (10k strings)")
+    report("styled().encode()", styled_encoded, number=10, items=len(texts))
+    report("styled_bytes()", styled_as_bytes, number=10, items=len(texts))
+
+    headers = ["ID", "Name", "Status"]
+    rows = [[str(i), f"user-{i}", "Active"] for i in range(500)]
+    column_styles = [Style.RED, None, Style.GREEN]
+
+    def table_encoded() -> None:
+        io.BytesIO().write(tabled(headers, rows, column_styles=column_styles).encode())
+
+    def table_as_bytes() -> None:
+        io.BytesIO().writelines(tabled_bytes(headers, rows, column_styles=column_styles))
+
+    print("bytes tables (500 rows)")
+    report("tabled().encode()", table_encoded, number=20, items=len(rows))
+    report("tabled_bytes()", table_as_bytes, number=20, items=len(rows))
+
+
+def bench_colors() -> None:
+    """Render a heatmap of distinct RGB cells at each color depth."""
+    cells = [Color.rgb(x * 4, y * 4, 128, background=True) for y in range(64) for x in range(64)]
+
+    def render(depth: ColorDepth) -> None:
+        get_style_prefix.cache_clear()
+        "".join(get_style_prefix(cell, depth) + "  " + RESET for cell in cells)
+
+    print(f"color heatmap ({len(cells)} distinct cells)")
+    for depth in (ColorDepth.TRUECOLOR, ColorDepth.EIGHT_BIT, ColorDepth.BASIC):
+        report(depth.name.lower(), lambda depth=depth: render(depth), number=20, items=len(cells))
+    report(
+        "rgb_to_xterm()",
+        lambda: [rgb_to_xterm(c.red, c.green, c.blue) for c in cells],
+        number=20,
+        items=len(cells),
+    )
+
+
+def bench_styled_text() -> None:
+    """Compare tables of pre-styled str cells against StyledText cells."""
+    headers = ["ID", "Name", "Status"]
+    statuses = ["Active", "Inactive", "Pending"]
+    str_rows = [
+        [str(i), styled(f"user-{i}", Style.BOLD), styled(statuses[i % 3], Style.GREEN)]
+        for i in range(500)
+    ]
+    text_rows = [
+        [str(i), StyledText(f"user-{i}", Style.BOLD), StyledText(statuses[i % 3], Style.GREEN)]
+        for i in range(500)
+    ]
+
+    def measure_str() -> None:
+        _escaped_visible_length.cache_clear()
+        tabled(headers, str_rows)
+
+    print("tables of styled cells (500 rows)")
+    report("styled() str cells", measure_str, number=20, items=len(str_rows))
+    report("StyledText cells", lambda: tabled(headers, text_rows), number=20, items=len(text_rows))
+    report(
+        "StyledText concatenation",
+        lambda: [row[1] + ": " + row[2] for row in text_rows],
+        number=20,
+        items=len(text_rows),
+    )
+
+
+def bench_spans() -> None:
+    """Compare re-measuring rendered log lines against working on RichText spans."""
+    pattern = r"^(\S+) (\w+) (.*)$"
+    styles = (Style.DIM, (Style.BOLD, Style.RED), Style.WHITE)
+    lines = [f"12:00:{i % 60:02d} ERROR request {i} failed with status 500" for i in range(1000)]
+    rendered = [styled_pattern(line, pattern, *styles) for line in lines]
+    spans = [pattern_spans(line, pattern, *styles) for line in lines]
+
+    def measure_rendered() -> None:
+        _escaped_visible_length.cache_clear()
+        for line in rendered:
+            get_visible_length(line)
+
+    def cut_rendered() -> None:
+        for line in rendered:
+            styled_pattern(strip_ansi(line)[:40], pattern, *styles)
+
+    print("log lines (1000 lines)")
+    report("measure rendered str", measure_rendered, number=20, items=len(lines))
+    report("measure RichText", lambda: [s.width for s in spans], number=20, items=len(lines))
+    report("strip, cut and restyle str", cut_rendered, number=20, items=len(lines))
+    report(
+        "slice and render RichText",
+        lambda: [str(s[:40]) for s in spans],
+        number=20,
+        items=len(lines),
+    )
+
+
+def bench_truncate() -> None:
+    """Compare truncate() against stripping, cutting and restyling long log lines."""
+    pattern = r"^(\S+) (\w+) (.*)$"
+    styles = (Style.DIM, (Style.BOLD, Style.RED), Style.WHITE)
+    message = "request failed with status 500 " * 10
+    lines = [
+        styled_pattern(f"12:00:{i % 60:02d} ERROR {i} {message}", pattern, *styles)
+        for i in range(1000)
+    ]
+
+    def strip_and_restyle() -> None:
+        for line in lines:
+            styled_pattern(strip_ansi(line)[:79] + "…", pattern, *styles)
+
+    print(f"truncate to 80 columns (1000 lines of {get_visible_length(lines[0])} columns)")
+    report("strip, cut and restyle", strip_and_restyle, number=20, items=len(lines))
+    report(
+        "truncate()",
+        lambda: [truncate(line, 80) for line in lines],
+        number=20,
+        items=len(lines),
+    )
+    report(
+        "styled(max_width=80)",
+        lambda: [styled(line, max_width=80) for line in lines],
+        number=20,
+        items=len(lines),
+    )
+
+
+def bench_wrap() -> None:
+    """Compare streaming wrap() against textwrap on stripped text."""
+    option = styled("--verbose", Style.BOLD)
+    sentence = f"Use {option} to print {styled('more', Style.GREEN)} detail. "
+    paragraph = sentence * 12
+    text = "\n".join([paragraph] * 2000)
+    plain = strip_ansi(text)
+
+    def textwrap_plain() -> None:
+        for line in plain.split("\n"):
+            textwrap.wrap(line, 80)
+
+    def wrap_styled() -> None:
+        for _ in wrap(text, 80):
+            pass
+
+    def wrap_plain() -> None:
+        for _ in wrap(plain, 80):
+            pass
+
+    print(f"wrap to 80 columns (2000 paragraphs, {len(text) // 1024} KiB)")
+    report("textwrap.wrap() (stripped)", textwrap_plain, number=3, items=2000)
+    report("wrap() (stripped)", wrap_plain, number=3, items=2000)
+    report("wrap() (styled)", wrap_styled, number=3, items=2000)
+
+
+def bench_template() -> None:
+    """Compare a compiled StyledTemplate against the styled_format() loop."""
+    rows = [(f"12:00:{i % 60:02d}", "ERROR", f"request {i} failed") for i in range(1000)]
+    template = StyledTemplate(
+        "{time} {level} {message}",
+        styles={"time": Style.DIM, "level": (Style.BOLD, Style.RED)},
+        widths={"level": 7},
+    )
+
+    def format_loop() -> None:
+        for timestamp, level, message in rows:
+            styled_format(
+                "{time} {level} {message}",
+                time=(timestamp, Style.DIM),
+                level=(styled(level, width=7), (Style.BOLD, Style.RED)),
+                message=(message, ()),
+            )
+
+    def template_loop() -> None:
+        for timestamp, level, message in rows:
+            template.format(time=timestamp, level=level, message=message)
+
+    print("log lines (1000 lines, 3 fields)")
+    report("styled_format()", format_loop, number=20, items=len(rows))
+    report("StyledTemplate.format()", template_loop, number=20, items=len(rows))
+
+
+def bench_markup() -> None:
+    """Compare cached markup against parsing it and hand-written styled() calls."""
+    message = "[bold red]Error:[/] request [cyan]{}[/] failed with status [bold]{}[/]"
+    ids = range(1000)
+
+    def parse_every_time() -> None:
+        for i in ids:
+            parse_markup.cache_clear()
+            styled_markup(message, i, 500)
+
+    def cached() -> None:
+        for i in ids:
+            styled_markup(message, i, 500)
+
+    def hand_written() -> None:
+        for i in ids:
+            error = styled("Error:", (Style.BOLD, Style.RED))
+            request = styled(str(i), Style.CYAN)
+            f"{error} request {request} failed with status {styled('500', Style.BOLD)}"
+
+    print("log messages (1000 messages, 3 tags, 2 placeholders)")
+    report("parse on every call", parse_every_time, number=20, items=len(ids))
+    report("cached styled_markup()", cached, number=20, items=len(ids))
+    report("hand-written styled() calls", hand_written, number=20, items=len(ids))
+
+
+def import_time(statement: str, repeat: int = 10) -> float:
+    """Get the best time spent importing charstyle modules in milliseconds, from -X importtime."""
+    best = float("inf")
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = 0
+        for line in result.stderr.splitlines()[1:]:
+            # Lines look like "import time: self | cumulative | name", with nested
+            # imports indented; modules imported lazily appear at the top level
+            _, cumulative, name = line.split("|")
+            if name.startswith(" charstyle"):
+                total += int(cumulative)
+        best = min(best, total / 1000)
+    return best
+
+
+# The most "import charstyle" may take before bench_import() fails; the package
+# imported in about 30 ms before the optional modules were added
+IMPORT_TIME_BUDGET = 40.0
+
+
+def bench_import() -> None:
+    """Measure the import time of charstyle and fail if it is over IMPORT_TIME_BUDGET."""
+    print("import time (best of 10 processes)")
+    times = {}
+    for statement in (
+        "import charstyle",
+        "import charstyle; charstyle.Icon",
+        "import charstyle; charstyle.tabled",
+    ):
+        times[statement] = import_time(statement)
+        print(f"  {statement:<40} {times[statement]:8.3f} ms")
+
+    # Optional modules are imported on first use, so they must not show up here
+    if times["import charstyle"] > IMPORT_TIME_BUDGET:
+        print(f"import charstyle is over the {IMPORT_TIME_BUDGET} ms budget")
+        sys.exit(1)
+
+
+def bench_resolve() -> None:
+    """Compare styling with Style enum tuples against pre-resolved styles."""
+    style = (Style.BOLD, Style.RED)
+    resolved = resolve_style(style)
+    words = [f"word{i}" for i in range(1000)]
+
+    def build_prefixes() -> None:
+        get_style_prefix.cache_clear()
+        for depth in (ColorDepth.BASIC, ColorDepth.EIGHT_BIT, ColorDepth.TRUECOLOR):
+            get_style_prefix(style, depth)
+            get_style_prefix(Style.GREEN, depth)
+
+    print("style lookup (1000 words)")
+    report("color_depth()", color_depth, number=100_000)
+    report("uncached get_style_prefix()", build_prefixes, number=10_000, items=6)
+    report("styled() with a Style tuple", lambda: [styled(w, style) for w in words], 100, 1000)
+    report("styled() with a ResolvedStyle", lambda: [styled(w, resolved) for w in words], 100, 1000)
+
+
+def bench_pattern_cache() -> None:
+    """Compare styled_pattern() per log line with a warm and a cold pattern cache."""
+    pattern = r"^(\S+) (\w+) (.*)$"
+    styles = (Style.DIM, (Style.BOLD, Style.RED), Style.WHITE)
+    lines = [f"12:00:{i % 60:02d} ERROR request {i} failed" for i in range(1000)]
+    compiled = re.compile(pattern)
+
+    def cold() -> None:
+        for line in lines:
+            clear_pattern_cache()
+            re.purge()
+            styled_pattern(line, pattern, *styles)
+
+    def warm() -> None:
+        for line in lines:
+            styled_pattern(line, pattern, *styles)
+
+    def precompiled() -> None:
+        for line in lines:
+            styled_pattern(line, compiled, *styles)
+
+    print("log lines (1000 lines)")
+    report("precompiled pattern", precompiled, number=20, items=len(lines))
+    report("str pattern, warm cache", warm, number=20, items=len(lines))
+    report("str pattern, cold cache", cold, number=5, items=len(lines))
+
+
+def bench_pattern_match() -> None:
+    """Compare styling every key=value pair of a line by named and by numbered groups."""
+    named = r"(?P<key>\w+)=(?P<value>\S+)"
+    style_map = {"value": Style.GREEN, "key": (Style.BOLD, Style.BLUE)}
+    lines = [
+        f"ts=12:00:{i % 60:02d} level=error request={i} user=ann status=500 latency={i}ms "
+        f"host=db-{i % 9} retry=3"
+        for i in range(1000)
+    ]
+
+    def first_match() -> None:
+        for line in lines:
+            styled_pattern_match(line, named, style_map)
+
+    def all_matches() -> None:
+        for line in lines:
+            styled_pattern_match(line, named, style_map, all_matches=True)
+
+    def numbered() -> None:
+        for line in lines:
+            styled_pattern(line, r"(\w+)=(\S+)", (Style.BOLD, Style.BLUE), Style.GREEN)
+
+    print("key=value lines (1000 lines, 8 pairs each)")
+    report("styled_pattern_match(), first match", first_match, number=20, items=len(lines))
+    report("styled_pattern_match(), all matches", all_matches, number=20, items=len(lines))
+    report("styled_pattern(), numbered groups", numbered, number=20, items=len(lines))
+
+
+def log_rules() -> list[tuple[str, StyleType]]:
+    """Get 30 highlighting rules of the kind used for application logs."""
+    rules: list[tuple[str, StyleType]] = [
+        (r"\b\d{4}-\d{2}-\d{2}\b", Style.DIM),
+        (r"\b\d{2}:\d{2}:\d{2}(?:\.\d+)?\b", Style.DIM),
+        (r"\b(?:ERROR|FATAL|CRITICAL)\b", (Style.BOLD, Style.RED)),
+        (r"\bWARN(?:ING)?\b", Style.YELLOW),
+        (r"\bINFO\b", Style.GREEN),
+        (r"\bDEBUG\b", Style.BLUE),
+        (r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", Style.MAGENTA),
+        (r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b", Style.CYAN),
+        (r"(?:/[\w.-]+)+", Style.UNDERLINE),
+        (r"https?://\S+", (Style.BLUE, Style.UNDERLINE)),
+    ]
+    for word in ("GET", "POST", "PUT", "DELETE", "timeout", "refused", "retry", "user", "host"):
+        rules.append((rf"\b{word}\b", Style.BOLD))
+    for key in ("status", "latency", "bytes", "pid", "tid", "port", "code", "attempt", "shard"):
+        rules.append((rf"\b{key}=\w+", Style.BRIGHT_BLACK))
+    rules.append((r"\b\d+ms\b", Style.YELLOW))
+    rules.append((r'"[^"]*"', Style.GREEN))
+    return rules
+
+
+def bench_highlight() -> None:
+    """Compare a single-pass Highlighter against one styled_pattern() pass per rule."""
+    rules = log_rules()
+    highlighter = Highlighter(rules)
+    lines = [
+        f"2025-03-07 12:00:{i % 60:02d}.123 ERROR GET /api/v1/items/{i} from 10.0.0.{i % 255}:8080 "
+        f'status=500 latency={i}ms pid=42 user "alice" timeout retry attempt=3'
+        for i in range(1000)
+    ]
+
+    def chained() -> None:
+        for line in lines:
+            for pattern, style in rules:
+                line = styled_pattern(line, f"({pattern})", style)
+
+    print(f"log lines (1000 lines, {len(rules)} rules)")
+    report("styled_pattern() per rule", chained, number=1, items=len(lines))
+    report("Highlighter", lambda: [highlighter(line) for line in lines], 5, len(lines))
+
+
+def bench_highlight_stream() -> None:
+    """Compare highlight_stream() on a log file against reading it whole and styling each line."""
+    count = 100_000
+    rules = [(f"({pattern})", style) for pattern, style in LOG_RULES]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.log")
+        with open(path, "w", encoding="utf-8") as log:
+            for i in range(count):
+                log.write(
+                    f"2025-03-07 12:00:{i % 60:02d}.123 ERROR GET /api/v1/items/{i} "
+                    f"from 10.0.0.{i % 255}:8080 status=500\n"
+                )
+
+        def whole_file(output: io.StringIO) -> None:
+            with open(path, encoding="utf-8") as log:
+                lines = log.read().splitlines()
+            for line in lines:
+                for pattern, style in rules:
+                    line = styled_pattern(line, pattern, style)
+                output.write(line + "\n")
+
+        def streamed(output: io.StringIO) -> None:
+            with open(path, encoding="utf-8") as log:
+                highlight_stream(log, output)
+
+        print(f"log file ({count} lines, {len(LOG_RULES)} rules)")
+        for name, func in (
+            ("whole file, styled_pattern() per rule", whole_file),
+            ("highlight_stream()", streamed),
+        ):
+            # Discard the output as it is produced, so only the input side is measured
+            output = io.StringIO()
+            output.write = lambda text: len(text)  # type: ignore[method-assign]
+            tracemalloc.start()
+            start = time.perf_counter()
+            func(output)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {name:<40} {elapsed / count * 1e6:8.3f} us/item {peak / 1e6:8.1f} MB peak")
+
+
+def bench_keywords() -> None:
+    """Compare a KeywordHighlighter against a Highlighter with one alternation of the keywords."""
+    count = 20_000
+    hosts = [f"db-{i:05d}" for i in range(count)]
+    keywords = dict.fromkeys(hosts, Style.CYAN)
+    rng = random.Random(0)
+    lines = [
+        f"12:00:{i % 60:02d} replication lag on {rng.choice(hosts)} reached {i}ms, "
+        f"failing over to {rng.choice(hosts)} after {i % 7} retries"
+        for i in range(1000)
+    ]
+    alternation = r"\b(?:" + "|".join(re.escape(host) for host in hosts) + r")\b"
+
+    def compile_alternation() -> None:
+        re.purge()
+        Highlighter([(alternation, Style.CYAN)])
+
+    print(f"build ({count} keywords)")
+    report("Highlighter (compile)", compile_alternation, 1, 1)
+    report("KeywordHighlighter", lambda: KeywordHighlighter(keywords), 1, 1)
+    data = pickle.dumps(KeywordHighlighter(keywords))
+    report(f"pickle.loads() ({len(data) // 1024} KB)", lambda: pickle.loads(data), 5, 1)
+
+    regex = Highlighter([(alternation, Style.CYAN)])
+    automaton = KeywordHighlighter(keywords)
+    print(f"log lines (1000 lines, {count} keywords)")
+    report("Highlighter", lambda: [regex(line) for line in lines], 3, len(lines))
+    report("KeywordHighlighter", lambda: [automaton(line) for line in lines], 3, len(lines))
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "batch": bench_batch,
+    "visible-length": bench_visible_length,
+    "width": bench_width,
+    "optimize": bench_optimize,
+    "strip": bench_strip,
+    "bytes": bench_bytes,
+    "colors": bench_colors,
+    "styled-text": bench_styled_text,
+    "spans": bench_spans,
+    "truncate": bench_truncate,
+    "wrap": bench_wrap,
+    "template": bench_template,
+    "markup": bench_markup,
+    "import": bench_import,
+    "resolve": bench_resolve,
+    "pattern-cache": bench_pattern_cache,
+    "pattern-match": bench_pattern_match,
+    "highlight": bench_highlight,
+    "highlight-stream": bench_highlight_stream,
+    "keywords": bench_keywords,
+}
+
+
+def main() -> None:
+    """Run the selected benchmarks."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Generate charstyle/_width_table.py from the unicodedata module.
+
+The generated table lists the code point ranges whose terminal display width is
+not 1: zero-width combining and format characters, and East Asian wide or
+fullwidth characters (which include most emoji).
+
+Usage:
+    python tools/gen_width_table.py
+"""
+
+import os
+import sys
+import unicodedata
+
+OUTPUT = os.path.join(os.path.dirname(__file__), "..", "charstyle", "_width_table.py")
+
+# Unassigned code points default to wide only in the CJK ideograph planes
+WIDE_UNASSIGNED = range(0x20000, 0x3FFFE)
+
+# Hangul Jamo medial vowels and final consonants combine with the preceding syllable
+ZERO_WIDTH_EXTRA = range(0x1160, 0x1200)
+
+
+def code_point_width(cp: int) -> int:
+    """Return the display width of a single code point."""
+    char = chr(cp)
+    category = unicodedata.category(char)
+    if category == "Cn":
+        return 2 if cp in WIDE_UNASSIGNED else 1
+    if category in ("Mn", "Me", "Cf") or cp in ZERO_WIDTH_EXTRA:
+        return 0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 2
+    return 1
+
+
+def build_ranges() -> list[tuple[int, int, int]]:
+    """Collapse all non-ASCII code points into (start, end, width) ranges of width != 1."""
+    ranges: list[tuple[int, int, int]] = []
+    for cp in range(0x80, sys.maxunicode + 1):
+        width = code_point_width(cp)
+        if width == 1:
+            continue
+        if ranges and ranges[-1][1] == cp - 1 and ranges[-1][2] == width:
+            ranges[-1] = (ranges[-1][0], cp, width)
+        else:
+            ranges.append((cp, cp, width))
+    return ranges
+
+
+def main() -> None:
+    """Write the generated table module."""
+    ranges = build_ranges()
+    lines = [
+        '"""',
+        "Display width table for the charstyle library.",
+        "",
+        "Generated by tools/gen_width_table.py from Unicode "
+        f"{unicodedata.unidata_version}. Do not edit by hand.",
+        "",
+        "Each entry is a (start, end, width) range of code points whose display",
+        "width is not 1. Code points outside these ranges are one column wide.",
+        '"""',
+        "",
+        f'UNICODE_VERSION = "{unicodedata.unidata_version}"',
+        "",
+        "WIDTH_RANGES: tuple[tuple[int, int, int], ...] = (",
+    ]
+    lines.extend(f"    (0x{start:05X}, 0x{end:05X}, {width})," for start, end, width in ranges)
+    lines.append(")")
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"Wrote {len(ranges)} ranges to {os.path.normpath(OUTPUT)}")
+
+
+if __name__ == "__main__":
+    main()